@@ -0,0 +1,4 @@
+# 포트폴리오 일괄 평가 페이지
+from views import batch_page
+
+batch_page()
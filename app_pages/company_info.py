@@ -0,0 +1,4 @@
+# 기업 정보 입력 페이지
+from views import company_info_page
+
+company_info_page()
@@ -0,0 +1,4 @@
+# 현금흐름할인법(DCF) 페이지
+from views import dcf_page
+
+dcf_page()
@@ -0,0 +1,4 @@
+# 초과이익법 페이지
+from views import excess_earnings_page
+
+excess_earnings_page()
@@ -0,0 +1,4 @@
+# 그룹(지배·종속기업) 평가 페이지
+from views import group_page
+
+group_page()
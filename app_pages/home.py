@@ -0,0 +1,4 @@
+# 홈 페이지
+from views import home_page
+
+home_page()
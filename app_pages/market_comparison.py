@@ -0,0 +1,4 @@
+# 시장가치비교법 페이지
+from views import market_comparison_page
+
+market_comparison_page()
@@ -0,0 +1,4 @@
+# 보고서 페이지
+from views import report_page
+
+report_page()
@@ -0,0 +1,4 @@
+# 종합 결과 페이지
+from views import results_page
+
+results_page()
@@ -0,0 +1,4 @@
+# 상증법 보충적 평가 페이지
+from views import statutory_page
+
+statutory_page()
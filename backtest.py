@@ -0,0 +1,145 @@
+# 영업권 평가 시스템 - 기준일별 재평가 및 백테스트
+#
+# 감사·분쟁 업무를 위해 과거 모든 기준연도(as-of date)에 대해 영업권을 다시 계산합니다 (초과이익법·DCF·시장가치비교법·상증법).
+# 평가 페이지를 반복 실행하는 대신 기준연도별 평균이익·기준연도 배열을 만든 뒤
+# 평가 엔진을 기준연도 축 전체에 대해 한 번에 호출합니다.
+# 각 기준연도의 예측(이익 추정치)은 이후 실제 실적과 비교하여 예측 오차를 산출합니다.
+
+import numpy as np
+import pandas as pd
+
+import valuation_engine as engine
+from earnings import normalized_earnings
+
+METHOD_NAMES = engine.METHOD_NAMES
+
+
+# 기준연도 + h년의 실제 값 행렬 (해당 연도 데이터가 없으면 NaN)
+def _future_matrix(years, values, horizons):
+    target_years = years[:, None] + horizons[None, :]
+    positions = pd.Index(years).get_indexer(target_years.ravel()).reshape(target_years.shape)
+    future = np.where(positions >= 0, values[np.clip(positions, 0, None)], np.nan)
+    return future
+
+
+# 기준연도별 평균이익 (기준연도를 포함한 최근 window개 회계연도를 한 구간으로 보고 scheme 방식으로 산출)
+# years: 오름차순 회계연도 (중간 연도가 빠져 있으면 그 연도는 구간에 포함되지 않음)
+# 구간 내 값이 있는 연도가 min_periods개 미만이면 NaN
+def _window_earnings(years, net_income, window, min_periods, scheme):
+    ends = np.arange(len(years))
+    starts = np.searchsorted(years, years - window + 1, side='left')
+    lengths = ends - starts + 1
+    rows = np.repeat(starts, lengths) + np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    windows = {'offsets': np.append(0, np.cumsum(lengths)), 'values': {'당기순이익': net_income[rows]}}
+    average = normalized_earnings(windows, [scheme])[scheme]
+    observed = np.append(0, np.cumsum(~np.isnan(net_income)))
+    return np.where(observed[ends + 1] - observed[starts] >= min_periods, average, np.nan)
+
+
+# 기준연도별 재평가
+# data: 표준화된 단일 기업 재무 데이터 (financial_schema.normalize_financial_data)
+# window: 초과이익법 평균이익 산출 기간(회계연도 수), min_periods: 평가에 필요한 최소 연수 (값이 있는 연도 기준)
+def rolling_revaluation(data, industry=None, window=5, min_periods=None, parameters=None):
+    params = {method: dict(defaults) for method, defaults in engine.DEFAULT_PARAMETERS.items()}
+    for method, overrides in (parameters or {}).items():
+        params[method].update({k: v for k, v in overrides.items() if k in params[method]})
+
+    # 표준화 데이터는 연도 오름차순으로 정렬되어 있음
+    years = data['years']
+    values = data['values']
+    net_income = values['당기순이익']
+    total_assets = values['총자산']
+    dcf_net_asset_value, market_net_asset_value = engine.net_asset_values(data)
+
+    # 기준연도까지의 window개 회계연도 평균 당기순이익 (초과이익법 평가와 같은 평균 이익 산출 방식)
+    avg_earnings = _window_earnings(years, net_income, window, min_periods or window,
+                                    params['excess_earnings']['earnings_scheme'])
+
+    # 초과이익법: 기준연도별 평균이익과 기준연도 총자산
+    p = params['excess_earnings']
+    excess = engine.excess_earnings_value(
+        avg_earnings, total_assets, p['normal_roi'], p['excess_years'], p['discount_rate'],
+        p['adjustment_factor'], p['industry_premium']
+    )
+
+    # DCF: 기준연도 영업이익을 기준 이익으로 사용
+    p = params['dcf']
+    base_operating_profit = values['영업이익']
+    dcf = engine.dcf_value(
+        base_operating_profit, dcf_net_asset_value, p['growth_rate'], p['forecast_years'], p['discount_rate'],
+        p['terminal_growth'], p['risk_premium'], p['tax_rate']
+    )
+
+    # 시장가치비교법: 기준연도 재무지표에 배수 적용
+    p = params['market_comparison']
+    industry = data['industry'][0] if industry is None else industry
+    multiple = p['custom_multiple'] or engine.get_industry_multiple(industry, p['multiple_type'])
+    market_base = engine.market_base_values(values, p['multiple_type'])
+    market = engine.market_comparison_value(
+        market_base, multiple, market_net_asset_value, p['adjustment_factor'],
+        p['premium_discount'], p['liquidity_discount']
+    )
+
+    # 상증법 보충적 평가: 기준연도까지 최근 3개 회계연도 3:2:1 가중 당기순이익과 기준연도 자본
+    p = params['statutory']
+    weighted_earnings = _window_earnings(years, net_income, len(engine.STATUTORY_WEIGHTS), 1, 'statutory')
+    statutory = engine.statutory_value(
+        weighted_earnings, values['자본'], p['profit_ratio'], p['equity_return_rate'],
+        p['capitalization_years'], p['discount_rate']
+    )
+
+    values = pd.DataFrame({
+        '연도': years,
+        'excess_earnings': np.where(np.isnan(avg_earnings), np.nan, excess['value']),
+        'dcf': dcf['value'],
+        'market_comparison': market['value'],
+        'statutory': np.where(np.isnan(weighted_earnings) | np.isnan(values['자본']), np.nan, statutory['value'])
+    })
+
+    # 예측 오차: 기준연도의 이익 추정치 vs 이후 실제 실적
+    # - 초과이익법: 평균이익이 유지된다고 가정 → 실제 당기순이익
+    # - DCF: 기준 영업이익이 성장률로 증가 → 실제 영업이익
+    # - 시장가치비교법: 기준 값 유지 → 실제 기준 값
+    # - 상증법: 가중 순손익액이 환원 기간 동안 유지 → 실제 당기순이익
+    horizon = max(int(params['excess_earnings']['excess_years']), int(params['dcf']['forecast_years']),
+                  int(params['statutory']['capitalization_years']))
+    horizons = np.arange(1, horizon + 1)
+    forecasts = {
+        'excess_earnings': (np.repeat(avg_earnings[:, None], len(horizons), axis=1), net_income),
+        'dcf': (base_operating_profit[:, None] * (1 + params['dcf']['growth_rate'] / 100) ** horizons[None, :],
+                base_operating_profit),
+        'market_comparison': (np.repeat(market_base[:, None], len(horizons), axis=1), market_base),
+        'statutory': (np.repeat(weighted_earnings[:, None], len(horizons), axis=1), net_income)
+    }
+
+    frames = []
+    for method, (forecast, actual_values) in forecasts.items():
+        actual = _future_matrix(years, actual_values, horizons)
+        frame = pd.DataFrame({
+            '기준연도': np.repeat(years, len(horizons)),
+            '평가 방법': METHOD_NAMES[method],
+            '예측 연차': np.tile(horizons, len(years)),
+            '예측값': forecast.ravel(),
+            '실제값': actual.ravel()
+        })
+        frames.append(frame)
+
+    errors = pd.concat(frames, ignore_index=True).dropna(subset=['예측값', '실제값'])
+    errors['오차'] = errors['실제값'] - errors['예측값']
+    errors['오차율(%)'] = np.where(errors['실제값'] != 0, errors['오차'] / errors['실제값'].abs() * 100, np.nan)
+
+    return values, errors
+
+
+# 평가 방법·예측 연차별 예측 오차 요약 (평균오차, 평균절대오차, 평균절대오차율)
+def summarize_forecast_errors(errors):
+    errors = errors.assign(절대오차=errors['오차'].abs(), 절대오차율=errors['오차율(%)'].abs())
+    summary = errors.groupby(['평가 방법', '예측 연차']).agg(
+        **{
+            '표본 수': ('오차', 'count'),
+            '평균 오차': ('오차', 'mean'),
+            '평균 절대오차': ('절대오차', 'mean'),
+            '평균 절대오차율(%)': ('절대오차율', 'mean')
+        }
+    )
+    return summary.reset_index()
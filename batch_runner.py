@@ -0,0 +1,272 @@
+# 영업권 평가 시스템 - 체크포인트 기반 샤드 일괄 평가
+#
+# 대규모 포트폴리오(평가 방법별 영업권 + 기업별 민감도 분석)를 기업 구간(샤드)으로 나누어
+# 로컬 워커 프로세스에서 실행하고, 샤드가 끝날 때마다 결과를 체크포인트 디렉터리에 원자적으로 기록합니다.
+# - 재시작: 이미 기록된 샤드는 건너뛰므로 중단된 작업을 이어서 실행
+# - 여러 서버: 공유 디렉터리를 체크포인트로 지정하고 --machine/--machines로 샤드를 나누어 실행한 뒤
+#   --merge-only로 결과를 합침
+# - 진행 상황: 샤드 완료 시마다 처리 기업 수, 처리량(기업/초), 예상 남은 시간 출력
+#
+# 사용법:
+#   python batch_runner.py portfolio.csv --checkpoint batch_checkpoint --workers 4
+#   python batch_runner.py portfolio.csv --checkpoint /shared/job --machine 0 --machines 2
+#   python batch_runner.py portfolio.csv --checkpoint /shared/job --merge-only --output 결과.csv
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import socket
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import valuation_engine as engine
+from earnings import SCHEMES as EARNINGS_SCHEMES
+from financial_schema import select_companies
+from growth import ESTIMATORS as GROWTH_ESTIMATORS
+from portfolio import load_portfolio, method_parameters, portfolio_parameters, value_portfolio
+from sensitivity import one_at_a_time
+from sketches import StreamingSummary
+
+MANIFEST_FILE = "manifest.json"
+PORTFOLIO_FILE = "portfolio.pkl"
+SHARD_DIR = "shards"
+
+
+# 임시 파일에 쓴 뒤 이름을 바꾸어 원자적으로 기록 (중간에 중단되어도 불완전한 파일이 남지 않음)
+def atomic_write(path, data):
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+# 파일 내용 해시 (작업 식별용)
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def shard_path(checkpoint_dir, shard_index):
+    return os.path.join(checkpoint_dir, SHARD_DIR, f"shard-{shard_index:05d}.pkl")
+
+
+# 샤드 구간 목록 [(샤드 번호, 시작 기업 순번, 끝 기업 순번), ...]
+def shard_ranges(n_companies, shard_size):
+    return [(i, start, min(start + shard_size, n_companies))
+            for i, start in enumerate(range(0, n_companies, shard_size))]
+
+
+# 작업 설정 기록 (기존 체크포인트와 설정이 다르면 섞이지 않도록 오류)
+def prepare_checkpoint(source, checkpoint_dir, shard_size, parameters, sensitivity, relative, growth_estimator=None):
+    os.makedirs(os.path.join(checkpoint_dir, SHARD_DIR), exist_ok=True)
+    manifest = {
+        'source_sha256': file_sha256(source),
+        'shard_size': shard_size,
+        'parameters': method_parameters(parameters),
+        'sensitivity': sensitivity,
+        'relative': relative,
+        'growth_estimator': growth_estimator
+    }
+
+    manifest_path = os.path.join(checkpoint_dir, MANIFEST_FILE)
+    portfolio_path = os.path.join(checkpoint_dir, PORTFOLIO_FILE)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            existing = json.load(f)
+        if {key: existing.get(key) for key in manifest} != manifest:
+            raise ValueError(f"체크포인트 디렉터리({checkpoint_dir})의 작업 설정이 현재 입력과 다릅니다.")
+        if os.path.exists(portfolio_path):
+            return existing
+
+    # 표준화된 포트폴리오를 한 번만 만들어 워커들이 공유
+    portfolio = load_portfolio(source)
+    manifest['n_companies'] = len(portfolio['company'])
+    atomic_write(portfolio_path, pickle.dumps(portfolio, protocol=pickle.HIGHEST_PROTOCOL))
+    atomic_write(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    return manifest
+
+
+# 워커 프로세스가 공유하는 표준화된 포트폴리오
+_portfolio = None
+
+
+# 워커 프로세스 초기화: 표준화된 포트폴리오를 한 번만 읽음
+def init_worker(checkpoint_dir):
+    global _portfolio
+    with open(os.path.join(checkpoint_dir, PORTFOLIO_FILE), "rb") as f:
+        _portfolio = pickle.load(f)
+
+
+# 샤드 하나 평가 및 체크포인트 기록
+def run_shard(checkpoint_dir, shard_index, start, end, parameters, sensitivity, relative, growth_estimator=None):
+    started = time.perf_counter()
+    shard = select_companies(_portfolio, start, end)
+    values = value_portfolio(shard, parameters, growth_estimator)
+
+    rankings = []
+    if sensitivity:
+        params = portfolio_parameters(shard, parameters, growth_estimator)
+        inputs = engine.engine_inputs(shard, params['market_comparison']['multiple_type'],
+                                      earnings_scheme=params['excess_earnings']['earnings_scheme'])
+        for method in engine.METHOD_NAMES:
+            base_params = {name: value for name, value in params[method].items()
+                           if name in engine.PARAMETER_RANGES[method]}
+            ranking = one_at_a_time(method, inputs, base_params, relative)
+            ranking.insert(1, '평가 방법', engine.METHOD_NAMES[method])
+            rankings.append(ranking)
+
+    elapsed = time.perf_counter() - started
+    atomic_write(shard_path(checkpoint_dir, shard_index), pickle.dumps({
+        'shard': shard_index,
+        'start': start,
+        'end': end,
+        'values': values,
+        'sensitivity': pd.concat(rankings, ignore_index=True) if rankings else None,
+        'elapsed': elapsed,
+        'host': socket.gethostname()
+    }, protocol=pickle.HIGHEST_PROTOCOL))
+    return shard_index, end - start, elapsed
+
+
+# 체크포인트 기반 샤드 일괄 평가
+# machine/machines: 여러 서버에서 나누어 실행할 때 이 서버의 순번과 전체 서버 수
+# growth_estimator: DCF 성장률로 사용할 기업별 추정 성장률 (growth.ESTIMATORS, None이면 매개변수 값)
+# report: 진행 상황 출력 함수 (None이면 출력하지 않음)
+def run_batch(source, checkpoint_dir, shard_size=1000, workers=None, parameters=None, sensitivity=True,
+              relative=None, machine=0, machines=1, report=print, growth_estimator=None):
+    manifest = prepare_checkpoint(source, checkpoint_dir, shard_size, parameters, sensitivity, relative,
+                                  growth_estimator)
+    n_companies = manifest['n_companies']
+
+    shards = [s for s in shard_ranges(n_companies, shard_size) if s[0] % machines == machine]
+    pending = [s for s in shards if not os.path.exists(shard_path(checkpoint_dir, s[0]))]
+    total = sum(end - start for _, start, end in shards)
+    done = total - sum(end - start for _, start, end in pending)
+
+    if report:
+        report(f"샤드 {len(shards)}개 중 {len(shards) - len(pending)}개 완료됨, {len(pending)}개 실행 "
+               f"(기업 {total:,}개, 워커 {workers or os.cpu_count()}개)")
+    if not pending:
+        return {'shards': len(shards), 'executed': 0, 'companies': 0, 'elapsed': 0.0}
+
+    started = time.perf_counter()
+    processed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(checkpoint_dir,)) as executor:
+        futures = [executor.submit(run_shard, checkpoint_dir, shard_index, start, end, parameters, sensitivity,
+                                   relative, growth_estimator)
+                   for shard_index, start, end in pending]
+        for future in as_completed(futures):
+            shard_index, n, _ = future.result()
+            processed += n
+            done += n
+            if report:
+                elapsed = time.perf_counter() - started
+                throughput = processed / elapsed if elapsed > 0 else float('inf')
+                eta = (total - done) / throughput if throughput > 0 else float('inf')
+                report(f"샤드 {shard_index:05d} 완료 | {done:,}/{total:,}개 기업 ({done / total * 100:.1f}%) | "
+                       f"{throughput:,.1f}개/초 | 남은 시간 약 {eta:,.0f}초")
+
+    return {
+        'shards': len(shards),
+        'executed': len(pending),
+        'companies': processed,
+        'elapsed': time.perf_counter() - started
+    }
+
+
+# 체크포인트 디렉터리의 샤드 결과 병합 (여러 서버의 결과 포함)
+def merge_shards(checkpoint_dir):
+    with open(os.path.join(checkpoint_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    values, rankings, missing = [], [], []
+    summaries = {method: StreamingSummary() for method in engine.METHOD_NAMES}
+    for shard_index, _, _ in shard_ranges(manifest['n_companies'], manifest['shard_size']):
+        path = shard_path(checkpoint_dir, shard_index)
+        if not os.path.exists(path):
+            missing.append(shard_index)
+            continue
+        with open(path, "rb") as f:
+            shard = pickle.load(f)
+        values.append(shard['values'])
+        if shard['sensitivity'] is not None:
+            rankings.append(shard['sensitivity'])
+        for method, summary in summaries.items():
+            summary.update(shard['values'][method].to_numpy())
+
+    return {
+        'values': pd.concat(values, ignore_index=True) if values else pd.DataFrame(),
+        'sensitivity': pd.concat(rankings, ignore_index=True) if rankings else pd.DataFrame(),
+        'summaries': summaries,
+        'missing': missing
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영업권 평가 시스템 체크포인트 기반 일괄 평가")
+    parser.add_argument("source", nargs="?", help="포트폴리오 CSV 경로 (--merge-only 사용 시 생략 가능)")
+    parser.add_argument("--checkpoint", required=True, help="체크포인트 디렉터리 (여러 서버 실행 시 공유 디렉터리)")
+    parser.add_argument("--shard-size", type=int, default=1000, help="샤드당 기업 수")
+    parser.add_argument("--workers", type=int, help="워커 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--relative", type=float,
+                        help="민감도 변동 범위 (기준값 ± 입력 범위 × 비율, 미지정 시 입력 범위 전체)")
+    parser.add_argument("--no-sensitivity", action="store_true", help="민감도 분석 생략")
+    parser.add_argument("--growth", choices=list(GROWTH_ESTIMATORS),
+                        help="DCF 성장률로 기업별 과거 영업이익 추정 성장률 사용")
+    parser.add_argument("--earnings", choices=list(EARNINGS_SCHEMES), default='mean',
+                        help="초과이익법 평균 이익 산출 방식")
+    parser.add_argument("--machine", type=int, default=0, help="이 서버의 순번 (0부터)")
+    parser.add_argument("--machines", type=int, default=1, help="전체 서버 수")
+    parser.add_argument("--merge-only", action="store_true", help="실행하지 않고 기록된 샤드만 병합")
+    parser.add_argument("--output", help="병합한 평가 결과 CSV 경로")
+    parser.add_argument("--sensitivity-output", help="병합한 민감도 순위 CSV 경로")
+    args = parser.parse_args()
+    if args.source is None and not args.merge_only:
+        parser.error("포트폴리오 CSV 경로가 필요합니다 (--merge-only 사용 시에만 생략 가능)")
+
+    if not args.merge_only:
+        result = run_batch(
+            args.source, args.checkpoint, args.shard_size, args.workers,
+            parameters={'excess_earnings': {'earnings_scheme': args.earnings}}, sensitivity=not args.no_sensitivity,
+            relative=args.relative, machine=args.machine, machines=args.machines, growth_estimator=args.growth
+        )
+        print(f"실행한 샤드: {result['executed']}개 | 소요 시간: {result['elapsed']:.1f}초")
+
+    merged = merge_shards(args.checkpoint)
+    if merged['missing']:
+        print(f"아직 완료되지 않은 샤드 {len(merged['missing'])}개: "
+              f"{', '.join(str(i) for i in merged['missing'][:20])}{' ...' if len(merged['missing']) > 20 else ''}")
+
+    print("\n=== 평가 방법별 영업권 분포 ===")
+    print(pd.DataFrame([
+        dict({'평가 방법': engine.METHOD_NAMES[method], '기업 수': d['count'], '평균': d['mean']},
+             **{f"{level}%": value for level, value in d['percentiles'].items()})
+        for method, d in ((method, summary.describe((5, 50, 95))) for method, summary in merged['summaries'].items())
+    ]).to_string(index=False, float_format=lambda x: f"{x:,.0f}"))
+
+    if args.output:
+        merged['values'].rename(columns=engine.METHOD_NAMES).to_csv(args.output, index=False)
+        print(f"\n평가 결과가 {args.output}에 저장되었습니다.")
+    if args.sensitivity_output and not merged['sensitivity'].empty:
+        merged['sensitivity'].to_csv(args.sensitivity_output, index=False)
+        print(f"민감도 순위가 {args.sensitivity_output}에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# 영업권 평가 시스템 - 할인·합산 커널 벤치마크
+#
+# 초과이익법과 DCF의 대량 계산(매개변수 격자)에서 세 가지 경로의 속도와 최대 메모리를 비교합니다.
+# - 상세 계산: evaluate()의 (시나리오 × 기간) 배열 기반 계산
+# - NumPy 커널: goodwill()의 기간 반복 NumPy 구현
+# - Numba 커널: goodwill()의 JIT 융합 커널 (numba 설치 시)
+# 최대 메모리는 tracemalloc으로 측정한 NumPy 배열 할당량입니다.
+#
+# 사용법:
+#   python benchmark_kernels.py
+#   python benchmark_kernels.py --scenarios 1000000 4000000 --years 10 --repeat 3
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import kernels
+import valuation_engine as engine
+
+
+# 벤치마크용 매개변수 격자 (시나리오마다 매개변수가 다른 평가)
+def scenario_grid(n, years, seed=0):
+    rng = np.random.default_rng(seed)
+    inputs = {
+        'avg_earnings': np.array([450_000_000.0]),
+        'total_assets': np.array([3_000_000_000.0]),
+        'base_operating_profit': np.array([620_000_000.0]),
+        'dcf_net_asset_value': np.array([1_800_000_000.0])
+    }
+    params = {
+        'excess_earnings': {
+            'normal_roi': rng.uniform(5, 15, n),
+            'excess_years': np.full(n, years),
+            'discount_rate': rng.uniform(5, 30, n),
+            'adjustment_factor': 1.0,
+            'industry_premium': 2.0
+        },
+        'dcf': {
+            'growth_rate': rng.uniform(0, 30, n),
+            'forecast_years': np.full(n, years),
+            'discount_rate': rng.uniform(5, 30, n),
+            'terminal_growth': rng.uniform(0, 5, n),
+            'risk_premium': 3.0,
+            'tax_rate': 22.0
+        }
+    }
+    return inputs, params
+
+
+# 실행 시간(최솟값)과 최대 메모리 측정
+def measure(function, repeat):
+    function()  # JIT 컴파일 및 캐시 준비
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(times), peak
+
+
+def run(scenarios, years, repeat):
+    rows = []
+    for n in scenarios:
+        inputs, params = scenario_grid(n, years)
+        for method in ['excess_earnings', 'dcf']:
+            reference, elapsed, peak = measure(lambda: engine.evaluate(method, inputs, params[method])['value'], repeat)
+            rows.append({'method': method, 'scenarios': n, 'path': '상세 계산', 'seconds': elapsed,
+                         'peak_mb': peak / 1024 ** 2, 'max_rel_diff': 0.0, 'identical': ''})
+
+            kernel_results = {}
+            for backend in kernels.BACKENDS[::-1]:
+                kernels.set_backend(backend)
+                result, elapsed, peak = measure(lambda: engine.goodwill(method, inputs, params[method]), repeat)
+                kernel_results[backend] = result
+                rows.append({
+                    'method': method,
+                    'scenarios': n,
+                    'path': f"{backend} 커널",
+                    'seconds': elapsed,
+                    'peak_mb': peak / 1024 ** 2,
+                    'max_rel_diff': float(np.max(np.abs(result - reference) / np.abs(reference))),
+                    'identical': 'O' if np.array_equal(result, kernel_results['numpy']) else 'X'
+                })
+    kernels.set_backend(kernels.BACKENDS[0])
+
+    results = pd.DataFrame(rows)
+    detailed = results[results['path'] == '상세 계산'].set_index(['method', 'scenarios'])['seconds']
+    results['speedup'] = detailed.loc[list(zip(results['method'], results['scenarios']))].to_numpy() / results['seconds']
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영업권 평가 시스템 할인·합산 커널 벤치마크")
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="시나리오(매개변수 조합) 수 목록")
+    parser.add_argument("--years", type=int, default=10, help="예측 기간/초과이익 인정연수")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--csv", help="결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    print(f"사용 가능한 커널: {', '.join(kernels.BACKENDS)}")
+    results = run(args.scenarios, args.years, args.repeat)
+    print(results.to_string(index=False, float_format=lambda x: f"{x:.3g}"))
+    print("\nidentical: numba 커널과 NumPy 커널의 결과가 비트 단위로 같은지 여부, "
+          "max_rel_diff: 상세 계산 대비 최대 상대 오차")
+
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+        print(f"\n결과가 {args.csv}에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# 영업권 평가 시스템 - 포트폴리오 보고서 일괄 생성
+#
+# 일괄 평가 결과로 기업별 평가 보고서(보고서 페이지 미리보기와 같은 구성: 기업 정보, 평가 방법별 결과 표,
+# 평가 방법별 영업권 비교 막대 차트)를 HTML/PDF로 만들어 하나의 ZIP 파일에 기록합니다.
+# - 워커 프로세스가 시작할 때 한 번만 글꼴을 설정하고, HTML 템플릿은 모든 보고서가 공유
+# - 차트는 기업별로 한 번만 PNG로 그려 HTML(내장 이미지)과 PDF에 함께 사용
+# - 완료된 보고서는 바로 ZIP에 쓰고, 동시에 처리 중인 기업 수를 제한하여 기업 수와 무관한 메모리로 동작
+# - 웹 화면에서는 기업을 구간으로 나누어 구간별 ZIP을 공유 작업 실행기(jobs.py)의 CPU 작업으로 만든 뒤 하나로 합침
+#
+# 사용법:
+#   python bulk_reports.py portfolio.csv --output 보고서.zip
+#   python bulk_reports.py portfolio.csv --output 보고서.zip --formats html pdf --workers 4 --font NanumGothic.ttf
+#   python bulk_reports.py portfolio.csv --output 보고서.zip --earnings statutory --growth cagr
+
+import argparse
+import base64
+import html
+import io
+import os
+import re
+import time
+import warnings
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from string import Template
+
+import numpy as np
+from matplotlib import font_manager, rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import FigureCanvasPdf
+from matplotlib.figure import Figure
+from matplotlib.image import imread
+
+import jobs
+import valuation_engine as engine
+from financial_schema import select_companies
+from earnings import SCHEMES as EARNINGS_SCHEMES
+from growth import ESTIMATORS as GROWTH_ESTIMATORS
+from portfolio import load_portfolio, value_portfolio
+
+REPORT_FORMATS = {'html': 'HTML', 'pdf': 'PDF'}
+
+# 한글 글꼴 후보 (설치된 첫 글꼴 사용)
+FONT_CANDIDATES = ['NanumGothic', 'Malgun Gothic', 'AppleGothic', 'Noto Sans CJK KR', 'Noto Sans KR']
+
+CHART_TITLE = '평가 방법별 영업권 가치 비교'
+
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>$company 영업권 가치 평가 보고서</title>
+<style>
+body { font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', 'NanumGothic', 'Noto Sans KR', sans-serif; margin: 40px; color: #222; }
+h1 { font-size: 24px; border-bottom: 2px solid #333; padding-bottom: 8px; }
+table { border-collapse: collapse; width: 100%; margin: 16px 0; }
+th, td { border: 1px solid #ccc; padding: 8px 12px; }
+th { background: #f3f3f3; text-align: left; }
+td.value { text-align: right; }
+img { max-width: 100%; }
+</style>
+</head>
+<body>
+<h1>영업권 가치 평가 보고서</h1>
+<p><strong>회사명</strong>: $company<br>
+<strong>산업</strong>: $industry<br>
+<strong>평가일</strong>: $date</p>
+<h2>평가 결과 요약</h2>
+<table>
+<tr><th>평가 방법</th><th>영업권 가치(원)</th></tr>
+$rows
+</table>
+$chart
+</body>
+</html>
+""")
+
+_formats = ('html',)
+_layouts = {}
+_worker_settings = None
+
+
+# 한글 글꼴 설정 (font_path: 추가로 등록할 글꼴 파일), 사용할 글꼴 이름 반환 (없으면 None)
+def configure_fonts(font_path=None):
+    if font_path:
+        font_manager.fontManager.addfont(font_path)
+        candidates = [font_manager.FontProperties(fname=font_path).get_name()] + FONT_CANDIDATES
+    else:
+        candidates = FONT_CANDIDATES
+
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    family = next((name for name in candidates if name in installed), None)
+    if family is None:
+        # 한글 글꼴이 없으면 글자가 네모로 표시되며, 보고서마다 반복되는 경고는 생략
+        warnings.filterwarnings('ignore', message='Glyph .* missing from')
+        return None
+
+    rcParams['font.family'] = [family, 'DejaVu Sans']
+    rcParams['axes.unicode_minus'] = False
+    rcParams['pdf.fonttype'] = 42  # PDF에 TrueType 글꼴 포함
+    return family
+
+
+# 워커 프로세스 초기화 (글꼴과 출력 형식은 워커당 한 번만 설정, 차트·PDF 레이아웃은 처음 사용할 때 생성)
+# 공유 실행기의 워커처럼 같은 프로세스에서 여러 번 호출되면 설정이 바뀐 경우에만 다시 설정
+def init_worker(formats, font_path=None):
+    global _formats, _worker_settings
+    if _worker_settings == (tuple(formats), font_path):
+        return
+    _worker_settings = (tuple(formats), font_path)
+    _formats = tuple(formats)
+    _layouts.clear()
+    configure_fonts(font_path)
+
+
+def format_value(value):
+    return f"{value:,.0f}" if np.isfinite(value) else '-'
+
+
+# 막대 차트 레이아웃 (평가 방법 목록별로 한 번 생성하고 기업마다 막대 높이만 변경)
+def _chart_layout(names, dpi):
+    key = ('chart', tuple(names), dpi)
+    if key not in _layouts:
+        figure = Figure(figsize=(8, 4), dpi=dpi)
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        bars = ax.bar(names, np.zeros(len(names)), color='#636efa')
+        ax.set_title(CHART_TITLE)
+        ax.set_xlabel('평가 방법')
+        ax.set_ylabel('영업권 가치')
+        ax.yaxis.set_major_formatter(lambda value, _: f"{value:,.0f}")
+        figure.subplots_adjust(left=0.2, right=0.97, top=0.9, bottom=0.15)
+        _layouts[key] = (figure, ax, bars)
+    return _layouts[key]
+
+
+# 평가 방법별 영업권 비교 막대 차트 PNG (평가할 수 없는 방법은 막대 없이 표시)
+def chart_png(names, values, dpi=100):
+    figure, ax, bars = _chart_layout(names, dpi)
+    heights = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0, posinf=0.0, neginf=0.0)
+    for bar, height in zip(bars, heights):
+        bar.set_height(height)
+    ax.relim()
+    ax.autoscale_view()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+def render_html(item, chart):
+    rows = "\n".join(
+        f'<tr><td>{html.escape(name)}</td><td class="value">{format_value(value)}</td></tr>'
+        for name, value in zip(item['methods'], item['values'])
+    )
+    image = f'<img alt="{CHART_TITLE}" src="data:image/png;base64,{base64.b64encode(chart).decode("ascii")}">'
+    return HTML_TEMPLATE.substitute(
+        company=html.escape(item['company']),
+        industry=html.escape(item['industry']),
+        date=item['date'],
+        rows=rows,
+        chart=image
+    ).encode('utf-8')
+
+
+# A4 한 장짜리 PDF 레이아웃 (평가 방법 목록별로 한 번 생성하고 기업마다 글자·표 값·차트 이미지만 변경)
+def _pdf_layout(names):
+    key = ('pdf', tuple(names))
+    if key not in _layouts:
+        figure = Figure(figsize=(8.27, 11.69))
+        FigureCanvasPdf(figure)
+        figure.text(0.08, 0.94, '영업권 가치 평가 보고서', fontsize=18, weight='bold')
+        info = figure.text(0.08, 0.88, '', fontsize=11, va='top', linespacing=1.8)
+        figure.text(0.08, 0.78, '평가 결과 요약', fontsize=14, weight='bold')
+
+        table_ax = figure.add_axes([0.08, 0.58, 0.84, 0.18])
+        table_ax.axis('off')
+        table = table_ax.table(
+            cellText=[[name, ''] for name in names],
+            colLabels=['평가 방법', '영업권 가치(원)'],
+            cellLoc='left',
+            loc='upper center'
+        )
+        table.scale(1, 1.6)
+
+        chart_ax = figure.add_axes([0.08, 0.2, 0.84, 0.36])
+        chart_ax.axis('off')
+        image = chart_ax.imshow(np.zeros((1, 1, 4)))
+        _layouts[key] = (figure, info, table, image)
+    return _layouts[key]
+
+
+# PDF 보고서 (차트는 이미 그린 PNG를 그대로 배치)
+def render_pdf(item, chart):
+    figure, info, table, image = _pdf_layout(item['methods'])
+    info.set_text(f"회사명: {item['company']}\n산업: {item['industry']}\n평가일: {item['date']}")
+    for row, value in enumerate(item['values'], start=1):
+        table[row, 1].get_text().set_text(format_value(value))
+    pixels = imread(io.BytesIO(chart), format='png')
+    image.set_data(pixels)
+    image.set_extent((-0.5, pixels.shape[1] - 0.5, pixels.shape[0] - 0.5, -0.5))
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='pdf', metadata={'Title': f"{item['company']} 영업권 가치 평가 보고서"})
+    return buffer.getvalue()
+
+
+# 기업 보고서 생성 (워커에서 실행): [(ZIP 내 파일명, 내용), ...]
+def render_company(item):
+    chart = chart_png(item['methods'], item['values'])
+    name = archive_name(item['index'], item['company'])
+    outputs = []
+    if 'html' in _formats:
+        outputs.append((f"{name}.html", render_html(item, chart)))
+    if 'pdf' in _formats:
+        outputs.append((f"{name}.pdf", render_pdf(item, chart)))
+    return outputs
+
+
+# ZIP 내 파일명 (순번 + 파일명에 쓸 수 없는 문자를 바꾼 회사명)
+def archive_name(index, company):
+    safe = re.sub(r'[\\/:*?"<>|\s]+', '_', company).strip('_') or 'company'
+    return f"{index + 1:05d}_{safe}"
+
+
+# 기업별 보고서 내용 (results: value_portfolio() 결과, start: 첫 기업의 순번)
+def report_items(portfolio, results, date, start=0):
+    methods = [engine.METHOD_NAMES[method] for method in engine.METHOD_NAMES]
+    values = results[list(engine.METHOD_NAMES)].to_numpy(dtype=float)
+    for index, (company, industry) in enumerate(zip(portfolio['company'], portfolio['industry'])):
+        yield {
+            'index': start + index,
+            'company': str(company),
+            'industry': str(industry),
+            'date': date,
+            'methods': methods,
+            'values': values[index].tolist()
+        }
+
+
+# 보고서 일괄 생성 후 ZIP 기록 (output: 파일 경로 또는 쓰기 가능한 파일 객체)
+# workers=0이면 현재 프로세스에서 순서대로 생성, max_pending: 동시에 처리 중인 최대 기업 수
+# start: 포트폴리오 첫 기업의 전체 순번 (구간별로 나누어 생성할 때 파일명 순번용)
+# report(완료 기업 수, 전체 기업 수): 진행 상황 콜백
+def write_report_archive(portfolio, output, parameters=None, growth_estimator=None, formats=('html',),
+                         workers=None, font_path=None, max_pending=None, report=None, start=0):
+    unknown = [fmt for fmt in formats if fmt not in REPORT_FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"지원하지 않는 보고서 형식입니다: {', '.join(unknown) or '(없음)'}")
+
+    results = value_portfolio(portfolio, parameters, growth_estimator)
+    items = report_items(portfolio, results, datetime.now().strftime('%Y-%m-%d'), start)
+    total = len(results)
+    completed = 0
+
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        def write(outputs):
+            nonlocal completed
+            for name, data in outputs:
+                # PDF는 내부적으로 압축되어 있으므로 그대로 저장
+                archive.writestr(name, data, compress_type=zipfile.ZIP_STORED if name.endswith('.pdf') else None)
+            completed += 1
+            if report is not None:
+                report(completed, total)
+
+        if workers == 0:
+            init_worker(formats, font_path)
+            for item in items:
+                write(render_company(item))
+            return completed
+
+        workers = workers or os.cpu_count() or 1
+        max_pending = max_pending or workers * 4
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(formats, font_path)) as executor:
+            pending = set()
+            for item in items:
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        write(future.result())
+                pending.add(executor.submit(render_company, item))
+            for future in wait(pending).done:
+                write(future.result())
+
+    return completed
+
+
+# 공유 작업 실행기로 보고서 일괄 생성 (jobs.py의 'io' 작업으로 실행)
+# 기업을 shards개(기본값: CPU 작업 워커 수) 구간으로 나누어 구간별 ZIP을 'cpu' 작업으로 만들고,
+# 모두 끝나면 하나의 ZIP으로 합침 (동시 실행 수는 실행기의 워커 수로 제한되고 글꼴·레이아웃은 워커마다 재사용)
+# 이 작업이 취소되면 진행 중인 구간 작업도 취소
+def write_report_archive_sharded(portfolio, output, parameters=None, growth_estimator=None, formats=('html',),
+                                 shards=None, font_path=None, report=None):
+    total = len(portfolio['company'])
+    bounds = np.linspace(0, total, min(shards or jobs.MAX_CPU_JOBS, total) + 1).astype(int)
+    parts = [f"{output}.{index}.part" for index in range(len(bounds) - 1)]
+    submitted = []
+    try:
+        for part, start, end in zip(parts, bounds[:-1], bounds[1:]):
+            submitted.append(jobs.submit('cpu', write_report_archive, select_companies(portfolio, start, end), part,
+                                         parameters, growth_estimator, formats, 0, font_path, start=int(start)))
+
+        while not all(job.done() for job in submitted):
+            if report is not None:
+                report(sum(end - start if job.done() else (job.progress() or (0, 0))[0]
+                           for job, start, end in zip(submitted, bounds[:-1], bounds[1:])), total)
+            time.sleep(0.2)
+        completed = sum(job.result() for job in submitted)
+
+        with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for part in parts:
+                with zipfile.ZipFile(part) as source:
+                    for info in source.infolist():
+                        archive.writestr(info, source.read(info))
+        if report is not None:
+            report(completed, total)
+        return completed
+    finally:
+        for job in submitted:
+            if not job.done():
+                jobs.cancel(job)
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영업권 평가 시스템 포트폴리오 보고서 일괄 생성")
+    parser.add_argument("source", help="포트폴리오 CSV 경로")
+    parser.add_argument("--output", required=True, help="보고서 ZIP 파일 경로")
+    parser.add_argument("--formats", nargs="+", choices=list(REPORT_FORMATS), default=['html', 'pdf'],
+                        help="보고서 형식")
+    parser.add_argument("--workers", type=int, help="워커 프로세스 수 (기본값: CPU 수, 0이면 현재 프로세스에서 실행)")
+    parser.add_argument("--growth", choices=list(GROWTH_ESTIMATORS),
+                        help="DCF 성장률을 기업별 과거 영업이익 추정 성장률로 대체")
+    parser.add_argument("--earnings", choices=list(EARNINGS_SCHEMES), default='mean',
+                        help="초과이익법 평균 이익 산출 방식")
+    parser.add_argument("--font", help="보고서에 사용할 한글 글꼴 파일 (.ttf/.otf)")
+    args = parser.parse_args()
+
+    portfolio = load_portfolio(args.source)
+    start = time.time()
+
+    def progress(completed, total):
+        if completed % 100 == 0 or completed == total:
+            elapsed = time.time() - start
+            print(f"[{completed:,}/{total:,}] {completed / elapsed:,.1f}개/초")
+
+    count = write_report_archive(portfolio, args.output, parameters={'excess_earnings': {'earnings_scheme': args.earnings}},
+                                 growth_estimator=args.growth, formats=args.formats, workers=args.workers,
+                                 font_path=args.font, report=progress)
+    print(f"{count:,}개 기업의 보고서가 {args.output}에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# 영업권 평가 시스템 - CAPM/WACC 할인율 산정
+#
+# DCF 할인율의 근거를 만들기 위해 유사기업(peer) 주가와 시장지수 파일로 베타를 추정합니다.
+# - 베타 추정: 모든 유사기업의 수익률을 한 행렬로 놓고 시장 수익률에 대한 회귀를 한 번에 계산
+#   (기업별로 관측 기간이 달라도 결측 마스크로 처리)
+# - 레버리지 조정: 유사기업 베타를 Hamada 식으로 무부채 베타로 바꾼 뒤 평가 대상의 부채비율로 재조정
+# - WACC = 자기자본 비중 × (무위험이자율 + 베타 × 시장위험프리미엄) + 타인자본 비중 × 타인자본비용 × (1 - 법인세율)
+# 베타 추정 결과는 파일 내용의 해시로 캐시되므로 페이지가 다시 실행되어도 회귀를 반복하지 않습니다.
+#
+# 파일 형식 (CSV, 첫 컬럼은 날짜):
+#   유사기업 가격: 날짜, 기업A, 기업B, ... (종가 또는 수익률)
+#   시장지수: 날짜, 지수 (종가 또는 수익률)
+#   유사기업 자본구조(선택): 회사명, 총부채, 자본
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from financial_schema import resolve_columns
+
+# 베타 추정 결과 캐시 (파일 해시 → 결과), 오래된 항목부터 제거
+# 여러 세션과 작업 스레드가 함께 사용하므로 조회·갱신은 _BETA_CACHE_LOCK 안에서만 수행 (추정 계산은 잠금 밖)
+_BETA_CACHE = OrderedDict()
+_BETA_CACHE_SIZE = 16
+_BETA_CACHE_LOCK = threading.Lock()
+
+
+# 날짜별 시계열 파일 읽기 (첫 컬럼을 날짜 인덱스로 사용, 천 단위 구분 기호 허용)
+def read_series(source):
+    df = pd.read_csv(io.BytesIO(source) if isinstance(source, bytes) else source, thousands=',')
+    df.index = pd.to_datetime(df.iloc[:, 0], errors='coerce')
+    df = df.iloc[:, 1:].apply(pd.to_numeric, errors='coerce')
+    return df[df.index.notna()].sort_index()
+
+
+# 가격 → 단순 수익률 (0 이하 가격은 결측 처리)
+def price_returns(prices):
+    prices = prices.where(prices > 0)
+    return prices.pct_change(fill_method=None).iloc[1:]
+
+
+# 베타 일괄 추정 (OLS: r_i = alpha_i + beta_i × r_m)
+# peer_returns: (T, N) 수익률 행렬, market_returns: (T,) 시장 수익률 (결측은 NaN)
+# 관측치가 min_observations 미만인 유사기업은 NaN
+def estimate_betas(peer_returns, market_returns, min_observations=24):
+    peer_returns = np.asarray(peer_returns, dtype=float)
+    market_returns = np.asarray(market_returns, dtype=float)[:, None]
+
+    mask = ~np.isnan(peer_returns) & ~np.isnan(market_returns)
+    n = mask.sum(axis=0).astype(float)
+    r = np.where(mask, peer_returns, 0.0)
+    m = np.where(mask, market_returns, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_r = r.sum(axis=0) / n
+        mean_m = m.sum(axis=0) / n
+        dr = np.where(mask, r - mean_r, 0.0)
+        dm = np.where(mask, m - mean_m, 0.0)
+        sxx = (dm * dm).sum(axis=0)
+        sxy = (dm * dr).sum(axis=0)
+        syy = (dr * dr).sum(axis=0)
+
+        beta = sxy / sxx
+        alpha = mean_r - beta * mean_m
+        residual_ss = syy - beta * sxy
+        r_squared = 1 - residual_ss / syy
+        std_error = np.sqrt(residual_ss / (n - 2) / sxx)
+
+    valid = n >= max(min_observations, 3)
+    return {
+        'beta': np.where(valid, beta, np.nan),
+        'alpha': np.where(valid, alpha, np.nan),
+        'r_squared': np.where(valid, r_squared, np.nan),
+        'std_error': np.where(valid, std_error, np.nan),
+        'observations': n.astype(int)
+    }
+
+
+# 유사기업 베타 표 (파일 내용 해시로 캐시)
+# peer_source, index_source: CSV 파일 내용(bytes), prices: 파일 값이 가격이면 True, 수익률이면 False
+def peer_betas(peer_source, index_source, prices=True, min_observations=24):
+    key = (hashlib.sha256(peer_source).hexdigest(), hashlib.sha256(index_source).hexdigest(),
+           prices, min_observations)
+    with _BETA_CACHE_LOCK:
+        if key in _BETA_CACHE:
+            _BETA_CACHE.move_to_end(key)
+            return _BETA_CACHE[key]
+
+    peers = read_series(peer_source)
+    market = read_series(index_source).iloc[:, 0]
+    if prices:
+        peers = price_returns(peers)
+        market = price_returns(market.to_frame()).iloc[:, 0]
+
+    # 날짜 기준 정렬 (시장 수익률이 있는 날짜만 사용)
+    peers = peers.reindex(market.dropna().index)
+    market = market.reindex(peers.index)
+    estimates = estimate_betas(peers.to_numpy(), market.to_numpy(), min_observations)
+
+    table = pd.DataFrame({
+        '회사명': peers.columns.astype(str),
+        '베타': estimates['beta'],
+        '표준오차': estimates['std_error'],
+        '알파': estimates['alpha'],
+        '결정계수': estimates['r_squared'],
+        '관측치 수': estimates['observations']
+    })
+
+    with _BETA_CACHE_LOCK:
+        _BETA_CACHE[key] = table
+        _BETA_CACHE.move_to_end(key)
+        while len(_BETA_CACHE) > _BETA_CACHE_SIZE:
+            _BETA_CACHE.popitem(last=False)
+    return table
+
+
+# 유사기업 부채비율(D/E) 읽기 (회사명, 총부채, 자본 컬럼; 별칭 허용)
+def read_peer_leverage(source):
+    df = pd.read_csv(io.BytesIO(source) if isinstance(source, bytes) else source, thousands=',')
+    df = df.rename(columns=resolve_columns(df.columns))
+    missing = [col for col in ['회사명', '총부채', '자본'] if col not in df.columns]
+    if missing:
+        raise ValueError(f"유사기업 자본구조 파일에 필수 컬럼이 없습니다: {', '.join(missing)}")
+    debt = pd.to_numeric(df['총부채'], errors='coerce')
+    equity = pd.to_numeric(df['자본'], errors='coerce')
+    return pd.Series((debt / equity.where(equity > 0)).to_numpy(), index=df['회사명'].astype(str))
+
+
+# 평가 대상의 부채비율(D/E) (표준화된 재무 데이터의 최신 연도 총부채 / 자본)과 보정 여부
+# 총부채·자본 중 하나라도 보정된 값(총자산 × 40% / 60%)이면 보정 여부가 True (고정 가정 D/E ≈ 0.67 반영)
+def subject_debt_to_equity(data):
+    latest = data['offsets'][1:] - 1
+    equity = data['values']['자본'][latest]
+    debt_to_equity = np.where(equity > 0, data['values']['총부채'][latest] / np.where(equity > 0, equity, 1.0), np.nan)
+    return debt_to_equity, data['imputed']['총부채'][latest] | data['imputed']['자본'][latest]
+
+
+# Hamada 식 무부채 베타 / 재조정 베타 (tax_rate는 % 단위)
+def unlever_beta(beta, debt_to_equity, tax_rate):
+    return np.asarray(beta, dtype=float) / (1 + (1 - np.asarray(tax_rate) / 100) * np.asarray(debt_to_equity))
+
+
+def relever_beta(unlevered_beta, debt_to_equity, tax_rate):
+    return np.asarray(unlevered_beta, dtype=float) * (1 + (1 - np.asarray(tax_rate) / 100) * np.asarray(debt_to_equity))
+
+
+# WACC 산정 (비율 매개변수는 % 단위)
+# betas: peer_betas() 결과, peer_leverage: 유사기업별 D/E (없으면 유사기업 베타를 무부채 베타로 간주)
+# peer_leverage에 없거나 D/E를 계산할 수 없는 유사기업은 무부채 베타를 NaN으로 두어 중앙값에서 제외 (unknown_leverage)
+def build_wacc(betas, subject_debt_to_equity, risk_free_rate, market_risk_premium, cost_of_debt, tax_rate,
+               peer_leverage=None):
+    peers = betas.copy()
+    leverage = (peer_leverage.reindex(peers['회사명']).to_numpy() if peer_leverage is not None
+                else np.zeros(len(peers)))
+    peers['부채비율(D/E)'] = leverage
+    peers['무부채 베타'] = unlever_beta(peers['베타'], leverage, tax_rate)
+    unknown_leverage = peers.loc[peers['베타'].notna() & np.isnan(leverage), '회사명'].tolist()
+
+    # 이상치 영향을 줄이기 위해 유사기업 무부채 베타의 중앙값 사용
+    valid = peers['무부채 베타'].notna()
+    if not valid.any():
+        if unknown_leverage:
+            raise ValueError("자본구조 파일에서 부채비율을 확인할 수 있는 유사기업이 없습니다.")
+        raise ValueError("베타를 추정할 수 있는 유사기업이 없습니다. 관측 기간을 확인해주세요.")
+    unlevered = float(peers.loc[valid, '무부채 베타'].median())
+    debt_to_equity = 0.0 if np.isnan(subject_debt_to_equity) else float(subject_debt_to_equity)
+    levered = float(relever_beta(unlevered, debt_to_equity, tax_rate))
+
+    cost_of_equity = risk_free_rate + levered * market_risk_premium
+    equity_weight = 1 / (1 + debt_to_equity)
+    debt_weight = 1 - equity_weight
+    wacc = equity_weight * cost_of_equity + debt_weight * cost_of_debt * (1 - tax_rate / 100)
+
+    return {
+        'peers': peers,
+        'peer_count': int(valid.sum()),
+        'unknown_leverage': unknown_leverage,
+        'unlevered_beta': unlevered,
+        'debt_to_equity': debt_to_equity,
+        'levered_beta': levered,
+        'cost_of_equity': cost_of_equity,
+        'equity_weight': equity_weight,
+        'debt_weight': debt_weight,
+        'wacc': wacc
+    }
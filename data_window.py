@@ -0,0 +1,51 @@
+# 영업권 평가 시스템 - 재무 데이터 페이지 단위 편집
+#
+# 분기·월별 또는 장기간 재무 데이터를 한 번에 편집기로 보내지 않도록
+# 전체 데이터는 서버(세션)에 표준 형식(연도 int, 항목 float64)으로 보관하고 현재 페이지의 행만 화면에 표시합니다.
+# 저장 시에는 화면의 페이지와 원본 페이지를 비교하여 바뀐 셀만 전체 데이터에 반영합니다.
+
+import numpy as np
+
+PAGE_SIZES = [25, 50, 100]
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+# 페이지(1부터 시작)의 행 구간 [start, end)
+def page_bounds(n_rows, page, page_size):
+    start = (page - 1) * page_size
+    return start, min(start + page_size, n_rows)
+
+
+# 편집기 결과에서 바뀐 셀 {컬럼: (페이지 내 행 위치 배열, 새 값 배열)}
+def edited_cells(window, edited):
+    edits = {}
+    for column in window.columns:
+        before = window[column].to_numpy()
+        after = edited[column].to_numpy()
+        same = before == after
+        if before.dtype.kind in 'fc' or after.dtype.kind in 'fc':
+            same |= (before != before) & (after != after)  # NaN끼리는 같은 값
+        changed = np.flatnonzero(~same)
+        if len(changed):
+            edits[column] = (changed, after[changed])
+    return edits
+
+
+# 바뀐 셀을 반영한 전체 데이터 (변경이 없으면 원래 DataFrame 그대로)
+# 정수 컬럼에 소수 값이 입력된 경우처럼 형식이 맞지 않으면 해당 컬럼만 넓은 형식으로 변환
+def apply_cell_edits(frame, start, edits):
+    if not edits:
+        return frame
+
+    frame = frame.copy()
+    for column, (rows, values) in edits.items():
+        column_values = frame[column].to_numpy(copy=True)
+        dtype = np.result_type(column_values, np.asarray(values))
+        if dtype != column_values.dtype:
+            column_values = column_values.astype(dtype)
+        column_values[start + rows] = values
+        frame[column] = column_values
+    return frame
@@ -0,0 +1,118 @@
+# 영업권 평가 시스템 - 정상 이익(당기순이익) 산출 방식
+#
+# 초과이익법의 평균 이익과 상증법의 최근 3년 가중평균 순손익액을 여러 방식으로 계산합니다.
+# - 단순 평균: 전체 연도 평균
+# - 선형 가중: 연수가 n인 기업은 최신 연도부터 n, n-1, ..., 1의 가중치
+# - 지수 감소 가중: 최신 연도부터 1, d, d², ... (d = EXPONENTIAL_DECAY)
+# - 3:2:1 가중 (상증법): 최근 3개 연도에 3, 2, 1의 가중치
+# - 절사 평균: 상·하위 TRIM_PROPORTION 비율의 관측치를 제외한 평균
+# - 이상치 조정 평균: 중앙값 ± OUTLIER_THRESHOLD × MAD(정규분포 환산) 밖의 값을 경계값으로 바꾼 평균
+# 모든 기업을 (기업 × 최대 연수) 행렬(0열 = 최신 연도)로 펼쳐 계산하며,
+# 가중 방식들은 (방식 × 기업 × 연수) 가중치 배열로 한 번에 계산합니다. 결측 연도(NaN)는 제외합니다.
+
+import numpy as np
+import pandas as pd
+
+from growth import row_quantile
+
+# 상증법 순손익액 가중치 (최근 연도부터 3:2:1)
+STATUTORY_WEIGHTS = (3, 2, 1)
+
+EXPONENTIAL_DECAY = 0.7
+TRIM_PROPORTION = 0.2
+OUTLIER_THRESHOLD = 2.5
+
+SCHEMES = {
+    'mean': '단순 평균',
+    'linear': '선형 가중 평균',
+    'exponential': '지수 감소 가중 평균',
+    'statutory': '3:2:1 가중 평균 (상증법)',
+    'trimmed': '절사 평균',
+    'outlier_adjusted': '이상치 조정 평균'
+}
+
+# '최근 연도에 가중치 부여' 선택 시 사용할 수 있는 방식
+RECENT_WEIGHTED_SCHEMES = ['linear', 'exponential', 'statutory']
+
+
+# 기업별 최근 연도부터의 값 행렬 (기업 수 × 최대 연수, 0열 = 최신 연도, 연도가 없는 칸은 NaN)과 기업별 연수
+def recent_matrix(data, column='당기순이익'):
+    starts = data['offsets'][:-1]
+    latest = data['offsets'][1:] - 1
+    lengths = latest - starts + 1
+    width = int(lengths.max()) if len(lengths) else 0
+
+    rows = latest[:, None] - np.arange(width)[None, :]
+    values = data['values'][column]
+    matrix = values[np.clip(rows, 0, None)] if len(values) else np.full(rows.shape, np.nan)
+    return np.where(rows >= starts[:, None], matrix, np.nan), lengths
+
+
+# 가중 방식별 가중치 (방식 수 × 기업 수 × 최대 연수)
+def _scheme_weights(schemes, lengths, width):
+    age = np.arange(width, dtype=float)
+    statutory = np.zeros(width)
+    statutory[:min(width, len(STATUTORY_WEIGHTS))] = STATUTORY_WEIGHTS[:width]
+    rows = {
+        'mean': np.ones(width),
+        'linear': np.maximum(lengths[:, None] - age[None, :], 0.0),
+        'exponential': EXPONENTIAL_DECAY ** age,
+        'statutory': statutory
+    }
+    return np.stack([np.broadcast_to(rows[scheme], (len(lengths), width)) for scheme in schemes])
+
+
+# 결측을 제외한 가중평균 (가중치 합이 0이면 NaN)
+def _weighted_mean(matrix, weights):
+    valid = ~np.isnan(matrix)
+    weights = np.where(valid, weights, 0.0)
+    total_weight = weights.sum(axis=-1)
+    total = (weights * np.where(valid, matrix, 0.0)).sum(axis=-1)
+    return np.divide(total, total_weight, out=np.full(total.shape, np.nan), where=total_weight > 0)
+
+
+# 상·하위 proportion 비율(관측치 수 기준 내림)을 제외한 평균
+def _trimmed_mean(matrix, proportion):
+    ordered = np.sort(matrix, axis=1)  # NaN은 뒤로 정렬됨
+    count = (~np.isnan(matrix)).sum(axis=1)
+    cut = np.floor(count * proportion).astype(int)
+    position = np.arange(matrix.shape[1])[None, :]
+    keep = (position >= cut[:, None]) & (position < (count - cut)[:, None])
+    return _weighted_mean(np.where(keep, ordered, np.nan), 1.0)
+
+
+# 중앙값에서 threshold × MAD 이상 벗어난 값을 경계값으로 바꾼 평균
+def _outlier_adjusted_mean(matrix, threshold):
+    median = row_quantile(matrix, 0.5)
+    mad = row_quantile(np.abs(matrix - median[:, None]), 0.5) * 1.4826
+    clipped = np.clip(matrix, (median - threshold * mad)[:, None], (median + threshold * mad)[:, None])
+    return _weighted_mean(clipped, 1.0)
+
+
+# 기업별 정상 이익 {방식: 기업 수 길이 배열}
+def normalized_earnings(data, schemes=tuple(SCHEMES), column='당기순이익'):
+    unknown = [scheme for scheme in schemes if scheme not in SCHEMES]
+    if unknown:
+        raise ValueError(f"알 수 없는 이익 산출 방식입니다: {', '.join(unknown)}")
+
+    matrix, lengths = recent_matrix(data, column)
+    results = {}
+
+    weighted = [scheme for scheme in dict.fromkeys(schemes) if scheme in ('mean', 'linear', 'exponential', 'statutory')]
+    if weighted:
+        values = _weighted_mean(matrix[None, :, :], _scheme_weights(weighted, lengths, matrix.shape[1]))
+        results.update(zip(weighted, values))
+
+    with np.errstate(invalid='ignore'):
+        if 'trimmed' in schemes:
+            results['trimmed'] = _trimmed_mean(matrix, TRIM_PROPORTION)
+        if 'outlier_adjusted' in schemes:
+            results['outlier_adjusted'] = _outlier_adjusted_mean(matrix, OUTLIER_THRESHOLD)
+
+    return {scheme: results[scheme] for scheme in schemes}
+
+
+# 기업 × 방식별 정상 이익 표 (방식 비교용)
+def earnings_table(data, schemes=tuple(SCHEMES), column='당기순이익'):
+    earnings = normalized_earnings(data, schemes, column)
+    return pd.DataFrame(dict({'회사명': data['company']}, **{SCHEMES[scheme]: earnings[scheme] for scheme in schemes}))
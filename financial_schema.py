@@ -0,0 +1,157 @@
+# 영업권 평가 시스템 - 재무 데이터 표준화
+#
+# 재무 데이터를 입력(저장/업로드) 시점에 한 번만 표준 형식으로 변환합니다.
+# - 컬럼 별칭(영문명, 회계 용어 변형 등)을 표준 컬럼명으로 통일
+# - 숫자 형식 변환(천 단위 구분 기호 제거 등) 및 연도 정수화
+# - 기업별 연도 오름차순 정렬 및 중복 연도 정리
+# - 누락 항목 보정(예: 영업이익 = 당기순이익 × 1.25) 및 보정 내역 기록
+# 결과는 컬럼별 연속 배열(float64)로 저장되며, 평가 엔진은 DataFrame 대신 이 배열을 직접 읽습니다.
+
+import numpy as np
+import pandas as pd
+
+# 표준 재무 항목 (연도 제외)
+FINANCIAL_COLUMNS = ['매출액', '영업이익', '당기순이익', '총자산', '총부채', '자본']
+
+# 표준 컬럼명별 허용 별칭
+COLUMN_ALIASES = {
+    '회사명': ['회사명', '기업명', '법인명', 'company', 'company_name', 'name'],
+    '산업군': ['산업군', '업종', '산업', 'industry', 'sector'],
+    '연도': ['연도', '년도', '회계연도', '사업연도', 'year', 'fiscal_year'],
+    '매출액': ['매출액', '매출', '수익', 'revenue', 'sales'],
+    '영업이익': ['영업이익', '영업손익', 'operating_profit', 'operating_income', 'ebit'],
+    '당기순이익': ['당기순이익', '순이익', '당기순손익', 'net_income', 'net_profit'],
+    '총자산': ['총자산', '자산총계', 'total_assets', 'assets'],
+    '총부채': ['총부채', '부채총계', 'total_debt', 'total_liabilities', 'liabilities'],
+    '자본': ['자본', '자본총계', '순자산', 'equity', 'total_equity']
+}
+
+# 누락 항목 보정 규칙 (적용 순서대로): 대상, 원천, 배수, 설명
+# 각 평가 페이지에서 사용하던 가정을 한곳에 모은 것입니다.
+IMPUTATION_RULES = [
+    ('영업이익', '당기순이익', 1.25, '영업이익 = 당기순이익 × 125%'),
+    ('당기순이익', '영업이익', 0.7, '당기순이익 = 영업이익 × 70%'),
+    ('매출액', '영업이익', 10.0, '매출액 = 영업이익 × 10'),
+    ('총부채', '총자산', 0.4, '총부채 = 총자산 × 40%'),
+    ('자본', '총자산', 0.6, '자본 = 총자산 × 60%')
+]
+
+
+# 컬럼 별칭 → 표준 컬럼명 매핑 (대소문자, 앞뒤 공백 무시)
+def resolve_columns(columns):
+    lookup = {alias.strip().lower(): canonical
+              for canonical, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    mapping = {}
+    for column in columns:
+        canonical = lookup.get(str(column).strip().lower())
+        if canonical is not None and canonical not in mapping.values():
+            mapping[column] = canonical
+    return mapping
+
+
+# 숫자 변환 (문자열의 천 단위 구분 기호·공백 제거)
+def _to_number(series):
+    if not pd.api.types.is_numeric_dtype(series):
+        series = series.astype(str).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(series, errors='coerce')
+
+
+# 표준 컬럼명으로 정리한 DataFrame (보정 전 원본 값, 기업별 최신 연도가 첫 행)
+def canonical_frame(df):
+    df = df.rename(columns=resolve_columns(df.columns))
+    if '연도' not in df.columns:
+        raise ValueError("재무 데이터에 연도 컬럼이 없습니다.")
+    if '당기순이익' not in df.columns and '영업이익' not in df.columns:
+        raise ValueError("재무 데이터에 당기순이익 또는 영업이익 컬럼이 필요합니다.")
+
+    columns = [col for col in ['회사명', '산업군', '연도'] + FINANCIAL_COLUMNS if col in df.columns]
+    df = df[columns].copy()
+    df['연도'] = _to_number(df['연도'])
+    df = df.dropna(subset=['연도'])
+    df['연도'] = df['연도'].astype(int)
+    for col in FINANCIAL_COLUMNS:
+        if col in df.columns:
+            df[col] = _to_number(df[col]).astype(float)
+
+    keys = ['회사명', '연도'] if '회사명' in df.columns else ['연도']
+    df = df.drop_duplicates(subset=keys, keep='last')
+    return df.sort_values(keys, ascending=[True] * (len(keys) - 1) + [False], kind='stable').reset_index(drop=True)
+
+
+# 재무 데이터 표준화
+# 반환 dict:
+#   company, industry: 기업별 회사명/산업군 (기업 수 C)
+#   offsets: 기업별 행 구간 시작 위치 (C + 1), 기업 i의 행은 offsets[i]:offsets[i+1]
+#   years: 연도 (int64, 기업 내 오름차순)
+#   values: 표준 항목별 float64 연속 배열
+#   imputed: 표준 항목별 보정 여부 (bool 배열)
+#   imputations: 적용된 보정 내역 목록
+def normalize_financial_data(df, company='', industry=''):
+    frame = canonical_frame(df)
+    n_rows_input = len(df)
+
+    if '회사명' not in frame.columns:
+        frame['회사명'] = company
+    frame['회사명'] = frame['회사명'].astype(str)
+    if '산업군' not in frame.columns:
+        frame['산업군'] = industry
+    frame['산업군'] = frame['산업군'].fillna(industry or '기타')
+
+    # 기업별 연도 오름차순 정렬
+    frame = frame.sort_values(['회사명', '연도'], kind='stable').reset_index(drop=True)
+    companies = frame['회사명'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, companies[1:] != companies[:-1]]) if len(frame) else np.array([], dtype=int)
+    offsets = np.append(starts, len(frame)).astype(np.int64)
+
+    values = {}
+    imputed = {}
+    for col in FINANCIAL_COLUMNS:
+        values[col] = (frame[col].to_numpy(dtype=np.float64, copy=True) if col in frame.columns
+                       else np.full(len(frame), np.nan))
+        imputed[col] = np.zeros(len(frame), dtype=bool)
+
+    imputations = []
+    if n_rows_input != len(frame):
+        imputations.append({'항목': '연도', '규칙': '연도가 없거나 중복된 행 제외', '행 수': n_rows_input - len(frame)})
+
+    # 누락 항목 보정
+    for target, source, factor, description in IMPUTATION_RULES:
+        missing = np.isnan(values[target]) & ~np.isnan(values[source])
+        if missing.any():
+            values[target][missing] = values[source][missing] * factor
+            imputed[target] |= missing
+            imputations.append({'항목': target, '규칙': description, '행 수': int(missing.sum())})
+
+    return {
+        'company': companies[starts],
+        'industry': frame['산업군'].to_numpy()[starts],
+        'offsets': offsets,
+        'years': np.ascontiguousarray(frame['연도'].to_numpy(dtype=np.int64)),
+        'values': values,
+        'imputed': imputed,
+        'imputations': imputations
+    }
+
+
+# 보정 없이 원본으로 입력된 값 여부
+def reported(data, column):
+    return ~data['imputed'][column] & ~np.isnan(data['values'][column])
+
+
+# 표준화된 데이터에서 기업 구간 추출 (기업 순번 start 이상 end 미만)
+def select_companies(data, start, end):
+    row_start, row_end = data['offsets'][start], data['offsets'][end]
+    return {
+        'company': data['company'][start:end],
+        'industry': data['industry'][start:end],
+        'offsets': data['offsets'][start:end + 1] - row_start,
+        'years': data['years'][row_start:row_end],
+        'values': {col: values[row_start:row_end] for col, values in data['values'].items()},
+        'imputed': {col: flags[row_start:row_end] for col, flags in data['imputed'].items()},
+        'imputations': data['imputations']
+    }
+
+
+# 표준화된 데이터에서 한 기업만 추출 (기업 순번 기준)
+def select_company(data, index):
+    return select_companies(data, index, index + 1)
@@ -0,0 +1,207 @@
+# 영업권 평가 시스템 - 그룹(지배·종속기업) 영업권 평가
+#
+# 지배구조 CSV(회사명, 상위회사, 지분율)와 기업-연도별 재무 데이터(포트폴리오 CSV 형식)로
+# 그룹의 모든 기업을 평가 방법별 엔진 한 번 호출로 평가한 뒤 지배구조를 따라 영업권을 합산합니다.
+# - 자체 영업권: 기업 단독 평가액 (평가할 수 없는 기업은 합산 시 0)
+# - 연결 영업권: 자체 영업권 + 종속기업 연결 영업권 전액 (전부영업권)
+# - 지배기업 귀속 영업권: 자체 영업권 + Σ 지분율 × 종속기업의 지배기업 귀속 영업권
+# - 비지배지분: 연결 영업권 - 지배기업 귀속 영업권 (간접 보유분의 비지배지분 포함)
+# 합산은 계층별로 한 번씩 배열 연산으로 처리하며,
+# 한 기업의 재무 데이터가 바뀌면 그 기업만 다시 평가하고 최상위 기업까지의 경로만 다시 합산합니다.
+
+import numpy as np
+import pandas as pd
+
+import valuation_engine as engine
+from financial_schema import COLUMN_ALIASES, FINANCIAL_COLUMNS, select_company
+from portfolio import load_portfolio, portfolio_parameters, value_portfolio
+
+# 지배구조 컬럼별 허용 별칭
+STRUCTURE_ALIASES = {
+    '회사명': COLUMN_ALIASES['회사명'],
+    '상위회사': ['상위회사', '지배회사', '모회사', 'parent', 'parent_company'],
+    '지분율': ['지분율', '지분율(%)', '보유지분율', 'ownership', 'ownership_pct']
+}
+
+
+# 지배구조 검증 및 표준화
+# 상위회사가 비어 있는 기업은 최상위 기업이며, 지분율(%)은 상위회사가 보유한 지분 비율입니다.
+def load_structure(source):
+    df = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+    lookup = {alias.strip().lower(): canonical for canonical, aliases in STRUCTURE_ALIASES.items() for alias in aliases}
+    df = df.rename(columns={column: lookup[str(column).strip().lower()] for column in df.columns
+                            if str(column).strip().lower() in lookup})
+
+    missing = [column for column in ('회사명', '상위회사') if column not in df.columns]
+    if missing:
+        raise ValueError(f"지배구조 데이터에 필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    entity = df['회사명'].astype(str).str.strip().to_numpy()
+    parent_name = df['상위회사'].where(df['상위회사'].notna(), '').astype(str).str.strip().to_numpy()
+    duplicated = pd.unique(entity[pd.Series(entity).duplicated().to_numpy()])
+    if len(duplicated):
+        raise ValueError(f"지배구조에 중복된 기업이 있습니다: {', '.join(duplicated[:10])}")
+
+    positions = pd.Index(entity)
+    root = parent_name == ''
+    parent = np.where(root, -1, positions.get_indexer(parent_name))
+    unknown = pd.unique(parent_name[(parent == -1) & ~root])
+    if len(unknown):
+        raise ValueError(f"지배구조에 없는 상위회사입니다: {', '.join(unknown[:10])}")
+
+    ownership = (pd.to_numeric(df['지분율'], errors='coerce').to_numpy(dtype=float)
+                 if '지분율' in df.columns else np.full(len(df), np.nan))
+    invalid = ~root & ~((ownership > 0) & (ownership <= 100))
+    if invalid.any():
+        raise ValueError(f"종속기업의 지분율은 0% 초과 100% 이하여야 합니다: {', '.join(entity[invalid][:10])}")
+    ownership = np.where(root, 1.0, ownership / 100)
+
+    # 계층 (최상위 = 0): 상위 계층부터 차례로 내려가며, 도달하지 못한 기업은 순환 구조
+    depth = np.full(len(entity), -1, dtype=np.int64)
+    depth[root] = 0
+    level = 0
+    while True:
+        current = (depth == -1) & np.isin(parent, np.flatnonzero(depth == level))
+        if not current.any():
+            break
+        level += 1
+        depth[current] = level
+    if (depth == -1).any():
+        raise ValueError(f"지배구조에 순환 관계가 있습니다: {', '.join(entity[depth == -1][:10])}")
+
+    # 하위 기업 목록 (기업 i의 종속기업 = children[child_offsets[i]:child_offsets[i + 1]])
+    order = np.argsort(np.where(parent >= 0, parent, len(entity)), kind='stable')
+    counts = np.bincount(parent[parent >= 0], minlength=len(entity))
+
+    return {
+        'entity': entity,
+        'parent': parent,
+        'ownership': ownership,
+        'depth': depth,
+        'children': order[:counts.sum()],
+        'child_offsets': np.append(0, np.cumsum(counts))
+    }
+
+
+# 기업의 종속기업 순번 배열
+def children(structure, index):
+    return structure['children'][structure['child_offsets'][index]:structure['child_offsets'][index + 1]]
+
+
+# 기업에서 최상위 기업까지의 경로 (기업 자신부터)
+def path_to_root(structure, index):
+    path = [index]
+    while structure['parent'][path[-1]] >= 0:
+        path.append(int(structure['parent'][path[-1]]))
+    return path
+
+
+# 최상위 기업 기준 유효 지분율 (경로상 지분율의 곱)
+def effective_ownership(structure):
+    effective = structure['ownership'].copy()
+    for level in range(1, int(structure['depth'].max()) + 1 if len(effective) else 0):
+        current = structure['depth'] == level
+        effective[current] *= effective[structure['parent'][current]]
+    return effective
+
+
+# 계층별 합산 (가장 아래 계층부터 상위회사로 더함)
+def roll_up(structure, standalone):
+    consolidated = np.nan_to_num(standalone, nan=0.0)
+    attributable = consolidated.copy()
+    parent, ownership, depth = structure['parent'], structure['ownership'], structure['depth']
+    for level in range(int(depth.max()) if len(depth) else 0, 0, -1):
+        current = depth == level
+        np.add.at(consolidated, parent[current], consolidated[current])
+        np.add.at(attributable, parent[current], ownership[current] * attributable[current])
+    return consolidated, attributable
+
+
+# 그룹 평가 (기업별 평가 방법별 자체 영업권과 지배구조에 따른 합산)
+# financials: load_portfolio()로 표준화된 기업별 재무 데이터 (지배구조의 모든 기업 포함)
+def value_group(structure, financials, parameters=None, growth_estimator=None):
+    portfolio_index = pd.Index(financials['company']).get_indexer(structure['entity'])
+    missing = structure['entity'][portfolio_index == -1]
+    if len(missing):
+        raise ValueError(f"재무 데이터가 없는 기업이 있습니다: {', '.join(missing[:10])}")
+
+    results = value_portfolio(financials, parameters, growth_estimator)
+    group = {
+        'structure': structure,
+        'financials': financials,
+        'portfolio_index': portfolio_index,
+        'parameters': parameters,
+        'growth_estimator': growth_estimator,
+        'overrides': {},
+        'standalone': {},
+        'consolidated': {},
+        'attributable': {}
+    }
+    for method in engine.METHOD_NAMES:
+        standalone = results[method].to_numpy(dtype=float)[portfolio_index]
+        group['standalone'][method] = standalone
+        group['consolidated'][method], group['attributable'][method] = roll_up(structure, standalone)
+    return group
+
+
+# 지배구조 파일과 재무 데이터 파일을 읽어 그룹 평가
+def load_group(structure_source, financial_source, parameters=None, growth_estimator=None):
+    return value_group(load_structure(structure_source), load_portfolio(financial_source), parameters, growth_estimator)
+
+
+# 기업의 현재 재무 데이터 (수정된 경우 수정본, 단일 기업 표준화 데이터)
+def entity_data(group, index):
+    if index in group['overrides']:
+        return group['overrides'][index]
+    return select_company(group['financials'], group['portfolio_index'][index])
+
+
+# 기업의 재무 데이터 표 (연도 오름차순)
+# 보정된 셀은 비워 두므로, 수정하지 않고 다시 표준화하면 같은 규칙으로 다시 보정되어 보정 여부가 유지됨
+def entity_frame(group, index):
+    data = entity_data(group, index)
+    columns = {column: np.where(data['imputed'][column], np.nan, data['values'][column]) for column in FINANCIAL_COLUMNS}
+    return pd.DataFrame(dict({'연도': data['years']}, **columns))
+
+
+# 한 기업의 재무 데이터 변경 반영 (group을 직접 갱신)
+# 그 기업만 다시 평가하고 최상위 기업까지의 경로만 다시 합산하며, 다시 합산한 기업 순번 목록(기업 자신부터)을 반환
+# data: normalize_financial_data()로 표준화된 해당 기업의 재무 데이터
+def update_entity(group, index, data):
+    structure = group['structure']
+    params = portfolio_parameters(data, group['parameters'], group['growth_estimator'])
+    inputs = engine.engine_inputs(data, params['market_comparison']['multiple_type'],
+                                  earnings_scheme=params['excess_earnings']['earnings_scheme'])
+    group['overrides'][index] = data
+
+    path = path_to_root(structure, index)
+    for method in engine.METHOD_NAMES:
+        standalone = group['standalone'][method]
+        consolidated = group['consolidated'][method]
+        attributable = group['attributable'][method]
+        standalone[index] = engine.goodwill(method, inputs, params[method])[0]
+        for node in path:
+            below = children(structure, node)
+            own = 0.0 if np.isnan(standalone[node]) else standalone[node]
+            consolidated[node] = own + consolidated[below].sum()
+            attributable[node] = own + (structure['ownership'][below] * attributable[below]).sum()
+    return path
+
+
+# 평가 방법별 그룹 영업권 표 (지배구조 순서)
+def group_table(group, method):
+    structure = group['structure']
+    parent = structure['parent']
+    consolidated = group['consolidated'][method]
+    attributable = group['attributable'][method]
+    return pd.DataFrame({
+        '회사명': structure['entity'],
+        '상위회사': np.where(parent >= 0, structure['entity'][np.maximum(parent, 0)], ''),
+        '계층': structure['depth'],
+        '지분율(%)': np.where(parent >= 0, structure['ownership'] * 100, np.nan),
+        '유효 지분율(%)': effective_ownership(structure) * 100,
+        '자체 영업권': group['standalone'][method],
+        '연결 영업권': consolidated,
+        '비지배지분': consolidated - attributable,
+        '지배기업 귀속 영업권': attributable
+    })
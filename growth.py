@@ -0,0 +1,131 @@
+# 영업권 평가 시스템 - 과거 실적 기반 성장률 추정
+#
+# 표준화된 재무 데이터에서 영업이익·매출액의 성장률을 세 가지 방법으로 추정합니다.
+# - CAGR: 처음과 마지막 관측 연도 사이의 연평균 복합 성장률
+# - 로그선형 회귀: ln(값) = a + b × 연도 회귀의 기울기로 성장률 exp(b) - 1 (결정계수, 표준오차 제공)
+# - 중앙값: 연속된 두 관측치의 전년 대비 성장률(연도 간격으로 연율화)의 중앙값 (사분위 범위 제공)
+# 모든 기업을 (기업 × 연도) 행렬로 펼쳐 한 번에 계산하므로 일괄 평가에서도 기업별 반복이 없습니다.
+# 보정(추정)된 값과 0 이하의 값은 로그 성장률을 계산할 수 없으므로 제외합니다.
+
+import numpy as np
+import pandas as pd
+
+from financial_schema import reported
+
+GROWTH_COLUMNS = ['영업이익', '매출액']
+
+ESTIMATORS = {
+    'cagr': 'CAGR',
+    'log_linear': '로그선형 회귀',
+    'median': '전년 대비 성장률 중앙값'
+}
+
+
+# 기업별 연도·값을 (기업 수 × 최대 연수) 행렬로 펼침 (관측치가 없는 칸은 NaN)
+def _padded(data, column):
+    offsets = data['offsets']
+    lengths = np.diff(offsets)
+    n_companies = len(lengths)
+    width = int(lengths.max()) if n_companies else 0
+
+    rows = np.repeat(np.arange(n_companies), lengths)
+    cols = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+
+    values = data['values'][column]
+    valid = reported(data, column) & (values > 0)
+    years = np.full((n_companies, width), np.nan)
+    matrix = np.full((n_companies, width), np.nan)
+    years[rows, cols] = data['years']
+    matrix[rows, cols] = np.where(valid, values, np.nan)
+    return years, matrix
+
+
+# 행별 분위수 (NaN 제외, 선형 보간) - 정렬 후 유효 개수로 위치를 계산하여 행 반복 없이 처리
+def row_quantile(matrix, q):
+    if matrix.shape[1] == 0:
+        return np.full(len(matrix), np.nan)
+    ordered = np.sort(matrix, axis=1)  # NaN은 뒤로 정렬됨
+    count = (~np.isnan(matrix)).sum(axis=1)
+    position = q * np.maximum(count - 1, 0)
+    lower = np.floor(position).astype(int)
+    upper = np.ceil(position).astype(int)
+    index = np.arange(len(matrix))
+    value = ordered[index, lower] + (ordered[index, upper] - ordered[index, lower]) * (position - lower)
+    return np.where(count > 0, value, np.nan)
+
+
+# 기업별 성장률 추정 (비율은 % 단위)
+def estimate_growth(data, column):
+    years, values = _padded(data, column)
+    mask = ~np.isnan(values)
+    n = mask.sum(axis=1).astype(float)
+    log_values = np.log(np.where(mask, values, 1.0))
+    width = values.shape[1]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # CAGR (첫 관측치 → 마지막 관측치)
+        first = np.argmax(mask, axis=1)
+        last = width - 1 - np.argmax(mask[:, ::-1], axis=1) if width else first
+        index = np.arange(len(n))
+        span = years[index, last] - years[index, first] if width else np.zeros(len(n))
+        cagr = np.expm1((log_values[index, last] - log_values[index, first]) / span) if width else np.full(len(n), np.nan)
+        cagr = np.where((n >= 2) & (span > 0), cagr, np.nan)
+
+        # 로그선형 회귀 (결측 마스크를 적용한 기업별 최소제곱)
+        x = np.where(mask, years, 0.0)
+        y = np.where(mask, log_values, 0.0)
+        dx = np.where(mask, x - x.sum(axis=1, keepdims=True) / n[:, None], 0.0)
+        dy = np.where(mask, y - y.sum(axis=1, keepdims=True) / n[:, None], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        syy = (dy * dy).sum(axis=1)
+        slope = sxy / sxx
+        residual_ss = np.maximum(syy - slope * sxy, 0.0)
+        log_linear = np.where(n >= 2, np.expm1(slope), np.nan)
+        r_squared = np.where((n >= 3) & (syy > 0), 1 - residual_ss / syy, np.nan)
+        std_error = np.where(n >= 3, np.exp(slope) * np.sqrt(residual_ss / (n - 2) / sxx), np.nan)
+
+        # 전년 대비 성장률 중앙값 (연속된 관측치 쌍, 연도 간격으로 연율화)
+        gap = years[:, 1:] - years[:, :-1]
+        changes = np.expm1((log_values[:, 1:] - log_values[:, :-1]) / gap)
+        changes = np.where(mask[:, 1:] & mask[:, :-1], changes, np.nan)
+        median = row_quantile(changes, 0.5)
+        spread = row_quantile(changes, 0.75) - row_quantile(changes, 0.25)
+
+    return {
+        'cagr': cagr * 100,
+        'log_linear': log_linear * 100,
+        'median': median * 100,
+        'observations': n.astype(int),
+        'span': np.where(n >= 2, span, np.nan),
+        'r_squared': r_squared,
+        'std_error': std_error * 100,
+        'spread': spread * 100
+    }
+
+
+# 기업 × 항목 × 추정 방법별 성장률과 적합 진단 표
+def growth_table(data, columns=GROWTH_COLUMNS):
+    frames = []
+    for column in columns:
+        estimates = estimate_growth(data, column)
+        n_companies = len(data['company'])
+        for estimator, label in ESTIMATORS.items():
+            frames.append(pd.DataFrame({
+                '회사명': data['company'],
+                '항목': column,
+                '추정 방법': label,
+                '성장률(%)': estimates[estimator],
+                '관측치 수': estimates['observations'],
+                '기간(년)': estimates['span'],
+                '결정계수': estimates['r_squared'] if estimator == 'log_linear' else np.full(n_companies, np.nan),
+                '표준오차(%p)': estimates['std_error'] if estimator == 'log_linear' else np.full(n_companies, np.nan),
+                '사분위 범위(%p)': estimates['spread'] if estimator == 'median' else np.full(n_companies, np.nan)
+            }))
+    return pd.concat(frames, ignore_index=True).sort_values('회사명', kind='stable').reset_index(drop=True)
+
+
+# DCF 영업이익 성장률 제안값 (입력 범위로 제한, 추정할 수 없는 기업은 default)
+def suggested_growth(data, estimator='log_linear', column='영업이익', bounds=(0.0, 30.0), default=5.0):
+    growth = estimate_growth(data, column)[estimator]
+    return np.where(np.isnan(growth), default, np.clip(growth, *bounds))
@@ -0,0 +1,271 @@
+# 영업권 평가 시스템 - 화면 상호작용별 스크립트 실행 횟수·응답 시간 측정
+#
+# loadtest.py의 AppTest는 항상 스크립트 전체를 다시 실행하므로 st.rerun()으로 인한 중복 실행이나
+# 프래그먼트 단위 재실행을 구분할 수 없습니다. 이 도구는 streamlit run으로 실제 서버를 띄우고
+# 브라우저와 같은 웹소켓 메시지(BackMsg 재실행 요청 → ForwardMsg 화면 변경·실행 완료)로 평가 흐름을 진행하면서,
+# 상호작용(페이지 이동, 폼 제출, 가중치 슬라이더 등)마다 서버의 스크립트 실행 횟수(전체/프래그먼트)와
+# 요청부터 마지막 실행 완료까지의 응답 시간을 기록합니다.
+# 페이지 이동은 st.navigation 페이지가 있으면 페이지 전환으로, 없으면 사이드바 버튼(nav_<페이지>)으로 수행하므로
+# 이전 커밋의 작업 트리(git worktree)에 대해 실행하여 구조 변경 전후를 비교할 수 있습니다.
+# streamlit과 함께 설치되는 websockets 패키지를 사용합니다.
+#
+# 사용법:
+#   python interaction_benchmark.py
+#   python interaction_benchmark.py --app /tmp/baseline/main.py --repeat 5 --csv before.csv
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
+from websockets.asyncio.client import connect
+
+from loadtest import SAMPLE_FINANCIAL_DATA
+from valuation_engine import METHOD_NAMES
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+# 실행 완료 상태 (다음 실행이 이어지는 조기 종료는 같은 상호작용의 실행으로 계속 집계)
+FINISHED_FULL = ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY
+FINISHED_FRAGMENT = ForwardMsg.ScriptFinishedStatus.FINISHED_FRAGMENT_RUN_SUCCESSFULLY
+FINISHED_EARLY_FOR_RERUN = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+
+# 위젯 종류별 상태 값 형식
+WIDGET_VALUE_TYPES = {
+    'slider': 'double_array_value',
+    'number_input': 'double_value',
+    'selectbox': 'string_value',
+    'radio': 'string_value',
+    'text_input': 'string_value',
+    'dataframe': 'string_value'
+}
+
+
+# 브라우저 탭 하나와 같은 방식으로 재실행을 요청하는 세션
+# 화면의 요소를 델타 경로별로 보관하고, 사용자가 바꾼 위젯 값은 이후 모든 재실행 요청에 함께 보냅니다.
+class BrowserSession:
+    def __init__(self, url):
+        self.url = url
+        self.websocket = None
+        self.elements = {}
+        self.widgets = {}
+        self.pages = {}
+        self.page_hash = ""
+
+    async def __aenter__(self):
+        self.websocket = await connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.websocket.close()
+
+    # 재실행 요청 후 이어지는 모든 실행이 끝날 때까지 화면 변경을 반영
+    # 반환: 전체 실행 수, 프래그먼트 실행 수, 응답 시간(초)
+    async def rerun(self, trigger=None, fragment_id="", page_hash=None):
+        states = WidgetStates()
+        for state in self.widgets.values():
+            states.widgets.add().CopyFrom(state)
+        if trigger is not None:
+            states.widgets.add().CopyFrom(trigger)
+
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = self.page_hash if page_hash is None else page_hash
+        message.rerun_script.widget_states.CopyFrom(states)
+        if fragment_id:
+            message.rerun_script.fragment_id = fragment_id
+
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+
+        full_runs = fragment_runs = 0
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.websocket.recv())
+            kind = forward.WhichOneof('type')
+            if kind == 'new_session':
+                # 프래그먼트 실행은 해당 영역의 요소만 바꾸므로 화면과 페이지 정보를 유지
+                session = forward.new_session
+                if not session.fragment_ids_this_run:
+                    self.elements = {}
+                    self.page_hash = session.page_script_hash
+                    self.pages = {page.url_pathname: page.page_script_hash for page in session.app_pages}
+            elif kind == 'navigation':
+                # st.navigation 앱은 실행 중인 페이지와 페이지 목록을 별도 메시지로 전달
+                self.page_hash = forward.navigation.page_script_hash
+                self.pages = {page.url_pathname: page.page_script_hash for page in forward.navigation.app_pages}
+            elif kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                if element.WhichOneof('type') == 'exception':
+                    raise RuntimeError(f"스크립트 실행 중 예외 발생: {element.exception.message}")
+                self.elements[tuple(forward.metadata.delta_path)] = (element.WhichOneof('type'), forward.delta.fragment_id, element)
+            elif kind == 'script_finished':
+                status = forward.script_finished
+                if status == FINISHED_FULL:
+                    full_runs += 1
+                elif status == FINISHED_FRAGMENT:
+                    fragment_runs += 1
+                elif status == FINISHED_EARLY_FOR_RERUN:
+                    full_runs += 1
+                    continue
+                else:
+                    raise RuntimeError("스크립트 컴파일 오류로 실행이 중단되었습니다.")
+                return full_runs, fragment_runs, time.perf_counter() - start
+
+    # 라벨 또는 위젯 키로 현재 화면의 위젯 찾기
+    def find(self, kind, label=None, key=None):
+        for element_kind, fragment_id, element in self.elements.values():
+            widget = getattr(element, kind) if element_kind == kind else None
+            if widget is None or not widget.id or (kind == 'dataframe' and not widget.editing_mode):
+                continue
+            if (label is None or widget.label == label) and (key is None or widget.id.endswith(f"-{key}")):
+                return widget, fragment_id
+        raise LookupError(f"화면에서 위젯을 찾을 수 없습니다: {label or key or kind}")
+
+    # 위젯 값 변경 (폼 안의 위젯은 값만 기록하고 폼 제출 시 함께 전송)
+    async def set(self, kind, label, value, key=None):
+        widget, fragment_id = self.find(kind, label, key)
+        state = self.widgets.setdefault(widget.id, WidgetState())
+        state.id = widget.id
+        value_type = WIDGET_VALUE_TYPES[kind]
+        if value_type == 'double_array_value':
+            state.double_array_value.data[:] = [value]
+        else:
+            setattr(state, value_type, value)
+        if getattr(widget, 'form_id', ""):
+            return None
+        return await self.rerun(fragment_id=fragment_id)
+
+    # 버튼(폼 제출 버튼 포함) 클릭
+    async def click(self, label=None, key=None):
+        widget, fragment_id = self.find('button', label, key)
+        trigger = WidgetState()
+        trigger.id = widget.id
+        trigger.trigger_value = True
+        return await self.rerun(trigger=trigger, fragment_id=fragment_id)
+
+    # 페이지 이동 (st.navigation 페이지 전환 또는 사이드바 버튼)
+    async def navigate(self, page):
+        if len(self.pages) > 1:
+            return await self.rerun(page_hash=self.pages[page])
+        return await self.click(key=f"nav_{page}")
+
+
+# 평가 흐름 시나리오 [(상호작용, 동작)]
+# 기업 정보 입력 → 평가 방법별 계산 → 종합 결과의 가중치·민감도·백테스트 조정 → 보고서
+def interaction_scenario():
+    edited_rows = {
+        str(row): {column: values[row] for column, values in SAMPLE_FINANCIAL_DATA.items() if column != '연도'}
+        for row in range(len(SAMPLE_FINANCIAL_DATA['연도']))
+    }
+
+    async def save_company(session):
+        await session.set('text_input', "회사명", "측정기업")
+        await session.set('dataframe', None, json.dumps({'edited_rows': edited_rows, 'added_rows': [], 'deleted_rows': []}))
+        return await session.click("저장")
+
+    steps = [
+        ("홈 첫 접속", lambda session: session.rerun()),
+        ("기업 정보 입력 이동", lambda session: session.navigate('company_info')),
+        ("기업 정보 저장", save_company)
+    ]
+    for page, name in METHOD_NAMES.items():
+        steps += [
+            (f"{name} 이동", lambda session, page=page: session.navigate(page)),
+            (f"{name} 평가 계산", lambda session: session.click("평가 계산"))
+        ]
+    steps += [
+        ("종합 결과 이동", lambda session: session.navigate('results')),
+        ("가중치 슬라이더 조정", lambda session: session.set('slider', f"{METHOD_NAMES['excess_earnings']} 가중치", 0.5)),
+        ("민감도 평가 방법 변경", lambda session: session.set('selectbox', "평가 방법", METHOD_NAMES['dcf'], key="sensitivity_method")),
+        ("민감도 변동 범위 변경", lambda session: session.set('radio', "변동 범위", "기준값 ± 입력 범위의 10%", key="sensitivity_range")),
+        ("백테스트 기간 변경", lambda session: session.set('number_input', "평균이익 산출 기간 (년)", 3.0, key="backtest_window")),
+        ("보고서 이동", lambda session: session.navigate('report'))
+    ]
+    return steps
+
+
+# 시나리오 한 번 실행 (새 브라우저 탭)
+async def run_scenario(url):
+    rows = []
+    async with BrowserSession(url) as session:
+        for interaction, action in interaction_scenario():
+            full_runs, fragment_runs, latency = await action(session)
+            rows.append({'interaction': interaction, 'full_runs': full_runs, 'fragment_runs': fragment_runs, 'latency': latency})
+    return rows
+
+
+# 사용 가능한 로컬 포트
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+# streamlit 서버 실행 후 상태 확인 주소가 응답할 때까지 대기
+def start_server(app, port, timeout=60.0):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app, "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=os.path.dirname(os.path.abspath(app)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("streamlit 서버가 시작되지 않았습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영업권 평가 시스템 상호작용별 스크립트 실행 횟수·응답 시간 측정")
+    parser.add_argument("--app", default=APP_PATH, help="측정할 앱 진입 스크립트 (이전 버전 비교 시 해당 작업 트리의 main.py)")
+    parser.add_argument("--repeat", type=int, default=3, help="시나리오 반복 횟수 (매번 새 세션)")
+    parser.add_argument("--csv", help="상호작용별 측정 결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(args.app, port)
+    try:
+        url = f"ws://localhost:{port}/_stcore/stream"
+        measurements = pd.DataFrame([
+            dict(row, repeat=repeat) for repeat in range(args.repeat) for row in asyncio.run(run_scenario(url))
+        ])
+    finally:
+        server.terminate()
+        server.wait()
+
+    # 첫 반복은 임포트·캐시 준비가 포함되므로 반복이 2회 이상이면 지연시간 통계에서 제외
+    timed = measurements[measurements['repeat'] > 0] if args.repeat > 1 else measurements
+    summary = measurements.groupby('interaction', sort=False)[['full_runs', 'fragment_runs']].max()
+    latency = timed.groupby('interaction', sort=False)['latency']
+    summary['p50_ms'] = latency.median() * 1000
+    summary['max_ms'] = latency.max() * 1000
+    summary = summary.reset_index()
+
+    print(summary.to_string(index=False, float_format=lambda x: f"{x:.0f}"))
+    print(f"\n전체 스크립트 실행: {summary['full_runs'].sum()}회 | 프래그먼트 실행: {summary['fragment_runs'].sum()}회 | "
+          f"응답 시간 합계(p50): {summary['p50_ms'].sum():,.0f}ms")
+
+    if args.csv:
+        summary.to_csv(args.csv, index=False)
+        print(f"\n결과가 {args.csv}에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
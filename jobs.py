@@ -0,0 +1,151 @@
+# 영업권 평가 시스템 - 무거운 계산의 백그라운드 실행
+#
+# 시뮬레이션, 보고서 일괄 생성, 대용량 포트폴리오 업로드처럼 오래 걸리는 작업을 Streamlit 스크립트 스레드 밖에서 실행하여
+# 작업 중에도 해당 사용자의 화면이 멈추지 않도록 합니다.
+# - 실행기는 서버 프로세스의 모든 세션이 공유: CPU 작업('cpu')은 프로세스 풀, 파일 처리 등 I/O 작업('io')은 스레드 풀
+# - 동시에 실행되는 작업 수는 워커 수(MAX_CPU_JOBS, MAX_IO_JOBS)로 제한되고 나머지는 대기열에서 순서대로 실행되며,
+#   대기 중인 작업이 MAX_PENDING_JOBS개를 넘으면 새 작업을 받지 않음 (동시 사용자 50명이 CPU를 과점유하지 않도록)
+# - 같은 함수·같은 인자의 작업이 진행 중이면 세션과 무관하게 새로 실행하지 않고 그 작업을 함께 사용
+# - 진행률: 작업 함수가 report(완료 수, 전체 수) 인자를 받으면 자동으로 전달되며, 진행률은 공유 상태에 기록
+# - 취소: 작업을 사용하는 모든 세션이 취소하면 대기 중인 작업은 바로 취소되고,
+#   실행 중인 작업은 다음 진행률 보고 시점에 중단 (JobCancelled)
+# 워커 수는 GOODWILL_CPU_JOBS, GOODWILL_IO_JOBS 환경 변수로 바꿀 수 있습니다.
+
+import hashlib
+import inspect
+import itertools
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+MAX_CPU_JOBS = int(os.environ.get('GOODWILL_CPU_JOBS', 0)) or os.cpu_count() or 1
+MAX_IO_JOBS = int(os.environ.get('GOODWILL_IO_JOBS', 0)) or 8
+MAX_PENDING_JOBS = MAX_CPU_JOBS * 8
+
+KINDS = ('cpu', 'io')
+
+_lock = threading.RLock()
+_executors = {}
+_managers = {}
+_statuses = {}
+_jobs = {}
+_ids = itertools.count(1)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# 진행 중인 백그라운드 작업 (같은 작업을 제출한 세션들이 함께 사용)
+class Job:
+    def __init__(self, job_id, kind, key):
+        self.id = job_id
+        self.kind = kind
+        self.key = key
+        self.subscribers = 1
+        self.cancelled = False
+        self.future = None
+
+    def done(self):
+        return self.future.done()
+
+    def running(self):
+        return self.future.running()
+
+    # (완료 수, 전체 수), 아직 보고된 진행률이 없으면 None
+    def progress(self):
+        if self.done():
+            return None
+        return _statuses[self.kind].get(('progress', self.id))
+
+    def result(self):
+        try:
+            return self.future.result()
+        except CancelledError:
+            raise JobCancelled() from None
+
+
+# 작업 실행 (워커에서 호출): report 인자를 받는 함수에는 진행률 보고·취소 확인 콜백을 전달
+def _execute(function, args, kwargs, job_id, status):
+    if status.get(('cancelled', job_id)):
+        raise JobCancelled()
+
+    if 'report' in inspect.signature(function).parameters:
+        def report(completed, total):
+            if status.get(('cancelled', job_id)):
+                raise JobCancelled()
+            status[('progress', job_id)] = (completed, total)
+
+        kwargs = dict(kwargs, report=report)
+    return function(*args, **kwargs)
+
+
+# 작업 종류별 공유 실행기와 진행 상태 (처음 사용할 때 생성)
+def _executor(kind):
+    if kind not in _executors:
+        if kind == 'cpu':
+            _managers[kind] = multiprocessing.Manager()
+            _statuses[kind] = _managers[kind].dict()
+            _executors[kind] = ProcessPoolExecutor(max_workers=MAX_CPU_JOBS)
+        else:
+            _statuses[kind] = {}
+            _executors[kind] = ThreadPoolExecutor(max_workers=MAX_IO_JOBS, thread_name_prefix='goodwill-job')
+    return _executors[kind]
+
+
+# 같은 작업 판별 키 (함수 이름 + 인자의 해시)
+def job_key(function, args, kwargs):
+    payload = pickle.dumps((args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+    return f"{function.__module__}.{function.__qualname__}:{hashlib.sha256(payload).hexdigest()}"
+
+
+def _finish(job):
+    with _lock:
+        if _jobs.get(job.key) is job:
+            del _jobs[job.key]
+        status = _statuses[job.kind]
+        status.pop(('progress', job.id), None)
+        status.pop(('cancelled', job.id), None)
+
+
+# 작업 제출 (같은 작업이 진행 중이면 그 작업을 반환)
+def submit(kind, function, *args, **kwargs):
+    if kind not in KINDS:
+        raise ValueError(f"알 수 없는 작업 종류입니다: {kind} (가능: {', '.join(KINDS)})")
+
+    key = job_key(function, args, kwargs)
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and not job.cancelled and not job.done():
+            job.subscribers += 1
+            return job
+
+        executor = _executor(kind)
+        if sum(not pending.done() for pending in _jobs.values()) >= MAX_PENDING_JOBS:
+            raise RuntimeError("처리 중인 작업이 많습니다. 잠시 후 다시 시도해주세요.")
+
+        job = Job(next(_ids), kind, key)
+        job.future = executor.submit(_execute, function, args, kwargs, job.id, _statuses[kind])
+        _jobs[key] = job
+
+    job.future.add_done_callback(lambda future: _finish(job))
+    return job
+
+
+# 작업 취소 (이 작업을 함께 사용하는 다른 세션이 없을 때만 실제로 중단)
+def cancel(job):
+    with _lock:
+        job.subscribers -= 1
+        if job.subscribers > 0 or job.done():
+            return
+        job.cancelled = True
+        if not job.future.cancel():
+            _statuses[job.kind][('cancelled', job.id)] = True
+
+
+# 대기·실행 중인 작업 수 {작업 종류: 개수}
+def active_jobs():
+    with _lock:
+        return {kind: sum(job.kind == kind and not job.done() for job in _jobs.values()) for kind in KINDS}
@@ -0,0 +1,118 @@
+# 영업권 평가 시스템 - 할인·합산 커널
+#
+# 대규모 시뮬레이션과 포트폴리오 계산에서 영업권 값만 필요할 때 사용하는 계산 커널입니다.
+# 평가 엔진의 상세 계산은 (입력 크기 × 기간) 배열을 만들지만, 여기서는 기간 축을 반복하며 바로 합산하므로
+# 입력 크기만큼의 배열만 사용합니다.
+# - numba 설치 시: 기간 반복을 원소별 한 번의 루프로 합친 JIT 커널 (임시 배열 없음)
+# - 미설치 시: 같은 연산 순서의 NumPy 구현 (기간 수만큼 반복)
+# 두 구현은 할인계수를 거듭제곱 대신 기간마다 곱해 나가는 동일한 순서로 계산하므로 결과가 비트 단위로 같습니다.
+# 실행 시 GOODWILL_KERNELS 환경 변수(numba/numpy) 또는 set_backend()로 구현을 선택할 수 있습니다.
+
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba 미설치 시 NumPy 구현만 사용
+    numba = None
+
+BACKENDS = ['numba', 'numpy'] if numba is not None else ['numpy']
+
+_backend = os.environ.get('GOODWILL_KERNELS', BACKENDS[0])
+if _backend not in BACKENDS:
+    _backend = 'numpy'
+
+
+# 사용할 구현 선택 ('numba' 또는 'numpy')
+def set_backend(name):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"사용할 수 없는 계산 커널입니다: {name} (가능: {', '.join(BACKENDS)})")
+    _backend = name
+
+
+def get_backend():
+    return _backend
+
+
+# 연금현가계수: Σ(n=1..years) 1 / (1 + rate)^n (rate는 % 단위)
+def _annuity_factor_numpy(rate, years):
+    rate, years = np.broadcast_arrays(np.asarray(rate, dtype=float), np.asarray(years, dtype=float))
+    growth = 1 + rate / 100
+    compound = np.ones(rate.shape)
+    total = np.zeros(rate.shape)
+    for n in range(1, int(years.max(initial=0)) + 1):
+        compound = compound * growth
+        total = np.where(n <= years, total + 1 / compound, total)
+    return total
+
+
+# DCF 총 현재가치: 예측 기간 세후 현금흐름의 현재가치 합계 + 잔존가치의 현재가치
+# 비율 매개변수는 % 단위, rate는 할인율 + 위험 프리미엄
+def _dcf_present_value_numpy(base, growth_rate, years, rate, terminal_growth, tax_rate):
+    base, growth_rate, years, rate, terminal_growth, tax_rate = np.broadcast_arrays(
+        *[np.asarray(x, dtype=float) for x in (base, growth_rate, years, rate, terminal_growth, tax_rate)])
+    growth = 1 + growth_rate / 100
+    discount = 1 + rate / 100
+    terminal = terminal_growth / 100
+    after_tax = 1 - tax_rate / 100
+
+    grown = np.ones(base.shape)
+    compound = np.ones(base.shape)
+    total = np.zeros(base.shape)
+    last_grown = np.ones(base.shape)
+    last_compound = np.ones(base.shape)
+    for n in range(1, int(years.max(initial=0)) + 1):
+        grown = grown * growth
+        compound = compound * discount
+        active = n <= years
+        total = np.where(active, total + base * grown * after_tax / compound, total)
+        last_grown = np.where(active, grown, last_grown)
+        last_compound = np.where(active, compound, last_compound)
+
+    terminal_value = base * last_grown * after_tax * (1 + terminal) / (rate / 100 - terminal)
+    return total + terminal_value / last_compound
+
+
+if numba is not None:
+    @numba.vectorize(['float64(float64, float64)'], cache=True)
+    def _annuity_factor_numba(rate, years):
+        growth = 1 + rate / 100
+        compound = 1.0
+        total = 0.0
+        for _ in range(int(years)):
+            compound = compound * growth
+            total = total + 1 / compound
+        return total
+
+    @numba.vectorize(['float64(float64, float64, float64, float64, float64, float64)'], cache=True)
+    def _dcf_present_value_numba(base, growth_rate, years, rate, terminal_growth, tax_rate):
+        growth = 1 + growth_rate / 100
+        discount = 1 + rate / 100
+        terminal = terminal_growth / 100
+        after_tax = 1 - tax_rate / 100
+
+        grown = 1.0
+        compound = 1.0
+        total = 0.0
+        for _ in range(int(years)):
+            grown = grown * growth
+            compound = compound * discount
+            total = total + base * grown * after_tax / compound
+
+        terminal_value = base * grown * after_tax * (1 + terminal) / (rate / 100 - terminal)
+        return total + terminal_value / compound
+
+
+def annuity_factor(rate, years):
+    if _backend == 'numba':
+        return _annuity_factor_numba(np.asarray(rate, dtype=float), np.asarray(years, dtype=float))
+    return _annuity_factor_numpy(rate, years)
+
+
+def dcf_present_value(base, growth_rate, years, rate, terminal_growth, tax_rate):
+    if _backend == 'numba':
+        return _dcf_present_value_numba(*[np.asarray(x, dtype=float) for x in (
+            base, growth_rate, years, rate, terminal_growth, tax_rate)])
+    return _dcf_present_value_numpy(base, growth_rate, years, rate, terminal_growth, tax_rate)
@@ -0,0 +1,219 @@
+# 영업권 평가 시스템 - 동시 사용자 부하 테스트
+#
+# PRD 5.3의 성능 요구사항(페이지 로딩 3초 이내, 동시 사용자 최대 50명)을 로컬에서 검증합니다.
+# Streamlit AppTest로 가상 세션을 만들어 main.py의 전체 흐름
+# (기업 정보 입력 → 초과이익법/DCF/시장가치비교법 계산 → 종합 결과 → 보고서)을 실행하고,
+# 동시 사용자 수별로 페이지 지연시간(p50/p95/p99), CPU 사용률, 세션당 메모리를 보고합니다.
+# AppTest는 스레드 안전하지 않으므로 가상 세션마다 별도 워커 프로세스를 사용하고,
+# 모든 워커가 준비된 뒤 동시에 시나리오를 시작합니다.
+# 네트워크 연결 없이 실행되므로 배포 전 dyno 규모 산정에 사용할 수 있습니다.
+#
+# 사용법:
+#   python loadtest.py
+#   python loadtest.py --users 1 10 25 50 --iterations 2 --csv loadtest_result.csv
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit.logger
+from streamlit.testing.v1 import AppTest
+
+from views import PAGES
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+# PRD 5.3 페이지 로딩 시간 기준 (초)
+PAGE_LOAD_LIMIT = 3.0
+
+# 부하 테스트용 샘플 재무 데이터 (최신 연도가 첫 행)
+SAMPLE_FINANCIAL_DATA = {
+    '연도': [datetime.now().year - i for i in range(1, 6)],
+    '매출액': [5_200_000_000, 4_800_000_000, 4_500_000_000, 4_100_000_000, 3_900_000_000],
+    '영업이익': [620_000_000, 560_000_000, 510_000_000, 470_000_000, 430_000_000],
+    '당기순이익': [480_000_000, 430_000_000, 400_000_000, 360_000_000, 330_000_000],
+    '총자산': [3_000_000_000, 2_800_000_000, 2_600_000_000, 2_400_000_000, 2_200_000_000],
+    '총부채': [1_200_000_000, 1_150_000_000, 1_100_000_000, 1_050_000_000, 1_000_000_000],
+    '자본': [1_800_000_000, 1_650_000_000, 1_500_000_000, 1_350_000_000, 1_200_000_000]
+}
+
+
+# 현재 프로세스의 상주 메모리(RSS, 바이트) 조회
+def current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # /proc이 없는 환경(macOS 등)에서는 최대 RSS로 대체
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+
+# 현재 프로세스의 최대 상주 메모리(바이트) 조회
+def peak_rss():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+# 워커 프로세스가 공유하는 시작 배리어
+_start_barrier = None
+
+
+# 워커 프로세스 초기화: 무거운 임포트를 미리 끝내고 시작 배리어 등록
+def init_worker(barrier):
+    import plotly.express  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+
+    streamlit.logger.set_log_level("error")
+    global _start_barrier
+    _start_barrier = barrier
+
+
+# 라벨로 버튼 찾기 (폼 제출 버튼 포함)
+def find_button(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"버튼을 찾을 수 없습니다: {label}")
+
+
+# 한 번의 스크립트 실행 시간을 측정하여 기록
+def timed_run(at, page, timings, timeout):
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    timings.append((page, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{page} 페이지 실행 중 예외 발생: {at.exception[0].message}")
+
+
+# 가상 사용자 한 명의 평가 시나리오 실행
+def run_session(session_id, iterations, timeout):
+    if _start_barrier is not None:
+        _start_barrier.wait()
+
+    timings = []
+    baseline_rss = current_rss()
+    cpu_start = time.process_time()
+    started_at = time.time()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    # 홈 페이지 (최초 접속)
+    timed_run(at, 'home', timings, timeout)
+
+    for _ in range(iterations):
+        # 기업 정보 입력 및 저장
+        at.switch_page(PAGES['company_info'][0])
+        timed_run(at, 'company_info', timings, timeout)
+        at.text_input[0].input(f"부하테스트{session_id}")
+        find_button(at, "저장").click()
+        timed_run(at, 'company_info_save', timings, timeout)
+
+        # CSV 업로드와 동일하게 재무 데이터 반영
+        at.session_state.company_data['financial_data'] = pd.DataFrame(SAMPLE_FINANCIAL_DATA)
+
+        # 세 가지 평가 방법 페이지 이동 및 계산
+        for page in ['excess_earnings', 'dcf', 'market_comparison', 'statutory']:
+            at.switch_page(PAGES[page][0])
+            timed_run(at, page, timings, timeout)
+            find_button(at, "평가 계산").click()
+            timed_run(at, f"{page}_calculate", timings, timeout)
+
+        # 종합 결과 및 보고서
+        for page in ['results', 'report']:
+            at.switch_page(PAGES[page][0])
+            timed_run(at, page, timings, timeout)
+
+    return {
+        'timings': timings,
+        'cpu_time': time.process_time() - cpu_start,
+        'started_at': started_at,
+        'finished_at': time.time(),
+        'memory': max(peak_rss() - baseline_rss, 0)
+    }
+
+
+# 특정 동시 사용자 수에 대한 부하 테스트 실행
+def run_level(users, iterations, timeout):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(users)
+
+    with ProcessPoolExecutor(max_workers=users, mp_context=context,
+                             initializer=init_worker, initargs=(barrier,)) as executor:
+        futures = [executor.submit(run_session, i, iterations, timeout) for i in range(users)]
+        results = [future.result() for future in futures]
+
+    wall_time = max(r['finished_at'] for r in results) - min(r['started_at'] for r in results)
+    cpu_time = sum(r['cpu_time'] for r in results)
+    memory = np.array([r['memory'] for r in results], dtype=float)
+
+    rows = []
+    timings = pd.DataFrame([t for r in results for t in r['timings']], columns=['page', 'latency'])
+    for page, group in timings.groupby('page', sort=False):
+        latency = group['latency'].to_numpy()
+        rows.append({
+            'users': users,
+            'page': page,
+            'runs': len(latency),
+            'p50': np.percentile(latency, 50),
+            'p95': np.percentile(latency, 95),
+            'p99': np.percentile(latency, 99),
+            'max': latency.max()
+        })
+
+    summary = {
+        'users': users,
+        'wall_time': wall_time,
+        'cpu_percent': cpu_time / wall_time * 100 if wall_time > 0 else 0.0,
+        'mb_per_session': memory.mean() / 1024 ** 2,
+        'mb_per_session_max': memory.max() / 1024 ** 2
+    }
+    return pd.DataFrame(rows), summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영업권 평가 시스템 동시 사용자 부하 테스트")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 5, 10, 25, 50],
+                        help="측정할 동시 사용자 수 목록")
+    parser.add_argument("--iterations", type=int, default=1,
+                        help="세션당 전체 평가 시나리오 반복 횟수")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="스크립트 실행 1회당 제한 시간(초)")
+    parser.add_argument("--csv", help="페이지별 지연시간 결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    streamlit.logger.set_log_level("error")
+
+    latency_frames = []
+    summaries = []
+    for users in args.users:
+        latency_df, summary = run_level(users, args.iterations, args.timeout)
+        latency_frames.append(latency_df)
+        summaries.append(summary)
+
+        print(f"\n=== 동시 사용자 {users}명 ===")
+        print(latency_df.drop(columns='users').to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+        print(f"CPU 사용률: {summary['cpu_percent']:.0f}% | "
+              f"세션당 메모리: 평균 {summary['mb_per_session']:.1f}MB / 최대 {summary['mb_per_session_max']:.1f}MB | "
+              f"소요 시간: {summary['wall_time']:.1f}초")
+
+        slow_pages = latency_df[latency_df['p95'] > PAGE_LOAD_LIMIT]['page'].tolist()
+        if slow_pages:
+            print(f"경고: p95가 {PAGE_LOAD_LIMIT:.0f}초를 초과한 페이지 - {', '.join(slow_pages)}")
+
+    print("\n=== 요약 ===")
+    print(pd.DataFrame(summaries).to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    if args.csv:
+        pd.concat(latency_frames).to_csv(args.csv, index=False)
+        print(f"\n결과가 {args.csv}에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+# 영업권 평가 시스템 - 평가 방법별 결과 생성
+#
+# 각 평가 페이지의 '평가 계산'과 재무 데이터 수정 후 자동 재계산이 같은 함수로
+# st.session_state.valuation_results에 저장되는 결과(method, value, parameters, trace)를 만듭니다.
+# data는 표준화된 단일 기업 재무 데이터, params는 페이지에서 입력한 매개변수입니다.
+#
+# trace는 엔진이 계산한 값을 그대로 담은 계산 내역이며, 평가 페이지의 결과 영역·종합 결과·보고서·CSV 내보내기는
+# 모두 이 내역만 읽어 표시하고 다시 계산하지 않습니다.
+#   scalars: 주요 값 {이름: float} (기초 데이터와 중간 계산값, 계산 순서대로)
+#   tables: 연도·연차별 배열 {표 이름: {컬럼: NumPy 배열}} (할인 일정, 순손익 이력 등)
+#   imputations: 이 평가가 읽은 값 중 보정·가정이 적용된 항목 [{'연도', '항목', '규칙'}]
+
+import numpy as np
+import pandas as pd
+
+import valuation_engine as engine
+from earnings import SCHEMES as EARNINGS_SCHEMES
+
+# 계산 내역 항목 이름 (표시·내보내기용)
+TRACE_LABELS = {
+    'avg_earnings': '평균 당기순이익',
+    'total_assets': '총자산',
+    'normal_profit': '정상이익',
+    'excess_profit': '초과이익',
+    'present_value_sum': '현재가치 합계',
+    'adjustment': '조정 배수',
+    'base_operating_profit': '기준 영업이익',
+    'rate': '적용 할인율(%)',
+    'terminal_value': '잔존가치',
+    'terminal_value_pv': '잔존가치의 현재가치',
+    'total_present_value': '총 현재가치',
+    'net_asset_value': '순자산가치',
+    'base_value': '기준 값',
+    'multiple': '적용 배수',
+    'multiplied_value': '기준 값 × 적용 배수',
+    'adjusted_value': '조정 계수 적용 후 기업가치',
+    'premium_value': '프리미엄/할인율 적용 후 기업가치',
+    'enterprise_value': '기업가치',
+    'weighted_earnings': '가중평균 순손익액',
+    'equity': '자기자본',
+    'earnings_share': '순손익액 반영분',
+    'equity_return': '자기자본이익',
+    'annuity_factor': '연금현가계수',
+    'period': '연차',
+    'year': '연도',
+    'discount_factor': '할인계수',
+    'present_value': '현재가치',
+    'cash_flow': '미래 현금흐름',
+    'earnings': '당기순이익',
+    'weight': '가중치'
+}
+
+TABLE_LABELS = {
+    'schedule': '연차별 할인',
+    'history': '연도별 당기순이익'
+}
+
+
+# 이 평가가 읽은 재무 항목 중 보정된 값 (method_dependencies의 사용 범위 기준)
+def applied_imputations(method, data, params):
+    rules = {imputation['항목']: imputation['규칙'] for imputation in data['imputations']}
+    applied = []
+    for column, scope in engine.method_dependencies(method, params).items():
+        used = engine.dependency_years(data['years'], scope)
+        applied.extend(
+            {'연도': int(year), '항목': column, '규칙': rules.get(column, '보정')}
+            for year in data['years'][data['imputed'][column]] if int(year) in used
+        )
+    return applied
+
+
+# 순자산가치를 가정으로 대신한 경우 총자산·총부채 보정 내역 제외 (영업권 계산에 사용되지 않음)
+def _without_net_assets(imputations):
+    return [imputation for imputation in imputations if imputation['항목'] not in ('총자산', '총부채')]
+
+
+def _trace(scalars, tables=None, imputations=None):
+    return {
+        'scalars': {name: float(value) for name, value in scalars.items()},
+        'tables': tables or {},
+        'imputations': imputations or []
+    }
+
+
+# 초과이익법 결과 (초과이익이 0 이하인지는 호출하는 쪽에서 trace['scalars']['excess_profit']으로 확인)
+# 평균 이익은 params['earnings_scheme'] 방식으로 산출 (없으면 단순 평균)
+def excess_earnings_result(data, params):
+    inputs = engine.engine_inputs(data, earnings_scheme=params.get('earnings_scheme', 'mean'))
+    avg_earnings = float(inputs['avg_earnings'][0])
+    total_assets = float(inputs['total_assets'][0])
+
+    calc = engine.excess_earnings_value(
+        avg_earnings, total_assets, params['normal_roi'], params['excess_years'], params['discount_rate'],
+        params['adjustment_factor'], params['industry_premium']
+    )
+
+    return {
+        'method': engine.METHOD_NAMES['excess_earnings'],
+        'value': float(calc['value']),
+        'parameters': dict(params),
+        'trace': _trace(
+            {
+                'avg_earnings': avg_earnings,
+                'total_assets': total_assets,
+                'normal_profit': calc['normal_profit'],
+                'excess_profit': calc['excess_profit'],
+                'present_value_sum': calc['present_value_sum'],
+                'adjustment': calc['adjustment']
+            },
+            {
+                'history': {'year': data['years'], 'earnings': data['values']['당기순이익']},
+                'schedule': {
+                    'period': np.arange(1, len(calc['present_values']) + 1),
+                    'discount_factor': calc['discount_factors'],
+                    'present_value': calc['present_values']
+                }
+            },
+            applied_imputations('excess_earnings', data, params)
+        )
+    }
+
+
+# 현금흐름할인법 결과
+# 영업이익이 없으면 당기순이익의 125%, 부채가 없으면 자산의 40%로 보정되어 있으며,
+# 자산 데이터가 없으면 순자산이 NaN이 되어 전체 현재가치의 60%를 영업권으로 가정
+def dcf_result(data, params):
+    inputs = engine.engine_inputs(data)
+    base_operating_profit = float(inputs['base_operating_profit'][0])
+    net_asset_value = float(inputs['dcf_net_asset_value'][0])
+
+    calc = engine.dcf_value(
+        base_operating_profit, net_asset_value, params['growth_rate'], params['forecast_years'],
+        params['discount_rate'], params['terminal_growth'], params['risk_premium'], params['tax_rate']
+    )
+
+    imputations = applied_imputations('dcf', data, params)
+    if np.isnan(net_asset_value):
+        imputations = _without_net_assets(imputations)
+        imputations.append({'연도': int(data['years'][-1]), '항목': '순자산가치', '규칙': '자산 데이터 없음 → 총 현재가치의 60%를 영업권으로 가정'})
+
+    return {
+        'method': engine.METHOD_NAMES['dcf'],
+        'value': float(calc['value']),
+        'parameters': dict(params),
+        'trace': _trace(
+            {
+                'base_operating_profit': base_operating_profit,
+                'rate': calc['rate'],
+                'present_value_sum': calc['present_value_sum'],
+                'terminal_value': calc['terminal_value'],
+                'terminal_value_pv': calc['terminal_value_pv'],
+                'total_present_value': calc['total_present_value'],
+                'net_asset_value': net_asset_value
+            },
+            {
+                'schedule': {
+                    'period': np.arange(1, len(calc['cash_flows']) + 1),
+                    'cash_flow': calc['cash_flows'],
+                    'discount_factor': calc['discount_factors'],
+                    'present_value': calc['present_values']
+                }
+            },
+            imputations
+        )
+    }
+
+
+# 시장가치비교법 결과
+# 총자산·총부채가 모두 입력되지 않은 경우 순자산가치를 기업가치의 40%로 가정
+def market_comparison_result(data, params):
+    inputs = engine.engine_inputs(data, params['multiple_type'])
+    base_value = float(inputs['market_base_value'][0])
+    reported_net_asset_value = inputs['market_net_asset_value'][0]
+
+    calc = engine.market_comparison_value(
+        base_value, params['custom_multiple'], reported_net_asset_value, params['adjustment_factor'],
+        params['premium_discount'], params['liquidity_discount']
+    )
+
+    imputations = applied_imputations('market_comparison', data, params)
+    if np.isnan(reported_net_asset_value):
+        imputations = _without_net_assets(imputations)
+        imputations.append({'연도': int(data['years'][-1]), '항목': '순자산가치', '규칙': '총자산·총부채 미입력 → 기업가치의 40%로 가정'})
+
+    return {
+        'method': engine.METHOD_NAMES['market_comparison'],
+        'value': float(calc['value']),
+        'parameters': dict(params),
+        'trace': _trace(
+            {
+                'base_value': base_value,
+                'multiple': params['custom_multiple'],
+                'multiplied_value': calc['multiplied_value'],
+                'adjusted_value': calc['adjusted_value'],
+                'premium_value': calc['premium_value'],
+                'enterprise_value': calc['enterprise_value'],
+                'net_asset_value': calc['net_asset_value']
+            },
+            imputations=imputations
+        )
+    }
+
+
+# 상증법 보충적 평가 결과 (당기순이익 또는 자본이 없으면 value가 NaN)
+def statutory_result(data, params):
+    inputs = engine.engine_inputs(data)
+    weighted_earnings = float(inputs['weighted_earnings'][0])
+    equity = float(inputs['equity'][0])
+
+    calc = engine.statutory_value(
+        weighted_earnings, equity, params['profit_ratio'], params['equity_return_rate'],
+        params['capitalization_years'], params['discount_rate']
+    )
+
+    # 가중평균에 사용된 연도별 당기순이익 (최근 연도부터)
+    recent = len(engine.STATUTORY_WEIGHTS)
+    years = data['years'][::-1][:recent]
+    value = float(calc['value']) if not (np.isnan(weighted_earnings) or np.isnan(equity)) else np.nan
+
+    return {
+        'method': engine.METHOD_NAMES['statutory'],
+        'value': value,
+        'parameters': dict(params),
+        'trace': _trace(
+            {
+                'weighted_earnings': weighted_earnings,
+                'equity': equity,
+                'earnings_share': calc['earnings_share'],
+                'equity_return': calc['equity_return'],
+                'excess_profit': calc['excess_profit'],
+                'annuity_factor': calc['annuity_factor'],
+                'present_value_sum': calc['present_value_sum']
+            },
+            {
+                'history': {
+                    'year': years,
+                    'earnings': data['values']['당기순이익'][::-1][:recent],
+                    'weight': np.array(engine.STATUTORY_WEIGHTS[:len(years)])
+                },
+                'schedule': {
+                    'period': np.arange(1, len(calc['present_values']) + 1),
+                    'discount_factor': calc['discount_factors'],
+                    'present_value': calc['present_values']
+                }
+            },
+            applied_imputations('statutory', data, params)
+        )
+    }
+
+
+RESULT_BUILDERS = {
+    'excess_earnings': excess_earnings_result,
+    'dcf': dcf_result,
+    'market_comparison': market_comparison_result,
+    'statutory': statutory_result
+}
+
+
+def build_result(method, data, params):
+    return RESULT_BUILDERS[method](data, params)
+
+
+# 계산 내역의 주요 값 표
+def trace_scalars_frame(result):
+    scalars = result['trace']['scalars']
+    return pd.DataFrame({
+        '항목': [TRACE_LABELS[name] for name in scalars] + ['영업권 가치'],
+        '값': list(scalars.values()) + [result['value']]
+    })
+
+
+# 계산 내역의 연도·연차별 표 {표 제목: DataFrame}
+def trace_table_frames(result):
+    return {
+        TABLE_LABELS[name]: pd.DataFrame({TRACE_LABELS[column]: values for column, values in table.items()})
+        for name, table in result['trace']['tables'].items()
+    }
+
+
+# 매개변수 표시 값 (평균 이익 산출 방식은 방식 이름, 비교 기업은 쉼표로 연결)
+def _parameter_value(name, value):
+    if name == 'earnings_scheme':
+        return EARNINGS_SCHEMES.get(value, value)
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return value
+
+
+# 평가 결과 전체의 계산 내역 (내보내기용 긴 형식: 평가 방법, 구분, 항목, 기간(연도 또는 연차), 값)
+def trace_export(results):
+    rows = []
+    for result in results.values():
+        method = result['method']
+        trace = result['trace']
+        for name, value in result['parameters'].items():
+            rows.append((method, '매개변수', engine.PARAMETER_LABELS.get(name, name), None, _parameter_value(name, value)))
+        for name, value in trace['scalars'].items():
+            rows.append((method, '주요 값', TRACE_LABELS[name], None, value))
+        rows.append((method, '주요 값', '영업권 가치', None, result['value']))
+        for name, table in trace['tables'].items():
+            key = 'year' if 'year' in table else 'period'
+            for column, values in table.items():
+                if column != key:
+                    rows.extend((method, TABLE_LABELS[name], TRACE_LABELS[column], int(period), float(value))
+                                for period, value in zip(table[key], values))
+        for imputation in trace['imputations']:
+            rows.append((method, '데이터 보정', imputation['항목'], imputation['연도'], imputation['규칙']))
+
+    export = pd.DataFrame(rows, columns=['평가 방법', '구분', '항목', '기간', '값'])
+    export['기간'] = export['기간'].astype('Int64')
+    return export
@@ -0,0 +1,92 @@
+# 영업권 평가 시스템 - 포트폴리오(다수 기업) 일괄 평가
+#
+# 포트폴리오 CSV는 기업-연도별 1행 형식입니다.
+#   회사명, 산업군, 연도, 매출액, 영업이익, 당기순이익, 총자산, 총부채, 자본
+# 모든 기업의 엔진 입력값을 배열로 모은 뒤 평가 방법별로 엔진을 한 번씩만 호출합니다.
+
+import numpy as np
+import pandas as pd
+
+import valuation_engine as engine
+from financial_schema import normalize_financial_data, resolve_columns
+from growth import suggested_growth
+from sensitivity import one_at_a_time
+from sketches import StreamingSummary
+
+
+# 포트폴리오 데이터 검증 및 표준화
+def load_portfolio(source):
+    df = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+
+    if '회사명' not in resolve_columns(df.columns).values():
+        raise ValueError("포트폴리오 데이터에 필수 컬럼이 없습니다: 회사명")
+
+    return normalize_financial_data(df, industry='기타')
+
+
+# 평가 방법별 매개변수 (기본값 위에 사용자 지정값 반영)
+def method_parameters(parameters=None):
+    params = {method: dict(defaults) for method, defaults in engine.DEFAULT_PARAMETERS.items()}
+    for method, overrides in (parameters or {}).items():
+        if method in params:
+            params[method].update(overrides)
+    return params
+
+
+# 포트폴리오 평가 매개변수
+# growth_estimator를 지정하면 DCF 성장률을 기업별 과거 영업이익 추정 성장률로 대체 (growth.ESTIMATORS)
+def portfolio_parameters(portfolio, parameters=None, growth_estimator=None):
+    params = method_parameters(parameters)
+    if growth_estimator is not None:
+        params['dcf']['growth_rate'] = suggested_growth(portfolio, growth_estimator)
+    return params
+
+
+# 포트폴리오 일괄 평가 (기업별 평가 방법별 영업권)
+# portfolio: load_portfolio()로 표준화된 데이터
+def value_portfolio(portfolio, parameters=None, growth_estimator=None):
+    params = portfolio_parameters(portfolio, parameters, growth_estimator)
+    inputs = engine.engine_inputs(portfolio, params['market_comparison']['multiple_type'],
+                                 earnings_scheme=params['excess_earnings']['earnings_scheme'])
+
+    results = pd.DataFrame({'회사명': inputs['company']})
+    for method in engine.METHOD_NAMES:
+        results[method] = engine.goodwill(method, inputs, params[method])
+    return results
+
+
+# 포트폴리오 영업권 분포 요약 (평가 방법별 스트리밍 요약)
+# 기업을 chunk_size개씩 나누어 평가하고 결과는 보관하지 않으므로 기업 수와 무관한 메모리로 동작
+# summaries: 이어서 누적할 기존 요약 (다른 워커의 결과와 merge 가능)
+# report(완료 기업 수, 전체 기업 수): 청크마다 호출되는 진행 상황 콜백
+def summarize_portfolio(portfolio, parameters=None, chunk_size=10000, summaries=None, growth_estimator=None,
+                        report=None):
+    params = portfolio_parameters(portfolio, parameters, growth_estimator)
+    inputs = engine.engine_inputs(portfolio, params['market_comparison']['multiple_type'],
+                                 earnings_scheme=params['excess_earnings']['earnings_scheme'])
+    summaries = summaries or {method: StreamingSummary() for method in engine.METHOD_NAMES}
+
+    n_companies = len(inputs['company'])
+    for start in range(0, n_companies, chunk_size):
+        chunk = {key: value[start:start + chunk_size] if np.ndim(value) else value for key, value in inputs.items()}
+        for method, summary in summaries.items():
+            chunk_params = {name: value[start:start + chunk_size] if np.ndim(value) else value
+                            for name, value in params[method].items()}
+            summary.update(engine.goodwill(method, chunk, chunk_params))
+        if report is not None:
+            report(min(start + chunk_size, n_companies), n_companies)
+    return summaries
+
+
+# 포트폴리오 민감도 분석 (한 평가 방법의 매개변수별 기업별 영업권 변동, sensitivity.one_at_a_time 결과)
+# relative: None이면 입력 범위 전체, 값이 있으면 기준값 ± 입력 범위 × relative
+def portfolio_sensitivity(portfolio, method, parameters=None, growth_estimator=None, relative=None):
+    params = portfolio_parameters(portfolio, parameters, growth_estimator)[method]
+    inputs = engine.engine_inputs(portfolio, params.get('multiple_type', engine.MULTIPLE_TYPES[0]),
+                                  earnings_scheme=params.get('earnings_scheme', 'mean'))
+    return one_at_a_time(
+        method,
+        inputs,
+        {name: value for name, value in params.items() if name in engine.PARAMETER_RANGES[method]},
+        relative=relative
+    )
@@ -0,0 +1,68 @@
+# 영업권 평가 시스템 - 재무 데이터 수정 후 부분 재계산
+#
+# 기업 정보 페이지에서 재무 데이터를 다시 저장하면 이전 표준화 데이터와 셀 단위로 비교하여
+# 바뀐 셀을 읽는 평가 방법만 이전 매개변수 그대로 다시 계산합니다.
+# (예: 최신 연도 총부채 수정 → DCF·시장가치비교법, 매출액 수정 → P/S 배수를 사용한 시장가치비교법만)
+# 비교는 누락 데이터 보정 후의 값과 보정 여부로 하므로, 당기순이익 수정으로 보정된 영업이익이 바뀐 경우도 반영됩니다.
+
+import numpy as np
+
+import valuation_engine as engine
+from financial_schema import FINANCIAL_COLUMNS
+from method_results import build_result
+
+
+# 바뀐 셀 목록 [(연도, 항목), ...] (연도 구성이 달라진 경우 None = 전체 변경)
+def changed_cells(old, new):
+    if old is None or len(old['years']) != len(new['years']) or not np.array_equal(old['years'], new['years']):
+        return None
+
+    changes = []
+    for column in FINANCIAL_COLUMNS:
+        old_values, new_values = old['values'][column], new['values'][column]
+        differs = ~((old_values == new_values) | (np.isnan(old_values) & np.isnan(new_values)))
+        differs |= old['imputed'][column] != new['imputed'][column]
+        changes.extend((int(year), column) for year in new['years'][differs])
+    return changes
+
+
+# 바뀐 셀에 의존하는 평가 방법 (results: st.session_state.valuation_results)
+def affected_methods(changes, results, years):
+    if changes is None:
+        return list(results)
+
+    affected = []
+    for method, result in results.items():
+        dependencies = engine.method_dependencies(method, result['parameters'])
+        if any(column in dependencies and year in engine.dependency_years(years, dependencies[column])
+               for year, column in changes):
+            affected.append(method)
+    return affected
+
+
+# 영향을 받는 평가 결과만 다시 계산
+# 반환: 갱신된 결과 사전과 재계산·유지·제외된 평가 방법 목록
+# 초과이익이 0 이하가 된 초과이익법, 평가할 수 없게 된 상증법 결과는 평가 페이지와 같은 기준으로 제외
+def recalculate(results, old, new):
+    changes = changed_cells(old, new)
+    affected = affected_methods(changes, results, new['years'])
+
+    updated = dict(results)
+    recomputed, dropped = [], []
+    for method in affected:
+        result = build_result(method, new, results[method]['parameters'])
+        invalid = np.isnan(result['value']) or (method == 'excess_earnings' and result['trace']['scalars']['excess_profit'] <= 0)
+        if invalid:
+            del updated[method]
+            dropped.append(method)
+        else:
+            updated[method] = result
+            recomputed.append(method)
+
+    return {
+        'results': updated,
+        'changes': changes,
+        'recomputed': recomputed,
+        'skipped': [method for method in results if method not in affected],
+        'dropped': dropped
+    }
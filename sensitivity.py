@@ -0,0 +1,105 @@
+# 영업권 평가 시스템 - 단일 변수 민감도 분석 (토네이도 차트)
+#
+# 평가 방법별로 매개변수를 하나씩 입력 범위의 하한/상한으로 바꾸고 나머지는 기준값으로 고정하여
+# 영업권 변동폭을 계산합니다. 모든 변형 시나리오(기업 × 시나리오)는 엔진 한 번의 호출로 평가됩니다.
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import valuation_engine as engine
+
+
+# 매개변수별 하한/상한 결정
+# relative가 주어지면 기준값 ± (입력 범위 폭 × relative), 없으면 입력 위젯의 전체 범위를 사용
+def perturbation_bounds(method, base_params, relative=None):
+    bounds = {}
+    for name, (low, high) in engine.PARAMETER_RANGES[method].items():
+        if relative is not None:
+            base = np.asarray(base_params[name], dtype=float)
+            step = (high - low) * relative
+            low, high = np.clip(base - step, low, high), np.clip(base + step, low, high)
+            if name in ('excess_years', 'forecast_years', 'capitalization_years'):
+                low, high = np.floor(low), np.ceil(high)
+        bounds[name] = (low, high)
+    return bounds
+
+
+# 단일 변수 민감도 분석
+# inputs: engine_inputs() 결과 (기업 수 C), base_params: 평가 방법의 기준 매개변수
+# 반환: 기업 × 매개변수별 하한/상한 적용 영업권과 변동폭 (기업 내 변동폭 내림차순)
+def one_at_a_time(method, inputs, base_params=None, relative=None):
+    params = dict(engine.DEFAULT_PARAMETERS[method])
+    params.update(base_params or {})
+    companies = np.atleast_1d(inputs['company'])
+    n_companies = len(companies)
+
+    # 적용 배수 기준값은 기업별 업종 평균 배수
+    if method == 'market_comparison' and params.get('custom_multiple') is None:
+        params['custom_multiple'] = inputs['industry_multiple']
+
+    names = list(engine.PARAMETER_RANGES[method])
+    bounds = perturbation_bounds(method, params, relative)
+
+    # 시나리오 0 = 기준값, 2i+1 = i번째 매개변수 하한, 2i+2 = 상한
+    n_scenarios = 2 * len(names) + 1
+    scenario_params = {}
+    for i, name in enumerate(names):
+        values = np.broadcast_to(np.asarray(params[name], dtype=float).reshape(-1, 1),
+                                 (n_companies, n_scenarios)).copy()
+        low, high = bounds[name]
+        values[:, 2 * i + 1] = low
+        values[:, 2 * i + 2] = high
+        scenario_params[name] = values
+
+    scenario_inputs = {key: np.asarray(value)[:, None] if np.ndim(value) else value
+                       for key, value in inputs.items() if key != 'company'}
+    results = engine.goodwill(method, scenario_inputs, scenario_params)
+
+    base_value = results[:, 0]
+    low_value = results[:, 1::2]
+    high_value = results[:, 2::2]
+
+    ranking = pd.DataFrame({
+        '회사명': np.repeat(companies, len(names)),
+        '매개변수': np.tile(names, n_companies),
+        '매개변수명': np.tile([engine.PARAMETER_LABELS[name] for name in names], n_companies),
+        '하한': np.column_stack([np.broadcast_to(bounds[name][0], (n_companies,)) for name in names]).ravel(),
+        '상한': np.column_stack([np.broadcast_to(bounds[name][1], (n_companies,)) for name in names]).ravel(),
+        '기준 영업권': np.repeat(base_value, len(names)),
+        '하한 적용 영업권': low_value.ravel(),
+        '상한 적용 영업권': high_value.ravel()
+    })
+    ranking['변동폭'] = (ranking['상한 적용 영업권'] - ranking['하한 적용 영업권']).abs()
+    ranking = ranking.sort_values(['회사명', '변동폭'], ascending=[True, False], kind='stable')
+    ranking['순위'] = ranking.groupby('회사명').cumcount() + 1
+    return ranking.reset_index(drop=True)
+
+
+# 토네이도 차트 (변동폭이 큰 매개변수가 위쪽)
+def tornado_figure(ranking, title='매개변수별 영업권 민감도'):
+    ranking = ranking.sort_values('변동폭')
+    base_value = ranking['기준 영업권'].iloc[0]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=ranking['매개변수명'],
+        x=ranking['하한 적용 영업권'] - base_value,
+        base=base_value,
+        orientation='h',
+        name='하한 적용',
+        customdata=np.column_stack([ranking['하한'], ranking['하한 적용 영업권']]),
+        hovertemplate='%{y} = %{customdata[0]:.2f}<br>영업권: %{customdata[1]:,.0f}원<extra></extra>'
+    ))
+    fig.add_trace(go.Bar(
+        y=ranking['매개변수명'],
+        x=ranking['상한 적용 영업권'] - base_value,
+        base=base_value,
+        orientation='h',
+        name='상한 적용',
+        customdata=np.column_stack([ranking['상한'], ranking['상한 적용 영업권']]),
+        hovertemplate='%{y} = %{customdata[0]:.2f}<br>영업권: %{customdata[1]:,.0f}원<extra></extra>'
+    ))
+    fig.add_vline(x=base_value, line_dash='dash', annotation_text='기준 영업권')
+    fig.update_layout(title=title, barmode='overlay', xaxis_title='영업권 가치', yaxis_title='')
+    return fig
@@ -0,0 +1,174 @@
+# 영업권 평가 시스템 - 상관 준몬테카를로 시뮬레이션
+#
+# 초과이익법, DCF, 시장가치비교법의 주요 매개변수를 사용자가 지정한 상관행렬에 따라 동시에 추출하여
+# 종합 결과 페이지의 가중평균 영업권 분포를 추정합니다.
+# - 표본 추출: Sobol 저불일치 수열(scipy 설치 시) 또는 라틴 하이퍼큐브 표본 (NumPy만으로 동작)
+# - 상관 구조: 표준정규 변환 후 상관행렬의 촐레스키 분해로 결합
+# - 메모리: 경로를 청크 단위로 생성·평가하고 스트리밍 요약(sketches.py)만 누적하므로 경로 수와 무관하게 일정
+
+import warnings
+
+import numpy as np
+
+import valuation_engine as engine
+from sketches import StreamingSummary
+
+try:
+    from scipy.stats import qmc
+except ImportError:  # scipy 미설치 시 라틴 하이퍼큐브 표본만 사용
+    qmc = None
+
+# 시뮬레이션 대상 매개변수 기본 설정: (평가 방법, 매개변수, 표준편차)
+DEFAULT_VARIABLES = [
+    ('excess_earnings', 'normal_roi', 2.0),
+    ('excess_earnings', 'discount_rate', 2.0),
+    ('dcf', 'growth_rate', 2.0),
+    ('dcf', 'discount_rate', 2.0),
+    ('dcf', 'terminal_growth', 0.5),
+    ('market_comparison', 'custom_multiple', 1.5)
+]
+
+SAMPLERS = ['sobol', 'lhs'] if qmc is not None else ['lhs']
+
+
+# 표준정규분포 역누적분포함수 (Acklam 근사, 상대오차 1.15e-9 이내)
+def norm_ppf(u):
+    a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+    b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01]
+    c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+    d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00]
+
+    u = np.clip(np.asarray(u, dtype=float), 1e-12, 1 - 1e-12)
+    z = np.empty_like(u)
+    low = u < 0.02425
+    high = u > 1 - 0.02425
+    mid = ~(low | high)
+
+    q = np.sqrt(-2 * np.log(u[low]))
+    z[low] = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+        ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    q = np.sqrt(-2 * np.log(1 - u[high]))
+    z[high] = -(((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+        ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    q = u[mid] - 0.5
+    r = q * q
+    z[mid] = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / \
+        (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    return z
+
+
+# 상관행렬 검증 및 촐레스키 분해 (양의 준정부호가 아니면 가장 가까운 상관행렬로 보정)
+def correlation_cholesky(correlation):
+    correlation = np.asarray(correlation, dtype=float)
+    if correlation.ndim != 2 or correlation.shape[0] != correlation.shape[1]:
+        raise ValueError("상관행렬은 정방행렬이어야 합니다.")
+    if not np.allclose(correlation, correlation.T):
+        raise ValueError("상관행렬은 대칭이어야 합니다.")
+    if np.any(np.abs(correlation) > 1):
+        raise ValueError("상관계수는 -1과 1 사이여야 합니다.")
+
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    if eigenvalues.min() < 1e-10:
+        eigenvalues = np.clip(eigenvalues, 1e-10, None)
+        correlation = eigenvectors @ np.diag(eigenvalues) @ eigenvectors.T
+        scale = np.sqrt(np.diag(correlation))
+        correlation = correlation / np.outer(scale, scale)
+    return np.linalg.cholesky(correlation)
+
+
+# 균등분포 [0, 1) 표본 생성기 (청크 단위)
+class _UniformSampler:
+    def __init__(self, dimension, sampler, seed):
+        if sampler == 'sobol' and qmc is None:
+            raise ValueError("Sobol 표본 추출에는 scipy가 필요합니다.")
+        self.dimension = dimension
+        self.sampler = sampler
+        self.rng = np.random.default_rng(seed)
+        self.sobol = qmc.Sobol(dimension, scramble=True, seed=self.rng) if sampler == 'sobol' else None
+
+    def draw(self, n):
+        if self.sobol is not None:
+            # 청크 크기가 2의 거듭제곱이 아닐 때의 균형성 경고는 무시 (마지막 청크 등)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                return self.sobol.random(n)
+        # 라틴 하이퍼큐브: 각 차원을 n개 구간으로 나누고 구간마다 1개씩 추출
+        strata = self.rng.permuted(np.tile(np.arange(n), (self.dimension, 1)), axis=1).T
+        return (strata + self.rng.random((n, self.dimension))) / n
+
+
+# 상관 준몬테카를로 시뮬레이션
+# inputs: 단일 기업의 engine_inputs() 결과
+# params: 평가 방법별 기준 매개변수 {method: {...}}, weights: 평가 방법별 가중치 {method: w}
+# variables: [(평가 방법, 매개변수, 표준편차), ...], correlation: 변수 간 상관행렬
+# thresholds: 초과 확률을 계산할 가중평균 영업권 기준값 목록
+# edges: 히스토그램 고정 구간 (지정하지 않으면 값의 범위에 맞춰 구간을 넓힘, 구간 밖 경로 수는 out_of_range)
+# report(완료 경로 수, 전체 경로 수): 청크마다 호출되는 진행 상황 콜백
+def simulate_weighted_goodwill(inputs, params, weights, variables=None, correlation=None, n_paths=65536,
+                               chunk_size=16384, sampler='sobol', seed=None, thresholds=(), bins=200, edges=None,
+                               report=None):
+    methods = [method for method, weight in weights.items() if weight > 0]
+    total_weight = sum(weights[method] for method in methods)
+    variables = [v for v in (variables or DEFAULT_VARIABLES) if v[0] in methods]
+    if not variables:
+        raise ValueError("시뮬레이션할 매개변수가 없습니다.")
+
+    dimension = len(variables)
+    cholesky = correlation_cholesky(np.eye(dimension) if correlation is None else correlation)
+    if cholesky.shape[0] != dimension:
+        raise ValueError("상관행렬의 크기가 시뮬레이션 변수 수와 다릅니다.")
+
+    if sampler not in SAMPLERS:
+        sampler = 'lhs'
+    uniform = _UniformSampler(dimension, sampler, seed)
+
+    # 변수별 기준값 (시장가치비교법 배수 미지정 시 업종 평균 배수)
+    base_params = {method: dict(engine.DEFAULT_PARAMETERS[method], **params.get(method, {})) for method in methods}
+    if 'market_comparison' in base_params and base_params['market_comparison'].get('custom_multiple') is None:
+        base_params['market_comparison']['custom_multiple'] = float(inputs['industry_multiple'][0])
+
+    summary = StreamingSummary(edges, bins, seed=seed)
+    exceed = np.zeros(len(thresholds), dtype=np.int64)
+    method_totals = dict.fromkeys(methods, 0.0)
+
+    remaining = n_paths
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        remaining -= n
+
+        # 상관된 표준정규 표본 → 매개변수 (입력 범위로 제한)
+        z = norm_ppf(uniform.draw(n)) @ cholesky.T
+        chunk_params = {method: dict(base_params[method]) for method in methods}
+        for j, (method, name, std) in enumerate(variables):
+            low, high = engine.PARAMETER_RANGES[method][name]
+            chunk_params[method][name] = np.clip(base_params[method][name] + std * z[:, j], low, high)
+
+        weighted = np.zeros(n)
+        for method in methods:
+            values = engine.goodwill(method, inputs, chunk_params[method])
+            values = np.broadcast_to(values, (n,))
+            method_totals[method] += values.sum()
+            weighted += values * (weights[method] / total_weight)
+
+        summary.update(weighted)
+        exceed += (weighted[:, None] > np.asarray(thresholds, dtype=float)[None, :]).sum(axis=0)
+        if report is not None:
+            report(n_paths - remaining, n_paths)
+
+    described = summary.describe()
+    return {
+        'n_paths': summary.count,
+        'sampler': sampler,
+        'mean': described['mean'],
+        'std': described['std'],
+        'percentiles': described['percentiles'],
+        'histogram': (summary.histogram.edges, summary.histogram.counts),
+        'out_of_range': (summary.histogram.below, summary.histogram.above),
+        'exceedance': {threshold: count / summary.count for threshold, count in zip(thresholds, exceed)},
+        'method_means': {method: total / summary.count for method, total in method_totals.items()},
+        'variables': variables,
+        'summary': summary
+    }
@@ -0,0 +1,194 @@
+# 영업권 평가 시스템 - 스트리밍 요약 통계
+#
+# 시뮬레이션과 포트폴리오 일괄 평가에서 생성되는 대량의 영업권 값을 모두 보관하지 않고
+# 청크 단위로 받아 분위수·히스토그램·적률만 유지합니다.
+# - QuantileSketch: KLL 분위수 스케치 (메모리 O(k log(n/k)), 순위 오차 약 1.7/k)
+# - StreamingHistogram: 고정 구간 히스토그램 (구간 밖 값은 하한/상한 초과 개수로 집계)
+# - StreamingSummary: 위 두 가지와 개수·평균·분산·최솟값·최댓값을 함께 관리
+#   (구간을 지정하지 않으면 값이 범위를 벗어날 때마다 구간을 넓혀 다시 나눔)
+# 모든 요약은 merge()로 합칠 수 있어 병렬 워커의 결과를 한곳에서 결합할 수 있습니다.
+
+import numpy as np
+
+
+# KLL 분위수 스케치
+class QuantileSketch:
+    def __init__(self, k=256, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    # 레벨별 보관 용량 (상위 레벨일수록 크고, 하위 레벨은 2/3씩 감소)
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(8, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    # 용량을 넘은 레벨을 정렬 후 하나 걸러 하나씩 상위 레벨로 올림 (가중치 2배)
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                keep = items[:len(items) % 2]
+                items = items[len(items) % 2:]
+                promoted = items[self.rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantiles(self, q):
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, weights = items[order], weights[order]
+        cumulative = np.cumsum(weights)
+        positions = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return items[np.clip(positions, 0, len(items) - 1)]
+
+    # 보관 중인 값 개수 (메모리 사용량 지표)
+    @property
+    def size(self):
+        return sum(len(items) for items in self.levels)
+
+
+# 고정 구간 히스토그램
+class StreamingHistogram:
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.below = 0
+        self.above = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        self.counts += np.histogram(values, self.edges)[0]
+        self.below += int((values < self.edges[0]).sum())
+        self.above += int((values > self.edges[-1]).sum())
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("구간이 다른 히스토그램은 합칠 수 없습니다.")
+        self.counts += other.counts
+        self.below += other.below
+        self.above += other.above
+        return self
+
+    # 다른 구간으로 다시 나눈 히스토그램 (구간 안에서는 값이 고르게 분포한다고 보고 누적 개수를 보간)
+    # 새 구간 밖으로 나가는 개수는 하한/상한 초과 개수에 더함
+    def rebin(self, edges):
+        rebinned = StreamingHistogram(edges)
+        cumulative = np.append(0, np.cumsum(self.counts))
+        cumulative = np.round(np.interp(rebinned.edges, self.edges, cumulative)).astype(np.int64)
+        rebinned.counts = np.diff(cumulative)
+        rebinned.below = self.below + int(cumulative[0])
+        rebinned.above = self.above + int(self.counts.sum() - cumulative[-1])
+        return rebinned
+
+
+# 스트리밍 요약 (분위수 스케치 + 히스토그램 + 적률)
+# edges를 지정하지 않으면 첫 청크의 범위를 기준으로 bins개 구간을 정하고,
+# 이후 값이나 merge()하는 요약이 범위를 벗어나면 두 범위를 모두 덮도록 구간을 넓혀 다시 나눔
+# edges를 지정하면 구간은 고정되며 merge()하는 요약은 그 구간으로 다시 나누어 합침
+class StreamingSummary:
+    def __init__(self, edges=None, bins=200, k=256, seed=None):
+        self.bins = bins
+        self.fixed = edges is not None
+        self.sketch = QuantileSketch(k, seed)
+        self.histogram = StreamingHistogram(edges) if edges is not None else None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    # 청크 적률 결합 (Chan 병렬 분산 공식)
+    def _combine_moments(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        if self.histogram is None:
+            self.histogram = StreamingHistogram(self._padded_edges(values.min(), values.max()))
+        elif not self.fixed and (values.min() < self.histogram.edges[0] or values.max() > self.histogram.edges[-1]):
+            edges = self._padded_edges(min(values.min(), self.histogram.edges[0]),
+                                       max(values.max(), self.histogram.edges[-1]))
+            self.histogram = self.histogram.rebin(edges)
+        self.sketch.update(values)
+        self.histogram.update(values)
+        mean = values.mean()
+        self._combine_moments(len(values), mean, np.square(values - mean).sum(), values.min(), values.max())
+
+    # low~high 범위의 양쪽에 범위의 절반씩 여유를 둔 bins개 구간 (구간을 넓힐 때마다 폭이 2배 이상 늘어 다시 나누는 횟수를 줄임)
+    def _padded_edges(self, low, high):
+        span = max(high - low, abs(high) * 1e-6, 1.0)
+        return np.linspace(low - span * 0.5, high + span * 0.5, self.bins + 1)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        self.sketch.merge(other.sketch)
+        if self.histogram is None:
+            self.histogram = other.histogram.rebin(other.histogram.edges)
+        elif np.array_equal(self.histogram.edges, other.histogram.edges):
+            self.histogram.merge(other.histogram)
+        else:
+            if not self.fixed:
+                edges = self.histogram.edges
+                self.histogram = self.histogram.rebin(np.linspace(min(edges[0], other.histogram.edges[0]),
+                                                                  max(edges[-1], other.histogram.edges[-1]),
+                                                                  self.bins + 1))
+            self.histogram.merge(other.histogram.rebin(self.histogram.edges))
+        self._combine_moments(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / self.count) if self.count else np.nan
+
+    def quantiles(self, q):
+        return self.sketch.quantiles(q)
+
+    # 화면·보고서 표시용 요약 dict
+    def describe(self, percentiles=(1, 5, 10, 25, 50, 75, 90, 95, 99)):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.min,
+            'max': self.max,
+            'percentiles': dict(zip(percentiles, self.quantiles(np.asarray(percentiles) / 100)))
+        }
@@ -0,0 +1,6 @@
+# 테스트 공통 설정: 저장소 루트의 모듈(valuation_engine, group 등)을 가져올 수 있도록 경로 추가
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
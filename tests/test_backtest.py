@@ -0,0 +1,58 @@
+# 기준연도별 재평가: 평균이익 구간은 행 위치가 아니라 회계연도 기준
+
+import numpy as np
+import pandas as pd
+
+import valuation_engine as engine
+from backtest import _window_earnings, rolling_revaluation
+from financial_schema import normalize_financial_data
+
+
+# 2017년이 빠진 6개 연도 재무 데이터
+def _financial_frame(years=(2014, 2015, 2016, 2018, 2019, 2020)):
+    net_income = np.linspace(1e8, 6e8, len(years))
+    return pd.DataFrame({
+        '회사명': '테스트',
+        '산업군': '제조업',
+        '연도': list(years),
+        '매출액': net_income * 10,
+        '영업이익': net_income * 1.3,
+        '당기순이익': net_income,
+        '총자산': np.full(len(years), 5e9),
+        '총부채': np.full(len(years), 2e9),
+        '자본': np.full(len(years), 3e9)
+    })
+
+
+def test_window_matches_rolling_mean_without_gaps():
+    years = np.arange(2015, 2022)
+    net_income = np.array([1., 2., np.nan, 4., 5., 6., 10.])
+    for window, min_periods in [(3, 3), (3, 1), (5, 2)]:
+        expected = pd.Series(net_income).rolling(window, min_periods=min_periods).mean().to_numpy()
+        np.testing.assert_allclose(_window_earnings(years, net_income, window, min_periods, 'mean'), expected)
+
+
+def test_window_skips_missing_fiscal_year():
+    years = np.array([2015, 2016, 2018, 2019, 2020])
+    net_income = np.array([1., 2., 4., 5., 6.])
+    # 2018년 3년 구간은 2016~2018 → 2016·2018 두 해만 포함
+    np.testing.assert_allclose(_window_earnings(years, net_income, 3, 1, 'mean'), [1., 1.5, 3., 4.5, 5.])
+    # 3개 연도가 모두 있는 구간은 2018~2020 뿐
+    np.testing.assert_allclose(_window_earnings(years, net_income, 3, 3, 'mean'), [np.nan] * 4 + [5.])
+
+
+def test_rolling_revaluation_windows_follow_years():
+    values, _ = rolling_revaluation(normalize_financial_data(_financial_frame()), window=3)
+    valued = values.loc[values['excess_earnings'].notna(), '연도'].tolist()
+    # 2017년이 없으므로 2018·2019년 기준 3년 구간은 연도가 모자라 평가하지 않음
+    assert valued == [2016, 2020]
+
+
+def test_rolling_revaluation_includes_statutory():
+    data = normalize_financial_data(_financial_frame())
+    values, errors = rolling_revaluation(data, window=3)
+    assert 'statutory' in values
+    # 기준연도가 마지막 연도일 때는 상증법 평가와 같은 값
+    latest = engine.evaluate('statutory', engine.engine_inputs(data), engine.DEFAULT_PARAMETERS['statutory'])['value'][0]
+    assert np.isclose(values['statutory'].iloc[-1], latest)
+    assert (errors['평가 방법'] == engine.METHOD_NAMES['statutory']).any()
@@ -0,0 +1,98 @@
+# 그룹 평가: 기업별 재무 데이터 수정 후 부분 재합산
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import valuation_engine as engine
+from financial_schema import normalize_financial_data
+from group import entity_frame, load_structure, update_entity, value_group
+
+
+# 3단계 지배구조 (지주회사 → 종속회사 → 손자회사)
+STRUCTURE = pd.DataFrame({
+    '회사명': ['지주', '종속A', '종속B', '손자A1', '손자A2', '증손A11'],
+    '상위회사': ['', '지주', '지주', '종속A', '종속A', '손자A1'],
+    '지분율': [np.nan, 80, 55, 60, 100, 45]
+})
+
+
+# 기업별 5개 연도 재무 데이터 (일부 기업은 영업이익·총부채·자본이 없어 보정됨)
+def _financial_frame(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for number, company in enumerate(STRUCTURE['회사명']):
+        for year in range(2020, 2025):
+            net_income = rng.uniform(1e8, 5e8)
+            total_assets = rng.uniform(2e9, 6e9)
+            debt = total_assets * rng.uniform(0.2, 0.6)
+            rows.append({
+                '회사명': company,
+                '산업군': '제조업',
+                '연도': year,
+                '매출액': net_income * rng.uniform(8, 12),
+                '영업이익': np.nan if number % 2 else net_income * rng.uniform(1.1, 1.5),
+                '당기순이익': net_income,
+                '총자산': total_assets,
+                '총부채': np.nan if number % 3 == 0 else debt,
+                '자본': np.nan if number % 3 == 0 else total_assets - debt
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def group():
+    return value_group(load_structure(STRUCTURE), normalize_financial_data(_financial_frame()))
+
+
+def _entity_index(group, name):
+    return int(np.flatnonzero(group['structure']['entity'] == name)[0])
+
+
+# 수정하지 않고 저장하면 보정 여부가 유지되어 영업권이 바뀌지 않음
+@pytest.mark.parametrize('name', ['지주', '종속A', '손자A1'])
+def test_unedited_save_keeps_goodwill(group, name):
+    index = _entity_index(group, name)
+    before = {method: group['standalone'][method].copy() for method in engine.METHOD_NAMES}
+    consolidated = {method: group['consolidated'][method].copy() for method in engine.METHOD_NAMES}
+
+    update_entity(group, index, normalize_financial_data(entity_frame(group, index), company=name, industry='제조업'))
+
+    data = group['overrides'][index]
+    assert any(flags.any() for flags in data['imputed'].values())
+    for method in engine.METHOD_NAMES:
+        np.testing.assert_allclose(group['standalone'][method], before[method], rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(group['consolidated'][method], consolidated[method], rtol=1e-12)
+
+
+# 기업을 하나씩 수정할 때마다 부분 재합산 결과가 전체 재평가·재합산 결과와 같음 (여러 계층)
+def test_update_entity_matches_full_roll_up(group):
+    frame = _financial_frame()
+    structure = load_structure(STRUCTURE)
+    for name, factor in [('증손A11', 3.0), ('종속B', 0.5), ('손자A1', 1.8), ('지주', 1.2)]:
+        rows = frame['회사명'] == name
+        frame.loc[rows, ['당기순이익', '매출액']] *= factor
+        path = update_entity(group, _entity_index(group, name),
+                             normalize_financial_data(frame[rows], company=name, industry='제조업'))
+        assert path[0] == _entity_index(group, name) and structure['parent'][path[-1]] == -1
+
+        full = value_group(structure, normalize_financial_data(frame))
+        for method in engine.METHOD_NAMES:
+            np.testing.assert_allclose(group['standalone'][method], full['standalone'][method], rtol=1e-10, equal_nan=True)
+            np.testing.assert_allclose(group['consolidated'][method], full['consolidated'][method], rtol=1e-10)
+            np.testing.assert_allclose(group['attributable'][method], full['attributable'][method], rtol=1e-10)
+            np.testing.assert_allclose(group['consolidated'][method] - group['attributable'][method],
+                                       full['consolidated'][method] - full['attributable'][method], rtol=1e-8, atol=1e-3)
+
+
+# 합산 정의: 연결 = 자체 + 종속기업 연결 전액, 귀속 = 자체 + 지분율 × 종속기업 귀속
+def test_roll_up_definition(group):
+    structure = group['structure']
+    for method in engine.METHOD_NAMES:
+        own = np.nan_to_num(group['standalone'][method])
+        consolidated, attributable = group['consolidated'][method], group['attributable'][method]
+        for index in range(len(structure['entity'])):
+            below = structure['parent'] == index
+            assert consolidated[index] == pytest.approx(own[index] + consolidated[below].sum())
+            assert attributable[index] == pytest.approx(
+                own[index] + (structure['ownership'][below] * attributable[below]).sum())
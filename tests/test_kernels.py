@@ -0,0 +1,116 @@
+# 할인·합산 커널: goodwill()이 두 구현(numba/NumPy) 모두에서 상세 계산 evaluate()와 같은 값을 내는지 확인
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import kernels
+import valuation_engine as engine
+from financial_schema import normalize_financial_data
+
+N_COMPANIES = 60
+
+
+@pytest.fixture(params=['numpy', 'numba'])
+def backend(request):
+    if request.param not in kernels.BACKENDS:
+        pytest.skip("numba가 설치되어 있지 않습니다.")
+    previous = kernels.get_backend()
+    kernels.set_backend(request.param)
+    yield request.param
+    kernels.set_backend(previous)
+
+
+# 기업마다 연수·누락 항목이 다른 포트폴리오의 평가 입력
+@pytest.fixture(scope='module')
+def inputs():
+    rng = np.random.default_rng(0)
+    rows = []
+    for number in range(N_COMPANIES):
+        for year in range(2024 - rng.integers(1, 7), 2025):
+            total_assets = rng.uniform(1e9, 8e9)
+            rows.append({
+                '회사명': f"기업{number:03d}",
+                '산업군': ['제조업', '서비스업', 'IT/소프트웨어'][number % 3],
+                '연도': year,
+                '매출액': rng.uniform(1e9, 2e10),
+                '영업이익': np.nan if number % 4 == 0 else rng.uniform(-2e8, 1.5e9),
+                '당기순이익': rng.uniform(-3e8, 1e9),
+                '총자산': np.nan if number % 7 == 0 else total_assets,
+                '총부채': np.nan if number % 5 == 0 else total_assets * rng.uniform(0.1, 0.7),
+                '자본': np.nan if number % 5 == 0 else total_assets * rng.uniform(0.3, 0.9)
+            })
+    return engine.engine_inputs(normalize_financial_data(pd.DataFrame(rows)), "P/S (주가매출비율)")
+
+
+# 기업마다 다른 매개변수 (입력 범위 안의 임의 값, 기간은 정수)
+def _random_parameters(method, seed):
+    rng = np.random.default_rng(seed)
+    params = dict(engine.DEFAULT_PARAMETERS[method])
+    for name, (low, high) in engine.PARAMETER_RANGES[method].items():
+        if isinstance(low, int):
+            params[name] = rng.integers(low, high + 1, N_COMPANIES).astype(float)
+        else:
+            params[name] = rng.uniform(low, high, N_COMPANIES)
+    return params
+
+
+def _assert_matches_evaluate(method, inputs, params):
+    expected = engine.evaluate(method, inputs, params)['value']
+    actual = engine.goodwill(method, inputs, params)
+    np.testing.assert_allclose(actual, np.broadcast_to(expected, np.shape(actual)), rtol=1e-9, atol=1e-3)
+
+
+@pytest.mark.parametrize('method', list(engine.METHOD_NAMES))
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_goodwill_matches_evaluate(backend, inputs, method, seed):
+    _assert_matches_evaluate(method, inputs, _random_parameters(method, seed))
+
+
+@pytest.mark.parametrize('method', list(engine.METHOD_NAMES))
+def test_goodwill_matches_evaluate_with_default_parameters(backend, inputs, method):
+    _assert_matches_evaluate(method, inputs, dict(engine.DEFAULT_PARAMETERS[method]))
+
+
+# 성장률 = 할인율(+위험 프리미엄)인 DCF: 할인된 현금흐름이 매년 같은 성장 연금
+def test_dcf_growth_equal_to_rate(backend, inputs):
+    params = dict(engine.DEFAULT_PARAMETERS['dcf'], growth_rate=18.0, discount_rate=15.0, risk_premium=3.0,
+                  forecast_years=np.arange(N_COMPANIES) % 10 + 1.0)
+    _assert_matches_evaluate('dcf', inputs, params)
+
+
+# 할인율 = 영구 성장률: 잔존가치가 발산 (두 경로 모두 같은 부호의 무한대)
+def test_dcf_terminal_growth_equal_to_rate(backend):
+    inputs = {'base_operating_profit': np.array([5e8, -5e8]), 'dcf_net_asset_value': np.array([1e9, np.nan])}
+    params = dict(engine.DEFAULT_PARAMETERS['dcf'], discount_rate=5.0, risk_premium=0.0, terminal_growth=5.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = engine.evaluate('dcf', inputs, params)['value']
+        actual = engine.goodwill('dcf', inputs, params)
+    assert np.isinf(expected).all()
+    np.testing.assert_array_equal(actual, expected)
+
+
+# 연금현가계수의 경계: 할인율 0%이면 연수, 기간 0년이면 0
+def test_annuity_factor_edges(backend):
+    np.testing.assert_allclose(kernels.annuity_factor(np.array([0.0, 0.0]), np.array([1.0, 7.0])), [1.0, 7.0])
+    np.testing.assert_array_equal(kernels.annuity_factor(np.array([10.0]), np.array([0.0])), [0.0])
+    rate, years = np.linspace(5, 30, 11), np.arange(1, 12, dtype=float)
+    expected = np.array([(1 / (1 + r / 100) ** np.arange(1, int(n) + 1)).sum() for r, n in zip(rate, years)])
+    np.testing.assert_allclose(kernels.annuity_factor(rate, years), expected, rtol=1e-12)
+
+
+# 두 구현은 같은 연산 순서로 계산하므로 결과가 비트 단위로 같음
+@pytest.mark.parametrize('method', list(engine.METHOD_NAMES))
+def test_backends_identical(inputs, method):
+    if 'numba' not in kernels.BACKENDS:
+        pytest.skip("numba가 설치되어 있지 않습니다.")
+    params = _random_parameters(method, 4)
+    previous = kernels.get_backend()
+    results = {}
+    try:
+        for name in kernels.BACKENDS:
+            kernels.set_backend(name)
+            results[name] = engine.goodwill(method, inputs, params)
+    finally:
+        kernels.set_backend(previous)
+    np.testing.assert_array_equal(results['numba'], results['numpy'])
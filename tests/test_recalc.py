@@ -0,0 +1,156 @@
+# 재무 데이터 수정 후 부분 재계산 (바뀐 셀에 의존하는 평가 방법만 다시 계산)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import valuation_engine as engine
+from financial_schema import FINANCIAL_COLUMNS, normalize_financial_data
+from method_results import build_result
+from recalc import affected_methods, changed_cells, recalculate
+
+YEARS = list(range(2019, 2025))
+
+PARAMETERS = {
+    'excess_earnings': dict(engine.DEFAULT_PARAMETERS['excess_earnings'], earnings_scheme='linear'),
+    'dcf': dict(engine.DEFAULT_PARAMETERS['dcf']),
+    'market_comparison': dict(engine.DEFAULT_PARAMETERS['market_comparison'],
+                              multiple_type="P/S (주가매출비율)", custom_multiple=1.5),
+    'statutory': dict(engine.DEFAULT_PARAMETERS['statutory'])
+}
+
+
+# 6개 연도 재무 데이터 (영업이익은 최근 2개 연도만 입력되어 나머지는 보정됨)
+def _frame():
+    return pd.DataFrame({
+        '연도': YEARS,
+        '매출액': [8e9, 8.5e9, 9e9, 9.6e9, 1.0e10, 1.1e10],
+        '영업이익': [np.nan] * 4 + [1.3e9, 1.4e9],
+        '당기순이익': [7e8, 7.5e8, 8e8, 9e8, 1.0e9, 1.1e9],
+        '총자산': [4e9, 4.2e9, 4.4e9, 4.8e9, 5e9, 5.2e9],
+        '총부채': [1.6e9, 1.7e9, 1.8e9, 1.9e9, 2e9, 2.1e9],
+        '자본': [2.4e9, 2.5e9, 2.6e9, 2.9e9, 3e9, 3.1e9]
+    })
+
+
+def _normalize(frame):
+    return normalize_financial_data(frame, company='테스트', industry='제조업')
+
+
+def _edit(frame, year, column, value):
+    frame = frame.copy()
+    frame.loc[frame['연도'] == year, column] = value
+    return frame
+
+
+# 전체 재계산 (평가 페이지와 같은 제외 기준)
+def _full(data, methods):
+    results = {}
+    for method in methods:
+        result = build_result(method, data, PARAMETERS[method])
+        if not (np.isnan(result['value']) or
+                (method == 'excess_earnings' and result['trace']['scalars']['excess_profit'] <= 0)):
+            results[method] = result
+    return results
+
+
+@pytest.fixture
+def results():
+    return _full(_normalize(_frame()), engine.METHOD_NAMES)
+
+
+def test_all_methods_valid_before_edit(results):
+    assert list(results) == list(engine.METHOD_NAMES)
+
+
+# 한 셀 수정 후 부분 재계산 결과 = 전체 재계산 결과, 다시 계산하지 않은 결과는 이전 객체 그대로
+@pytest.mark.parametrize('year', [YEARS[0], YEARS[-3], YEARS[-1]])
+@pytest.mark.parametrize('column', FINANCIAL_COLUMNS)
+def test_single_cell_edit_matches_full_recompute(results, year, column):
+    old = _normalize(_frame())
+    frame = _frame()
+    value = frame.loc[frame['연도'] == year, column].iloc[0]
+    new = _normalize(_edit(frame, year, column, (1.3e9 if np.isnan(value) else value * 1.1)))
+
+    update = recalculate(results, old, new)
+    full = _full(new, engine.METHOD_NAMES)
+
+    assert (year, column) in update['changes']
+    assert set(update['results']) == set(full)
+    for method, result in update['results'].items():
+        assert result['value'] == pytest.approx(full[method]['value'], rel=1e-12)
+        assert result['trace']['scalars'] == pytest.approx(full[method]['trace']['scalars'], rel=1e-12, nan_ok=True)
+    for method in update['skipped']:
+        assert update['results'][method] is results[method]
+
+
+# 변경 없음 → 모두 유지
+def test_no_change_keeps_every_result(results):
+    update = recalculate(results, _normalize(_frame()), _normalize(_frame()))
+    assert update['changes'] == [] and update['recomputed'] == [] and update['dropped'] == []
+    assert all(update['results'][method] is results[method] for method in results)
+
+
+# 관련 없는 항목 수정 → 결과 유지 (총부채는 최신 연도만, 매출액은 P/S 배수의 최신 연도만 사용)
+@pytest.mark.parametrize('year, column', [(YEARS[0], '총부채'), (YEARS[-2], '매출액'), (YEARS[-2], '자본')])
+def test_unrelated_edit_leaves_results_untouched(results, year, column):
+    frame = _frame()
+    update = recalculate(results, _normalize(frame), _normalize(_edit(frame, year, column, 1.23e9)))
+    assert update['recomputed'] == [] and update['dropped'] == []
+    assert all(update['results'][method] is results[method] for method in results)
+
+
+# 'all' 범위(초과이익법 당기순이익)와 'recent' 범위(상증법 최근 3개 연도)의 구분
+def test_all_and_recent_scopes(results):
+    years = np.array(YEARS)
+    oldest = affected_methods([(YEARS[0], '당기순이익')], results, years)
+    third = affected_methods([(YEARS[-3], '당기순이익')], results, years)
+    fourth = affected_methods([(YEARS[-4], '당기순이익')], results, years)
+    assert oldest == fourth == ['excess_earnings']
+    assert third == ['excess_earnings', 'statutory']
+
+
+# 보정된 셀의 값 변화도 변경으로 봄 (과거 연도 당기순이익 수정 → 보정된 영업이익 변경, DCF는 최신 연도만 사용하므로 유지)
+def test_imputed_cell_change_propagates(results):
+    frame = _frame()
+    old, new = _normalize(frame), _normalize(_edit(frame, YEARS[0], '당기순이익', 9e8))
+    changes = changed_cells(old, new)
+    assert (YEARS[0], '영업이익') in changes
+    assert recalculate(results, old, new)['recomputed'] == ['excess_earnings']
+
+
+# 연도 구성이 바뀌면 전체 재계산
+def test_year_change_recomputes_everything(results):
+    frame = _frame()
+    new = _normalize(frame[frame['연도'] != YEARS[0]])
+    update = recalculate(results, _normalize(frame), new)
+    assert update['changes'] is None
+    assert update['recomputed'] == list(results) and update['skipped'] == []
+    full = _full(new, engine.METHOD_NAMES)
+    for method, result in update['results'].items():
+        assert result['value'] == pytest.approx(full[method]['value'], rel=1e-12)
+
+
+# 이전 데이터가 없으면 전체 재계산
+def test_missing_previous_recomputes_everything(results):
+    assert recalculate(results, None, _normalize(_frame()))['changes'] is None
+
+
+# 초과이익이 0 이하가 된 초과이익법은 제외
+def test_non_positive_excess_profit_is_dropped(results):
+    frame = _frame()
+    update = recalculate(results, _normalize(frame), _normalize(_edit(frame, YEARS[-1], '당기순이익', -5e9)))
+    assert 'excess_earnings' in update['dropped'] and 'excess_earnings' not in update['results']
+    assert 'excess_earnings' not in _full(_normalize(_edit(frame, YEARS[-1], '당기순이익', -5e9)), ['excess_earnings'])
+
+
+# 상증법 결과가 NaN이 되면 제외 (최신 연도 자본·총자산이 모두 없으면 자본을 보정할 수 없음)
+def test_nan_result_is_dropped():
+    frame = _edit(_frame(), YEARS[-1], '총자산', np.nan)
+    old = _normalize(frame)
+    results = _full(old, ['statutory'])
+    assert list(results) == ['statutory']
+
+    new = _normalize(_edit(frame, YEARS[-1], '자본', np.nan))
+    update = recalculate(results, old, new)
+    assert update['dropped'] == ['statutory'] and update['results'] == {}
@@ -0,0 +1,133 @@
+# 스트리밍 요약 병합: 범위가 다른 요약을 합친 결과 = 전체 데이터를 한 요약에 넣은 결과
+
+import numpy as np
+import pytest
+
+from sketches import StreamingHistogram, StreamingSummary
+
+K = 256
+RANK_TOLERANCE = 3 / K  # KLL 순위 오차 약 1.7/k의 여유 범위
+
+
+def _chunks(seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.normal(0, 1, 4000), rng.normal(50, 5, 3000), rng.lognormal(3, 1, 5000), rng.uniform(-200, -100, 2000)]
+
+
+# 히스토그램이 나타내는 누적분포와 실제 누적분포의 최대 차이
+def _histogram_cdf_error(histogram, values):
+    cumulative = (histogram.below + np.append(0, np.cumsum(histogram.counts))) / len(values)
+    actual = np.searchsorted(np.sort(values), histogram.edges, side='right') / len(values)
+    return np.max(np.abs(cumulative - actual))
+
+
+def _assert_same_summary(merged, single, values):
+    assert merged.count == single.count == len(values)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(values.std(), rel=1e-10)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+    histogram = merged.histogram
+    assert histogram.counts.sum() + histogram.below + histogram.above == len(values)
+    assert (histogram.counts >= 0).all()
+
+    q = np.linspace(0.01, 0.99, 99)
+    ordered = np.sort(values)
+    for summary in (merged, single):
+        ranks = np.searchsorted(ordered, summary.quantiles(q), side='right') / len(values)
+        assert np.max(np.abs(ranks - q)) <= RANK_TOLERANCE
+
+
+# 구간을 지정하지 않은 요약: 청크마다 범위가 넓어지고(구간 자동 확장) 범위가 다른 요약끼리 병합
+def test_merge_auto_edges_matches_single_summary():
+    chunks = _chunks()
+    values = np.concatenate(chunks)
+
+    single = StreamingSummary(k=K, seed=1)
+    for chunk in chunks:
+        single.update(chunk)
+    first_edges = StreamingSummary(k=K, seed=1)
+    first_edges.update(chunks[0])
+    assert single.histogram.edges[0] < first_edges.histogram.edges[0]
+    assert single.histogram.edges[-1] > first_edges.histogram.edges[-1]
+    assert single.histogram.below == single.histogram.above == 0
+
+    parts = []
+    for seed, chunk in enumerate(chunks):
+        part = StreamingSummary(k=K, seed=seed)
+        part.update(chunk)
+        parts.append(part)
+    merged = StreamingSummary(k=K, seed=9)
+    for part in parts:
+        merged.merge(part)
+
+    _assert_same_summary(merged, single, values)
+    assert merged.histogram.below == merged.histogram.above == 0
+    assert merged.histogram.edges[0] <= values.min() and merged.histogram.edges[-1] >= values.max()
+    assert _histogram_cdf_error(merged.histogram, values) < 0.02
+    assert _histogram_cdf_error(single.histogram, values) < 0.02
+
+
+# 병합 순서와 무관 (여러 청크를 넣은 요약끼리 병합)
+def test_merge_is_order_independent():
+    chunks = _chunks(3)
+    values = np.concatenate(chunks)
+    left, right = StreamingSummary(k=K, seed=1), StreamingSummary(k=K, seed=2)
+    for chunk in chunks[:2]:
+        left.update(chunk)
+    for chunk in chunks[2:]:
+        right.update(chunk)
+    single = StreamingSummary(k=K, seed=3)
+    single.update(values)
+
+    _assert_same_summary(StreamingSummary(k=K).merge(right).merge(left), single, values)
+
+
+# 구간을 지정한 요약: 구간은 고정되고 병합하는 요약은 그 구간으로 다시 나누어 구간 밖 값은 하한/상한으로 집계
+def test_merge_into_fixed_edges():
+    chunks = _chunks(5)
+    values = np.concatenate(chunks)
+    edges = np.linspace(-50, 100, 151)
+
+    single = StreamingSummary(edges, k=K, seed=1)
+    single.update(values)
+    merged = StreamingSummary(edges, k=K, seed=1)
+    for chunk in chunks:
+        part = StreamingSummary(k=K)
+        part.update(chunk)
+        merged.merge(part)
+
+    _assert_same_summary(merged, single, values)
+    np.testing.assert_array_equal(merged.histogram.edges, edges)
+    # 다시 나눌 때 경계에 걸친 구간의 개수는 구간 안에서 고르게 분포한다고 보고 나눔
+    assert single.histogram.below == (values < edges[0]).sum()
+    assert single.histogram.above == (values > edges[-1]).sum()
+    assert merged.histogram.below == pytest.approx(single.histogram.below, abs=len(values) * 0.005)
+    assert merged.histogram.above == pytest.approx(single.histogram.above, abs=len(values) * 0.005)
+    assert _histogram_cdf_error(merged.histogram, values) < 0.02
+
+
+# 같은 구간의 고정 히스토그램 병합은 정확히 일치
+def test_same_edges_merge_is_exact():
+    chunks = _chunks(7)
+    edges = np.linspace(-300, 300, 61)
+    single = StreamingHistogram(edges)
+    single.update(np.concatenate(chunks))
+    merged = StreamingHistogram(edges)
+    for chunk in chunks:
+        part = StreamingHistogram(edges)
+        part.update(chunk)
+        merged.merge(part)
+    np.testing.assert_array_equal(merged.counts, single.counts)
+    assert (merged.below, merged.above) == (single.below, single.above)
+
+
+# 같은 구간으로 다시 나누면 그대로, 더 넓은 구간으로 나누면 전체 개수 유지
+def test_rebin_preserves_counts():
+    histogram = StreamingHistogram(np.linspace(0, 10, 11))
+    histogram.update(np.random.default_rng(0).uniform(-1, 11, 1000))
+    same = histogram.rebin(histogram.edges)
+    np.testing.assert_array_equal(same.counts, histogram.counts)
+    wider = histogram.rebin(np.linspace(-5, 15, 7))
+    assert wider.counts.sum() + wider.below + wider.above == 1000
+    assert (wider.below, wider.above) == (histogram.below, histogram.above)
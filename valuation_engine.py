@@ -0,0 +1,405 @@
+# 영업권 평가 시스템 - 평가 엔진
+#
+# 각 평가 방법의 계산 로직을 화면(UI)과 분리한 벡터화 구현입니다. (PRD 8: 평가 로직과 UI 분리)
+# 모든 입력은 NumPy 브로드캐스팅 규칙을 따르므로 스칼라 한 건부터
+# 여러 기준일, 여러 기업, 여러 매개변수 조합까지 한 번의 호출로 계산할 수 있습니다.
+# 비율 매개변수(수익률, 할인율 등)는 화면 입력과 동일하게 % 단위로 받습니다.
+
+import numpy as np
+
+import kernels
+from earnings import STATUTORY_WEIGHTS, normalized_earnings
+from financial_schema import reported
+
+# 평가 방법별 기본 매개변수 (각 평가 페이지의 입력 기본값과 동일)
+DEFAULT_PARAMETERS = {
+    'excess_earnings': {
+        'normal_roi': 10.0,
+        'excess_years': 5,
+        'discount_rate': 12.0,
+        'adjustment_factor': 1.0,
+        'industry_premium': 2.0,
+        'earnings_scheme': 'mean'
+    },
+    'dcf': {
+        'growth_rate': 5.0,
+        'forecast_years': 5,
+        'discount_rate': 15.0,
+        'terminal_growth': 1.0,
+        'risk_premium': 3.0,
+        'tax_rate': 22.0
+    },
+    'market_comparison': {
+        'multiple_type': "P/E (주가수익비율)",
+        'custom_multiple': None,  # None이면 업종 평균 배수 사용
+        'adjustment_factor': 1.0,
+        'premium_discount': 0.0,
+        'liquidity_discount': 10.0
+    },
+    'statutory': {
+        'profit_ratio': 50.0,  # 순손익액 중 영업권 기여분 (상증법 시행령 제59조 제2항)
+        'equity_return_rate': 10.0,  # 자기자본이익률 (기획재정부령으로 정하는 율)
+        'capitalization_years': 5,
+        'discount_rate': 10.0  # 기획재정부령으로 정하는 이자율
+    }
+}
+
+# 민감도 분석용 매개변수 입력 범위 (각 평가 페이지의 입력 위젯 범위와 동일)
+PARAMETER_RANGES = {
+    'excess_earnings': {
+        'normal_roi': (0.0, 100.0),
+        'excess_years': (1, 10),
+        'discount_rate': (5.0, 30.0),
+        'adjustment_factor': (0.5, 1.5),
+        'industry_premium': (0.0, 10.0)
+    },
+    'dcf': {
+        'growth_rate': (0.0, 30.0),
+        'forecast_years': (1, 10),
+        'discount_rate': (5.0, 30.0),
+        'terminal_growth': (0.0, 5.0),
+        'risk_premium': (0.0, 10.0),
+        'tax_rate': (0.0, 30.0)
+    },
+    'market_comparison': {
+        'custom_multiple': (0.1, 50.0),
+        'adjustment_factor': (0.5, 1.5),
+        'premium_discount': (-30.0, 30.0),
+        'liquidity_discount': (0.0, 30.0)
+    },
+    'statutory': {
+        'profit_ratio': (0.0, 100.0),
+        'equity_return_rate': (0.0, 30.0),
+        'capitalization_years': (1, 10),
+        'discount_rate': (5.0, 30.0)
+    }
+}
+
+# 매개변수 표시 이름
+PARAMETER_LABELS = {
+    'normal_roi': '정상 자본수익률',
+    'excess_years': '초과이익 인정연수',
+    'discount_rate': '할인율',
+    'adjustment_factor': '조정 계수',
+    'industry_premium': '산업 프리미엄',
+    'growth_rate': '영업이익 성장률',
+    'forecast_years': '예측 기간',
+    'terminal_growth': '영구 성장률',
+    'risk_premium': '위험 프리미엄',
+    'tax_rate': '법인세율',
+    'custom_multiple': '적용 배수',
+    'premium_discount': '프리미엄/할인율',
+    'liquidity_discount': '유동성 할인율',
+    'profit_ratio': '순손익액 반영 비율',
+    'equity_return_rate': '자기자본이익률',
+    'capitalization_years': '환원 기간',
+    'earnings_scheme': '평균 이익 산출 방식',
+    'multiple_type': '배수 유형',
+    'comparable_companies': '비교 기업'
+}
+
+METHOD_NAMES = {
+    'excess_earnings': '초과이익법',
+    'dcf': '현금흐름할인법(DCF)',
+    'market_comparison': '시장가치비교법',
+    'statutory': '상증법 보충적 평가'
+}
+
+MULTIPLE_TYPES = ["P/E (주가수익비율)", "EV/EBITDA (기업가치/EBITDA)", "P/S (주가매출비율)", "P/B (주가장부가치비율)"]
+
+# 배수 유형별 기준 항목과 배율 (EBITDA = 영업이익 + 감가상각비, 감가상각비를 영업이익의 20%로 가정)
+MULTIPLE_BASES = {
+    "P/E (주가수익비율)": ('당기순이익', 1.0),
+    "EV/EBITDA (기업가치/EBITDA)": ('영업이익', 1.2),
+    "P/S (주가매출비율)": ('매출액', 1.0),
+    "P/B (주가장부가치비율)": ('자본', 1.0)
+}
+
+
+# 업종별 배수 반환 함수 (실제로는 데이터베이스나 외부 API 연동 필요)
+def get_industry_multiple(industry, multiple_type):
+    # 간단한 예시 데이터 (실제로는 더 정교한 데이터베이스 필요)
+    multiples = {
+        "제조업": {"P/E (주가수익비율)": 12.5, "EV/EBITDA (기업가치/EBITDA)": 8.2, "P/S (주가매출비율)": 1.2, "P/B (주가장부가치비율)": 1.5},
+        "서비스업": {"P/E (주가수익비율)": 15.8, "EV/EBITDA (기업가치/EBITDA)": 10.5, "P/S (주가매출비율)": 2.1, "P/B (주가장부가치비율)": 2.2},
+        "도소매업": {"P/E (주가수익비율)": 14.2, "EV/EBITDA (기업가치/EBITDA)": 7.8, "P/S (주가매출비율)": 0.8, "P/B (주가장부가치비율)": 1.7},
+        "IT/소프트웨어": {"P/E (주가수익비율)": 22.5, "EV/EBITDA (기업가치/EBITDA)": 15.2, "P/S (주가매출비율)": 4.5, "P/B (주가장부가치비율)": 3.8},
+        "금융업": {"P/E (주가수익비율)": 10.2, "EV/EBITDA (기업가치/EBITDA)": 9.0, "P/S (주가매출비율)": 2.5, "P/B (주가장부가치비율)": 1.0},
+        "건설업": {"P/E (주가수익비율)": 11.8, "EV/EBITDA (기업가치/EBITDA)": 6.5, "P/S (주가매출비율)": 0.6, "P/B (주가장부가치비율)": 1.2},
+        "기타": {"P/E (주가수익비율)": 13.5, "EV/EBITDA (기업가치/EBITDA)": 9.0, "P/S (주가매출비율)": 1.5, "P/B (주가장부가치비율)": 1.8}
+    }
+
+    # 업종이 목록에 없으면 기본값 반환
+    if industry not in multiples:
+        return multiples["기타"][multiple_type]
+
+    return multiples[industry][multiple_type]
+
+
+# 배수 유형별 기준 값 (values: 표준화된 재무 항목 배열)
+# 누락 항목은 표준화 단계에서 시장가치비교법 페이지와 동일한 가정으로 보정되어 있음
+def market_base_values(values, multiple_type):
+    column, factor = MULTIPLE_BASES.get(multiple_type, MULTIPLE_BASES["P/B (주가장부가치비율)"])
+    return values[column] * factor if factor != 1.0 else values[column]
+
+
+# 순자산가치 (DCF: 총자산이 없으면 NaN, 시장가치비교법: 총자산·총부채가 모두 입력된 경우만)
+def net_asset_values(data):
+    values = data['values']
+    total_assets = values['총자산']
+    dcf_net_asset_value = total_assets - values['총부채']
+    market_net_asset_value = np.where(reported(data, '총자산') & reported(data, '총부채'),
+                                      dcf_net_asset_value, np.nan)
+    return dcf_net_asset_value, market_net_asset_value
+
+
+# 표준화된 재무 데이터에서 평가 엔진 입력값 추출 (기업별 최신 연도 기준, 기업 수 길이의 배열)
+# industry를 지정하면 표준화 데이터의 산업군 대신 사용
+# earnings_scheme: 초과이익법 평균 이익의 산출 방식 (earnings.SCHEMES), 상증법은 항상 최근 3년 3:2:1 가중평균
+def engine_inputs(data, multiple_type=MULTIPLE_TYPES[0], industry=None, earnings_scheme='mean'):
+    values = data['values']
+    starts = data['offsets'][:-1]
+    latest = data['offsets'][1:] - 1
+
+    # 당기순이익 평균 (초과이익법: 선택한 방식, 상증법: 3:2:1 가중)
+    earnings = normalized_earnings(data, (earnings_scheme, 'statutory'))
+
+    dcf_net_asset_value, market_net_asset_value = net_asset_values(data)
+    industries = data['industry'] if industry is None else np.full(len(starts), industry, dtype=object)
+
+    return {
+        'company': data['company'],
+        'avg_earnings': earnings[earnings_scheme],
+        'total_assets': values['총자산'][latest],
+        'base_operating_profit': values['영업이익'][latest],
+        'dcf_net_asset_value': dcf_net_asset_value[latest],
+        'market_base_value': market_base_values(values, multiple_type)[latest],
+        'market_net_asset_value': market_net_asset_value[latest],
+        'industry_multiple': np.array([get_industry_multiple(i, multiple_type) for i in industries]),
+        'weighted_earnings': earnings['statutory'],
+        'equity': values['자본'][latest]
+    }
+
+
+# 평가 방법별 재무 데이터 의존성 {항목: 사용 범위}
+# 사용 범위: 'all' = 전체 연도, 'latest' = 최신 연도, 'recent' = 최근 len(STATUTORY_WEIGHTS)개 연도
+# (engine_inputs()가 각 평가 방법의 입력값을 만들 때 읽는 항목과 같음)
+def method_dependencies(method, params=None):
+    if method == 'excess_earnings':
+        return {'당기순이익': 'all', '총자산': 'latest'}
+    if method == 'dcf':
+        return {'영업이익': 'latest', '총자산': 'latest', '총부채': 'latest'}
+    if method == 'market_comparison':
+        multiple_type = (params or {}).get('multiple_type', MULTIPLE_TYPES[0])
+        base_column = MULTIPLE_BASES.get(multiple_type, MULTIPLE_BASES["P/B (주가장부가치비율)"])[0]
+        return {base_column: 'latest', '총자산': 'latest', '총부채': 'latest'}
+    if method == 'statutory':
+        return {'당기순이익': 'recent', '자본': 'latest'}
+    raise ValueError(f"알 수 없는 평가 방법입니다: {method}")
+
+
+# 사용 범위에 해당하는 연도 집합 (years: 한 기업의 오름차순 연도 배열)
+def dependency_years(years, scope):
+    if scope == 'latest':
+        return set(years[-1:].tolist())
+    if scope == 'recent':
+        return set(years[-len(STATUTORY_WEIGHTS):].tolist())
+    return set(years.tolist())
+
+
+# 기간 축 생성: 1..최대연수 배열과 입력별 유효 기간 마스크
+def _period_grid(years):
+    years = np.asarray(years, dtype=int)
+    periods = np.arange(1, int(years.max()) + 1)
+    mask = periods <= years[..., None]
+    return periods, mask
+
+
+# 초과이익법
+def excess_earnings_value(avg_earnings, total_assets, normal_roi, excess_years, discount_rate,
+                          adjustment_factor=1.0, industry_premium=0.0):
+    avg_earnings, total_assets, normal_roi, excess_years, discount_rate, adjustment_factor, industry_premium = \
+        np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (
+            avg_earnings, total_assets, normal_roi, excess_years, discount_rate, adjustment_factor, industry_premium)])
+
+    # 정상이익 및 초과이익
+    normal_profit = total_assets * (normal_roi / 100)
+    excess_profit = avg_earnings - normal_profit
+
+    # 인정연수 동안 초과이익의 현재가치 (인정연수를 넘는 기간은 0)
+    periods, mask = _period_grid(excess_years)
+    discount_factors = np.where(mask, 1 / ((1 + discount_rate[..., None] / 100) ** periods), 0.0)
+    present_values = excess_profit[..., None] * discount_factors
+
+    # 조정
+    present_value_sum = present_values.sum(axis=-1)
+    adjustment = adjustment_factor * (1 + industry_premium / 100)
+    value = present_value_sum * adjustment
+
+    return {
+        'value': value,
+        'normal_profit': normal_profit,
+        'excess_profit': excess_profit,
+        'discount_factors': discount_factors,
+        'present_values': present_values,
+        'present_value_sum': present_value_sum,
+        'adjustment': adjustment
+    }
+
+
+# 현금흐름할인법(DCF)
+# net_asset_value가 NaN이면 자산/부채 데이터가 없는 것으로 보고 총 현재가치의 60%를 영업권으로 봄
+def dcf_value(base_operating_profit, net_asset_value, growth_rate, forecast_years, discount_rate,
+              terminal_growth, risk_premium, tax_rate):
+    base_operating_profit, net_asset_value, growth_rate, forecast_years, discount_rate, \
+        terminal_growth, risk_premium, tax_rate = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (
+            base_operating_profit, net_asset_value, growth_rate, forecast_years, discount_rate,
+            terminal_growth, risk_premium, tax_rate)])
+
+    rate = (discount_rate + risk_premium) / 100
+    growth = growth_rate / 100
+    terminal = terminal_growth / 100
+    after_tax = 1 - tax_rate / 100
+
+    # 미래 현금흐름 예측 및 현재가치 (예측 기간을 넘는 기간은 0)
+    periods, mask = _period_grid(forecast_years)
+    cash_flows = np.where(mask, base_operating_profit[..., None] * (1 + growth[..., None]) ** periods
+                          * after_tax[..., None], 0.0)
+    discount_factors = np.where(mask, 1 / ((1 + rate[..., None]) ** periods), 0.0)
+    present_values = cash_flows * discount_factors
+
+    # 잔존가치(Terminal Value)
+    last_cash_flow = base_operating_profit * (1 + growth) ** forecast_years * after_tax
+    terminal_value = last_cash_flow * (1 + terminal) / (rate - terminal)
+    terminal_value_pv = terminal_value / ((1 + rate) ** forecast_years)
+
+    # 총 현재가치 및 영업권 (= 기업가치 - 순자산)
+    present_value_sum = present_values.sum(axis=-1)
+    total_present_value = present_value_sum + terminal_value_pv
+    value = np.where(np.isnan(net_asset_value), total_present_value * 0.6, total_present_value - net_asset_value)
+
+    return {
+        'value': value,
+        'rate': rate * 100,
+        'cash_flows': cash_flows,
+        'discount_factors': discount_factors,
+        'present_values': present_values,
+        'present_value_sum': present_value_sum,
+        'terminal_value': terminal_value,
+        'terminal_value_pv': terminal_value_pv,
+        'total_present_value': total_present_value
+    }
+
+
+# 시장가치비교법
+# net_asset_value가 NaN이면 순자산가치를 기업가치의 40%로 가정
+def market_comparison_value(base_value, multiple, net_asset_value, adjustment_factor=1.0,
+                            premium_discount=0.0, liquidity_discount=0.0):
+    base_value, multiple, net_asset_value, adjustment_factor, premium_discount, liquidity_discount = \
+        np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (
+            base_value, multiple, net_asset_value, adjustment_factor, premium_discount, liquidity_discount)])
+
+    # 기업 가치 계산 → 조정 계수 → 프리미엄/할인율 → 유동성 할인율
+    multiplied_value = base_value * multiple
+    adjusted_value = multiplied_value * adjustment_factor
+    premium_value = adjusted_value * (1 + premium_discount / 100)
+    enterprise_value = premium_value * (1 - liquidity_discount / 100)
+
+    # 영업권 계산 (기업가치 - 순자산가치)
+    net_asset_value = np.where(np.isnan(net_asset_value), enterprise_value * 0.4, net_asset_value)
+
+    return {
+        'value': enterprise_value - net_asset_value,
+        'multiplied_value': multiplied_value,
+        'adjusted_value': adjusted_value,
+        'premium_value': premium_value,
+        'enterprise_value': enterprise_value,
+        'net_asset_value': net_asset_value
+    }
+
+
+# 상증법 보충적 평가 (상속세 및 증여세법 시행령 제59조 제2항)
+# 영업권 = Σ(n=1..환원 기간) [(3년 가중평균 순손익액 × 50% - 자기자본 × 자기자본이익률) / (1 + 이자율)^n]
+# 초과이익이 0 이하이면 영업권은 0
+def statutory_value(weighted_earnings, equity, profit_ratio=50.0, equity_return_rate=10.0,
+                    capitalization_years=5, discount_rate=10.0):
+    weighted_earnings, equity, profit_ratio, equity_return_rate, capitalization_years, discount_rate = \
+        np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (
+            weighted_earnings, equity, profit_ratio, equity_return_rate, capitalization_years, discount_rate)])
+
+    # 초과이익 = 순손익액 × 반영 비율 - 자기자본 × 자기자본이익률
+    earnings_share = weighted_earnings * (profit_ratio / 100)
+    equity_return = equity * (equity_return_rate / 100)
+    excess_profit = earnings_share - equity_return
+
+    # 환원 기간 동안의 현재가치 (환원 기간을 넘는 기간은 0)
+    periods, mask = _period_grid(capitalization_years)
+    discount_factors = np.where(mask, 1 / ((1 + discount_rate[..., None] / 100) ** periods), 0.0)
+    present_values = excess_profit[..., None] * discount_factors
+    present_value_sum = present_values.sum(axis=-1)
+
+    return {
+        'value': np.maximum(present_value_sum, 0.0),
+        'earnings_share': earnings_share,
+        'equity_return': equity_return,
+        'excess_profit': excess_profit,
+        'annuity_factor': discount_factors.sum(axis=-1),
+        'discount_factors': discount_factors,
+        'present_values': present_values,
+        'present_value_sum': present_value_sum
+    }
+
+
+# 평가 방법별 엔진 호출
+# inputs는 engine_inputs() 결과, params는 매개변수 dict이며 모두 브로드캐스팅 가능한 값
+def evaluate(method, inputs, params):
+    if method == 'excess_earnings':
+        return excess_earnings_value(
+            inputs['avg_earnings'], inputs['total_assets'], params['normal_roi'], params['excess_years'],
+            params['discount_rate'], params['adjustment_factor'], params['industry_premium']
+        )
+    if method == 'dcf':
+        return dcf_value(
+            inputs['base_operating_profit'], inputs['dcf_net_asset_value'], params['growth_rate'],
+            params['forecast_years'], params['discount_rate'], params['terminal_growth'],
+            params['risk_premium'], params['tax_rate']
+        )
+    if method == 'market_comparison':
+        multiple = params.get('custom_multiple')
+        if multiple is None:
+            multiple = inputs['industry_multiple']
+        return market_comparison_value(
+            inputs['market_base_value'], multiple, inputs['market_net_asset_value'],
+            params['adjustment_factor'], params['premium_discount'], params['liquidity_discount']
+        )
+    if method == 'statutory':
+        return statutory_value(
+            inputs['weighted_earnings'], inputs['equity'], params['profit_ratio'], params['equity_return_rate'],
+            params['capitalization_years'], params['discount_rate']
+        )
+    raise ValueError(f"알 수 없는 평가 방법입니다: {method}")
+
+
+# 평가 방법별 영업권 값만 계산 (기간 축 배열 없이 kernels의 할인·합산 커널 사용)
+# 시뮬레이션·민감도 분석·일괄 평가처럼 상세 내역 없이 값만 필요한 대량 계산용이며,
+# 결과는 evaluate()의 'value'와 부동소수점 반올림 오차 범위에서 같음
+def goodwill(method, inputs, params):
+    if method == 'excess_earnings':
+        excess_profit = np.asarray(inputs['avg_earnings'], dtype=float) - \
+            np.asarray(inputs['total_assets'], dtype=float) * (np.asarray(params['normal_roi'], dtype=float) / 100)
+        annuity = kernels.annuity_factor(params['discount_rate'], params['excess_years'])
+        return excess_profit * annuity * params['adjustment_factor'] * (1 + np.asarray(params['industry_premium']) / 100)
+    if method == 'dcf':
+        total_present_value = kernels.dcf_present_value(
+            inputs['base_operating_profit'], params['growth_rate'], params['forecast_years'],
+            np.asarray(params['discount_rate'], dtype=float) + np.asarray(params['risk_premium'], dtype=float),
+            params['terminal_growth'], params['tax_rate']
+        )
+        net_asset_value = np.asarray(inputs['dcf_net_asset_value'], dtype=float)
+        return np.where(np.isnan(net_asset_value), total_present_value * 0.6, total_present_value - net_asset_value)
+    if method == 'statutory':
+        excess_profit = np.asarray(inputs['weighted_earnings'], dtype=float) * (np.asarray(params['profit_ratio']) / 100) - \
+            np.asarray(inputs['equity'], dtype=float) * (np.asarray(params['equity_return_rate']) / 100)
+        annuity = kernels.annuity_factor(params['discount_rate'], params['capitalization_years'])
+        return np.maximum(excess_profit * annuity, 0.0)
+    return evaluate(method, inputs, params)['value']
@@ -0,0 +1,1798 @@
+# 영업권 평가 시스템 - 페이지 화면
+#
+# main.py의 st.navigation이 app_pages/의 페이지 스크립트를 실행하고, 각 스크립트는 여기의 페이지 함수를 호출합니다.
+# 가중치 슬라이더, 민감도 분석처럼 페이지 안에서 자주 조작하는 영역은 st.fragment로 분리하여
+# 위젯을 바꾸면 페이지 전체가 아니라 해당 영역만 다시 실행됩니다.
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime
+import io
+import os
+import tempfile
+
+import jobs
+import valuation_engine as engine
+from financial_schema import canonical_frame, normalize_financial_data
+from backtest import METHOD_NAMES as BACKTEST_METHOD_NAMES, rolling_revaluation, summarize_forecast_errors
+from bulk_reports import REPORT_FORMATS, write_report_archive_sharded
+from capm import build_wacc, peer_betas, read_peer_leverage, subject_debt_to_equity
+from data_window import PAGE_SIZES, apply_cell_edits, edited_cells, page_bounds, page_count
+from earnings import RECENT_WEIGHTED_SCHEMES, SCHEMES as EARNINGS_SCHEMES, STATUTORY_WEIGHTS, earnings_table, normalized_earnings
+from group import entity_frame, group_table, load_group, update_entity
+from growth import ESTIMATORS as GROWTH_ESTIMATORS, growth_table
+from method_results import (dcf_result, excess_earnings_result, market_comparison_result, statutory_result,
+                            trace_export, trace_scalars_frame, trace_table_frames)
+from portfolio import load_portfolio, portfolio_sensitivity, summarize_portfolio, value_portfolio
+from recalc import recalculate
+from sensitivity import one_at_a_time, tornado_figure
+from simulation import DEFAULT_VARIABLES as SIMULATION_VARIABLES, SAMPLERS, simulate_weighted_goodwill
+from valuation_engine import get_industry_multiple
+
+# 페이지 목록 {페이지 ID: (페이지 스크립트, 제목, 아이콘)}
+# 페이지 스크립트(app_pages/)는 main.py 기준 상대 경로이며, 각 스크립트는 아래의 페이지 함수를 호출합니다.
+PAGES = {
+    'home': ('app_pages/home.py', '홈', '🏠'),
+    'company_info': ('app_pages/company_info.py', '기업 정보 입력', '📝'),
+    'excess_earnings': ('app_pages/excess_earnings.py', '초과이익법', '📊'),
+    'dcf': ('app_pages/dcf.py', '현금흐름할인법', '💹'),
+    'market_comparison': ('app_pages/market_comparison.py', '시장가치비교법', '🔍'),
+    'statutory': ('app_pages/statutory.py', '상증법 보충적 평가', '⚖️'),
+    'results': ('app_pages/results.py', '종합 결과', '📈'),
+    'report': ('app_pages/report.py', '보고서', '📑'),
+    'batch': ('app_pages/batch.py', '일괄 평가', '📦'),
+    'group': ('app_pages/group.py', '그룹 평가', '🏢')
+}
+
+# 다른 페이지로 이동 (현재 실행을 멈추고 대상 페이지만 실행)
+def go_to(page_id):
+    st.switch_page(PAGES[page_id][0])
+
+# 표준화된 재무 데이터 (입력 시점의 표준화 결과를 재사용하고, 원본이 바뀐 경우에만 다시 표준화)
+def get_normalized_financials():
+    company_data = st.session_state.company_data
+    financial_data = company_data.get('financial_data')
+    if company_data.get('normalized') is None or company_data.get('normalized_from') is not financial_data:
+        company_data['normalized'] = normalize_financial_data(
+            financial_data,
+            company=company_data.get('name', ''),
+            industry=company_data.get('industry', '')
+        )
+        company_data['normalized_from'] = financial_data
+    return company_data['normalized']
+
+# 재무 데이터 표준화 후 저장 (연도가 있는 행이 하나도 없으면 ValueError)
+# company_data: 저장할 기업 정보 사전 (없으면 현재 세션의 기업 정보), 표준화에 성공한 경우에만 갱신
+def store_financial_data(financial_data, company_data=None):
+    company_data = st.session_state.company_data if company_data is None else company_data
+    financial_data = canonical_frame(financial_data)
+    if financial_data.empty:
+        raise ValueError("연도가 입력된 재무 데이터가 없습니다.")
+    normalized = normalize_financial_data(
+        financial_data,
+        company=company_data.get('name', ''),
+        industry=company_data.get('industry', '')
+    )
+    company_data.update(financial_data=financial_data, normalized=normalized, normalized_from=financial_data)
+    return normalized
+
+# 재무 데이터 수정 후 바뀐 셀에 의존하는 평가 결과만 이전 매개변수로 다시 계산
+def refresh_valuation_results(previous, normalized):
+    if not st.session_state.valuation_results:
+        return None
+    update = recalculate(st.session_state.valuation_results, previous, normalized)
+    st.session_state.valuation_results = update['results']
+    if update['recomputed'] or update['dropped']:
+        st.session_state.simulation_result = None
+        cancel_job('simulation')
+    return update
+
+# 부분 재계산 결과 안내
+def show_recalculation(update):
+    if update is None:
+        return
+    names = lambda methods: ', '.join(engine.METHOD_NAMES[method] for method in methods)
+    if update['changes'] is not None:
+        if not update['changes']:
+            st.info("재무 데이터 변경 사항이 없어 평가 결과를 그대로 유지합니다.")
+            return
+        cells = ', '.join(f"{year}년 {column}" for year, column in update['changes'][:10])
+        more = f" 외 {len(update['changes']) - 10}개" if len(update['changes']) > 10 else ""
+        st.info(f"변경된 셀: {cells}{more}")
+    if update['recomputed']:
+        st.info(f"다시 계산한 평가: {names(update['recomputed'])}")
+    if update['skipped']:
+        st.caption(f"변경된 셀을 사용하지 않아 유지한 평가: {names(update['skipped'])}")
+    if update['dropped']:
+        st.warning(f"수정된 데이터로 평가할 수 없어 결과를 제외했습니다: {names(update['dropped'])}")
+
+# 백그라운드 작업 제출 (같은 이름으로 진행 중인 이 세션의 이전 작업은 취소)
+def start_job(name, kind, function, *args, **kwargs):
+    cancel_job(name)
+    st.session_state.jobs[name] = jobs.submit(kind, function, *args, **kwargs)
+
+def cancel_job(name):
+    job = st.session_state.jobs.pop(name, None)
+    if job is not None:
+        jobs.cancel(job)
+
+# 백그라운드 작업 진행 상황 (0.5초마다 이 영역만 다시 실행하고, 작업이 끝나면 결과를 반영하도록 전체 다시 실행)
+@st.fragment(run_every=0.5)
+def job_progress(name, label):
+    job = st.session_state.jobs.get(name)
+    if job is None or job.done():
+        st.rerun()
+    
+    progress = job.progress()
+    if progress is not None:
+        completed, total = progress
+        st.progress(completed / total if total else 0.0, text=f"{label} ({completed:,}/{total:,})")
+    else:
+        st.progress(0.0, text=f"{label} ({'진행 중' if job.running() else '대기 중'})")
+    
+    if st.button("취소", key=f"{name}_cancel"):
+        # 입력에 따라 자동으로 제출되는 작업은 입력이 바뀔 때까지 다시 제출하지 않음
+        st.session_state.job_results[name] = (st.session_state.job_inputs.get(name), None)
+        cancel_job(name)
+        st.rerun()
+
+# 완료된 백그라운드 작업의 결과 (진행 중이면 진행 상황을 표시하고 None, 실패·취소 시 메시지 표시 후 None)
+def collect_job(name, label):
+    job = st.session_state.jobs.get(name)
+    if job is None:
+        return None
+    if not job.done():
+        job_progress(name, label)
+        return None
+    
+    del st.session_state.jobs[name]
+    try:
+        return job.result()
+    except jobs.JobCancelled:
+        st.info(f"{label} 작업이 취소되었습니다.")
+    except Exception as e:
+        st.error(f"{label} 중 오류가 발생했습니다: {e}")
+    return None
+
+# 입력이 바뀔 때마다 다시 제출하는 백그라운드 작업의 결과
+# inputs: 작업 입력을 식별하는 가벼운 값 (업로드 파일 ID, 설정값 등의 튜플)
+# 같은 inputs로 이미 끝난 결과가 있으면 재사용하고, inputs가 바뀌면 진행 중인 이전 작업을 취소하고 다시 제출
+# (인자 전체의 해시는 실제로 제출할 때만 jobs.submit에서 계산하므로 화면을 다시 실행할 때마다 계산하지 않음)
+# 계산 중이면 진행 상황을 표시하고 None, 실패·취소된 경우에도 None (같은 입력으로는 다시 제출하지 않음)
+def job_result(name, label, inputs, kind, function, *args, **kwargs):
+    cached = st.session_state.job_results.get(name)
+    if cached is not None and cached[0] == inputs:
+        return cached[1]
+    
+    if name not in st.session_state.jobs or st.session_state.job_inputs.get(name) != inputs:
+        try:
+            start_job(name, kind, function, *args, **kwargs)
+        except Exception as e:
+            st.error(f"{label} 중 오류가 발생했습니다: {e}")
+            return None
+        st.session_state.job_inputs[name] = inputs
+    
+    result = collect_job(name, label)
+    if name not in st.session_state.jobs:
+        st.session_state.job_results[name] = (inputs, result)
+    return result
+
+# 홈 페이지
+def home_page():
+    st.title("영업권 평가 시스템에 오신 것을 환영합니다")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        with st.expander("영업권이란?", expanded=False):
+            st.markdown("""
+            영업권은 기업의 순자산가치를 초과하는 가치로, 기업의 브랜드, 고객 관계, 기술력 등 무형의 가치를 포함합니다.
+            기업 인수합병(M&A) 및 법인전환 과정에서 영업권의 가치 평가가 필수적입니다.
+            """)
+        
+        with st.expander("주요 평가 방법", expanded=False):
+            st.markdown("""
+            - **초과이익법**: 정상이익을 초과하는 이익을 계산하여 영업권 가치를 평가
+            - **현금흐름할인법(DCF)**: 미래 예상 현금흐름을 현재가치화하여 평가
+            - **시장가치비교법**: 유사 기업 비교를 통한 가치 산출
+            - **상증법 보충적 평가**: 상속세 및 증여세법의 산식에 따른 법인전환·상속·증여용 평가
+            """)
+        
+        with st.expander("사용 방법", expanded=False):
+            st.markdown("""
+            1. 왼쪽 사이드바에서 원하는 평가 방법을 선택하세요.
+            2. 기업 정보와 재무 데이터를 입력하세요.
+            3. 평가 매개변수를 설정하고 계산하세요.
+            4. 결과를 확인하고 보고서를 다운로드하세요.
+            """)
+        
+        st.markdown("""
+        ## 영업권 가치 평가의 중요성
+
+        영업권 가치 평가는 기업의 현재와 미래 가치를 정확히 파악하는 데 필수적입니다.
+        이 시스템은 다양한 평가 방법론을 통해 객관적이고 전문적인 영업권 가치 평가를 제공합니다.
+        """)
+        
+        if st.button("시작하기", key="start_button"):
+            go_to('company_info')
+    
+    with col2:
+        with st.expander("영업권 평가가 필요한 경우", expanded=False):
+            st.markdown("""
+            - 기업 인수합병(M&A)
+            - 법인 전환
+            - 회계 목적의 자산 재평가
+            - 세무 신고 및 세금 계획
+            - 투자 유치 및 기업 가치 증명
+            """)
+
+# 기업 정보 입력 페이지
+def company_info_page():
+    st.title("기업 정보 입력")
+    
+    with st.form("company_info_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            company_name = st.text_input("회사명", value=st.session_state.company_data.get('name', ''))
+            business_number = st.text_input("사업자등록번호", value=st.session_state.company_data.get('business_number', ''))
+        
+        with col2:
+            industries = ["제조업", "서비스업", "도소매업", "IT/소프트웨어", "금융업", "건설업", "기타"]
+            industry = st.selectbox("산업군", options=industries, index=0 if not st.session_state.company_data.get('industry') else industries.index(st.session_state.company_data.get('industry')))
+        
+        st.subheader("재무 데이터 입력")
+        
+        # 샘플 데이터 생성 또는 기존 데이터 불러오기
+        if not isinstance(st.session_state.company_data.get('financial_data'), pd.DataFrame) or st.session_state.company_data.get('financial_data').empty:
+            years = [datetime.now().year - i for i in range(1, 6)]
+            sample_data = {
+                '연도': years,
+                '매출액': [0] * 5,
+                '영업이익': [0] * 5,
+                '당기순이익': [0] * 5,
+                '총자산': [0] * 5,
+                '총부채': [0] * 5,
+                '자본': [0] * 5
+            }
+            financial_data = pd.DataFrame(sample_data)
+        else:
+            financial_data = st.session_state.company_data.get('financial_data')
+        
+        # 편집 가능한 데이터프레임 (현재 페이지의 행만 표시, 페이지 이동은 폼 아래에서)
+        page_size = st.session_state.get('financial_page_size', PAGE_SIZES[0])
+        pages = page_count(len(financial_data), page_size)
+        if st.session_state.get('financial_page', 1) > pages:
+            st.session_state.financial_page = pages
+        start, end = page_bounds(len(financial_data), st.session_state.get('financial_page', 1), page_size)
+        window = financial_data.iloc[start:end]
+        edited_window = st.data_editor(window, use_container_width=True)
+        
+        submit_button = st.form_submit_button("저장")
+        
+        if submit_button:
+            # 데이터 유효성 검사
+            if not company_name:
+                st.warning("회사명을 입력해주세요.")
+            else:
+                # 데이터 저장 (재무 데이터는 저장 시점에 표준화)
+                try:
+                    # 화면의 페이지에서 바뀐 셀만 전체 재무 데이터에 반영하고, 표준화에 성공한 뒤에 기업 정보를 한 번에 교체
+                    previous = st.session_state.company_data.get('normalized')
+                    edited_df = apply_cell_edits(financial_data, start, edited_cells(window, edited_window))
+                    company_data = {
+                        'name': company_name,
+                        'industry': industry,
+                        'business_number': business_number
+                    }
+                    normalized = store_financial_data(edited_df, company_data)
+                    st.session_state.company_data = company_data
+                    update = refresh_valuation_results(previous, normalized)
+                    st.success("기업 정보가 저장되었습니다!")
+                    for imputation in normalized['imputations']:
+                        st.info(f"누락 데이터 보정: {imputation['규칙']} ({imputation['행 수']}개 행)")
+                    show_recalculation(update)
+                except ValueError as e:
+                    st.error(f"재무 데이터 오류: {e}")
+    
+    # 재무 데이터 페이지 이동 (행이 많은 분기·월별 데이터)
+    if len(financial_data) > PAGE_SIZES[0]:
+        col1, col2, col3 = st.columns([1, 1, 2])
+        with col1:
+            st.number_input("페이지", min_value=1, max_value=pages, step=1, key='financial_page')
+        with col2:
+            st.selectbox("페이지당 행 수", options=PAGE_SIZES, key='financial_page_size')
+        with col3:
+            st.caption(f"전체 {len(financial_data):,}개 행 중 {start + 1:,}~{end:,}행 표시. "
+                       "페이지를 이동하기 전에 수정한 내용을 저장하세요.")
+    
+    # 데이터 업로드/다운로드 기능
+    st.divider()
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("데이터 업로드")
+        uploaded_file = st.file_uploader("CSV 파일 업로드", type=["csv"])
+        
+        if uploaded_file is not None:
+            try:
+                df = canonical_frame(pd.read_csv(uploaded_file))
+                st.dataframe(df.head())
+                if st.button("이 데이터로 사용하기"):
+                    previous = st.session_state.company_data.get('normalized')
+                    refresh_valuation_results(previous, store_financial_data(df))
+                    st.success("데이터가 성공적으로 로드되었습니다!")
+                    st.rerun()
+            except Exception as e:
+                st.error(f"파일 로딩 중 오류 발생: {e}")
+    
+    with col2:
+        st.subheader("데이터 다운로드")
+        financial_data = st.session_state.company_data.get('financial_data')
+        if isinstance(financial_data, pd.DataFrame) and not financial_data.empty:
+            csv = financial_data.to_csv(index=False)
+            st.download_button(
+                label="CSV로 다운로드",
+                data=csv,
+                file_name=f"{st.session_state.company_data.get('name', 'company')}_financial_data.csv",
+                mime='text/csv'
+            )
+
+# 초과이익법 페이지
+def excess_earnings_page():
+    st.title("초과이익법 평가")
+    
+    # 기업 데이터 확인
+    if st.session_state.company_data.get('name') == '':
+        st.warning("기업 정보가 입력되지 않았습니다. 먼저 기업 정보를 입력해주세요.")
+        if st.button("기업 정보 입력으로 이동"):
+            go_to('company_info')
+        return
+    
+    st.subheader(f"{st.session_state.company_data.get('name')} - 초과이익법 평가")
+    
+    # 초과이익법 설명 (숨김 기능)
+    with st.expander("초과이익법 설명", expanded=False):
+        st.markdown("""
+        ## 초과이익법 개요
+        
+        초과이익법은 기업의 자산이 정상적으로 얻을 수 있는 이익을 초과하여 발생하는 이익을 기준으로 영업권을 평가하는 방법입니다.
+        
+        ### 주요 단계:
+        1. 평가 대상 기업의 평균 이익 산출
+        2. 기업 자산의 정상 수익률 결정
+        3. 정상이익 계산 (자산 × 정상 수익률)
+        4. 초과이익 계산 (평균이익 - 정상이익)
+        5. 초과이익의 현재가치 합계 산출
+        
+        ### 고려사항:
+        - 정상 수익률의 적정성
+        - 초과이익 인정 기간의 설정
+        - 업종별 특성 반영
+        """)
+    
+    # 초과이익법 파라미터 설정
+    with st.form("excess_earnings_params"):
+        st.subheader("평가 매개변수 설정")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            normal_roi = st.number_input("정상 자본수익률 (%)", min_value=0.0, max_value=100.0, value=10.0, step=0.5)
+            excess_years = st.number_input("초과이익 인정연수", min_value=1, max_value=10, value=5)
+        
+        with col2:
+            discount_rate = st.slider("할인율 (%)", min_value=5.0, max_value=30.0, value=12.0, step=0.5)
+            weight_recent = st.checkbox("최근 연도에 가중치 부여", value=True)
+            recent_scheme = st.selectbox("가중 방식", [EARNINGS_SCHEMES[scheme] for scheme in RECENT_WEIGHTED_SCHEMES])
+        
+        # 고급 설정
+        with st.expander("고급 설정"):
+            adjustment_factor = st.slider("조정 계수", min_value=0.5, max_value=1.5, value=1.0, step=0.1)
+            industry_premium = st.number_input("산업 프리미엄 (%)", min_value=0.0, max_value=10.0, value=2.0, step=0.5)
+            unweighted_schemes = [scheme for scheme in EARNINGS_SCHEMES if scheme not in RECENT_WEIGHTED_SCHEMES]
+            unweighted_scheme = st.selectbox("평균 방식 (가중치 미부여 시)", [EARNINGS_SCHEMES[scheme] for scheme in unweighted_schemes])
+        
+        # 평균 이익 산출 방식 (가중치 부여 여부에 따라 선택)
+        scheme_label = recent_scheme if weight_recent else unweighted_scheme
+        earnings_scheme = [scheme for scheme, label in EARNINGS_SCHEMES.items() if label == scheme_label][0]
+        
+        calculate_button = st.form_submit_button("평가 계산")
+        
+        if calculate_button:
+            try:
+                # 표준화된 재무 데이터 (평균 당기순이익, 최신 연도 총자산)
+                result = excess_earnings_result(get_normalized_financials(), {
+                    'normal_roi': normal_roi,
+                    'excess_years': excess_years,
+                    'discount_rate': discount_rate,
+                    'adjustment_factor': adjustment_factor,
+                    'industry_premium': industry_premium,
+                    'earnings_scheme': earnings_scheme
+                })
+                
+                if result['trace']['scalars']['excess_profit'] <= 0:
+                    st.error("초과이익이 계산되지 않습니다. 평균 이익이 정상 이익보다 낮습니다.")
+                    return
+                
+                # 결과 저장
+                st.session_state.valuation_results['excess_earnings'] = result
+                
+                st.success("초과이익법 평가가 완료되었습니다!")
+                
+            except Exception as e:
+                st.error(f"계산 중 오류가 발생했습니다: {e}")
+    
+    # 계산 결과 표시 (이미 계산된 경우)
+    if 'excess_earnings' in st.session_state.valuation_results:
+        result = st.session_state.valuation_results['excess_earnings']
+        trace = result['trace']['scalars']
+        
+        st.divider()
+        st.subheader("평가 결과")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("영업권 평가액", f"{result['value']:,.0f}원")
+            
+            st.subheader("주요 매개변수")
+            params_df = pd.DataFrame({
+                '매개변수': ['정상 자본수익률', '초과이익 인정연수', '할인율', '조정 계수', '산업 프리미엄', '평균 이익 산출 방식'],
+                '값': [
+                    f"{result['parameters']['normal_roi']}%",
+                    f"{result['parameters']['excess_years']}년",
+                    f"{result['parameters']['discount_rate']}%",
+                    f"{result['parameters']['adjustment_factor']}",
+                    f"{result['parameters']['industry_premium']}%",
+                    EARNINGS_SCHEMES[result['parameters'].get('earnings_scheme', 'mean')]
+                ]
+            })
+            st.dataframe(params_df, hide_index=True)
+        
+        with col2:
+            # 계산 과정 표시
+            with st.expander("상세 계산 과정", expanded=True):
+                st.markdown(f"""
+                #### 1. 기초 데이터
+                - 평균 당기순이익 ({EARNINGS_SCHEMES[result['parameters'].get('earnings_scheme', 'mean')]}): {trace['avg_earnings']:,.0f}원
+                - 총자산: {trace['total_assets']:,.0f}원
+                
+                #### 2. 정상이익 계산
+                - 정상이익 = 총자산 × 정상수익률
+                - 정상이익 = {trace['total_assets']:,.0f} × {result['parameters']['normal_roi']}% = {trace['normal_profit']:,.0f}원
+                
+                #### 3. 초과이익 계산
+                - 초과이익 = 평균이익 - 정상이익
+                - 초과이익 = {trace['avg_earnings']:,.0f} - {trace['normal_profit']:,.0f} = {trace['excess_profit']:,.0f}원
+                
+                #### 4. 현재가치 계산
+                - {result['parameters']['excess_years']}년 동안 초과이익의 현재가치 합계: {trace['present_value_sum']:,.0f}원
+                - 할인율: {result['parameters']['discount_rate']}%
+                
+                #### 5. 조정
+                - 조정 계수: {result['parameters']['adjustment_factor']}
+                - 산업 프리미엄: {result['parameters']['industry_premium']}%
+                - {trace['present_value_sum']:,.0f} × {trace['adjustment']:.4f} = {result['value']:,.0f}원
+                
+                #### 최종 영업권 가치
+                - **{result['value']:,.0f}원**
+                """)
+            
+            # 연차별 초과이익의 현재가치 (계산 내역의 할인 일정)
+            schedule = result['trace']['tables']['schedule']
+            fig = px.bar(
+                x=schedule['period'],
+                y=schedule['present_value'],
+                labels={'x': '연도', 'y': '현재가치'},
+                title='연도별 초과이익의 현재가치'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            
+            show_imputations(result)
+        
+        # 평균 이익 산출 방식별 비교 (같은 매개변수로 모든 방식을 한 번에 계산)
+        with st.expander("평균 이익 산출 방식별 비교", expanded=False):
+            params = result['parameters']
+            earnings = normalized_earnings(get_normalized_financials())
+            scheme_earnings = np.array([earnings[scheme][0] for scheme in EARNINGS_SCHEMES])
+            comparison = engine.excess_earnings_value(
+                scheme_earnings, trace['total_assets'], params['normal_roi'], params['excess_years'],
+                params['discount_rate'], params['adjustment_factor'], params['industry_premium']
+            )
+            applied = params.get('earnings_scheme', 'mean')
+            st.dataframe(pd.DataFrame({
+                '산출 방식': [label + (" (적용)" if scheme == applied else "") for scheme, label in EARNINGS_SCHEMES.items()],
+                '평균 당기순이익(원)': [f"{value:,.0f}" for value in scheme_earnings],
+                '초과이익(원)': [f"{value:,.0f}" for value in comparison['excess_profit']],
+                '영업권 가치(원)': [f"{value:,.0f}" if excess > 0 else "평가 불가" for value, excess in zip(comparison['value'], comparison['excess_profit'])]
+            }), hide_index=True, use_container_width=True)
+        
+        # 결과 페이지로 이동 버튼
+        if st.button("종합 결과 페이지로 이동"):
+            go_to('results')
+
+# 할인율 산정 (유사기업 베타 → CAPM 자기자본비용 → WACC, 입력을 바꾸면 이 영역만 다시 실행)
+# 적용 버튼은 DCF 매개변수 입력값을 바꾸므로 페이지 전체를 다시 실행
+@st.fragment
+def discount_rate_section():
+    with st.expander("할인율 산정 (CAPM/WACC)", expanded=False):
+        st.caption("유사기업 가격 파일(날짜, 기업별 종가)과 시장지수 파일(날짜, 지수)로 베타를 추정하여 WACC를 계산합니다.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            peer_file = st.file_uploader("유사기업 가격 CSV", type=["csv"], key="capm_peer_file")
+        with col2:
+            index_file = st.file_uploader("시장지수 CSV", type=["csv"], key="capm_index_file")
+        with col3:
+            leverage_file = st.file_uploader("유사기업 자본구조 CSV (선택)", type=["csv"], key="capm_leverage_file")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            value_type = st.radio("파일 값 형식", ["가격", "수익률"], horizontal=True, key="capm_value_type")
+            min_observations = st.number_input("최소 관측치 수", min_value=3, max_value=1000, value=24, key="capm_min_observations")
+        with col2:
+            risk_free_rate = st.number_input("무위험이자율 (%)", min_value=0.0, max_value=20.0, value=3.5, step=0.1, key="capm_risk_free")
+            market_risk_premium = st.number_input("시장위험프리미엄 (%)", min_value=0.0, max_value=20.0, value=6.0, step=0.1, key="capm_mrp")
+        with col3:
+            cost_of_debt = st.number_input("타인자본비용 (%)", min_value=0.0, max_value=30.0, value=5.0, step=0.1, key="capm_cost_of_debt")
+            capm_tax_rate = st.number_input("법인세율 (%)", min_value=0.0, max_value=30.0, value=22.0, step=0.5, key="capm_tax_rate")
+        specific_premium = st.number_input("기업 고유 위험 프리미엄 (%)", min_value=0.0, max_value=10.0, value=0.0, step=0.5,
+                                           key="capm_specific_premium")
+        
+        if peer_file is not None and index_file is not None:
+            try:
+                betas = peer_betas(peer_file.getvalue(), index_file.getvalue(), value_type == "가격", int(min_observations))
+                debt_to_equity, leverage_imputed = subject_debt_to_equity(get_normalized_financials())
+                wacc = build_wacc(
+                    betas,
+                    float(debt_to_equity[0]),
+                    risk_free_rate,
+                    market_risk_premium,
+                    cost_of_debt,
+                    capm_tax_rate,
+                    read_peer_leverage(leverage_file.getvalue()) if leverage_file is not None else None
+                )
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("유사기업 무부채 베타(중앙값)", f"{wacc['unlevered_beta']:.3f}", help=f"유사기업 {wacc['peer_count']:,}개")
+                with col2:
+                    st.metric("재조정 베타", f"{wacc['levered_beta']:.3f}", help=f"평가 대상 부채비율(D/E) {wacc['debt_to_equity']:.2f}")
+                with col3:
+                    st.metric("자기자본비용", f"{wacc['cost_of_equity']:.2f}%")
+                with col4:
+                    st.metric("WACC", f"{wacc['wacc']:.2f}%")
+                
+                st.dataframe(wacc['peers'], hide_index=True, use_container_width=True)
+                if wacc['unknown_leverage']:
+                    st.warning(f"자본구조 파일에 부채비율이 없는 유사기업 {len(wacc['unknown_leverage']):,}개는 "
+                               f"무부채 베타 중앙값에서 제외했습니다: {', '.join(wacc['unknown_leverage'][:10])}")
+                
+                # 할인율 입력 범위를 벗어난 WACC는 범위 안으로 조정하여 적용
+                low, high = engine.PARAMETER_RANGES['dcf']['discount_rate']
+                discount_rate = float(np.clip(round(wacc['wacc'], 2), low, high))
+                if discount_rate != round(wacc['wacc'], 2):
+                    st.caption(f"WACC {wacc['wacc']:.2f}%는 할인율 입력 범위({low:.0f}~{high:.0f}%)를 벗어나 "
+                               f"{discount_rate:.2f}%로 적용됩니다.")
+                if leverage_imputed[0]:
+                    st.warning(f"평가 대상의 최신 연도 총부채 또는 자본이 입력되지 않아 보정값(총자산의 40%/60%)으로 "
+                               f"부채비율(D/E) {wacc['debt_to_equity']:.2f}를 계산했습니다. "
+                               "재조정 베타와 WACC가 이 가정에 따라 달라지므로 실제 자본구조를 입력하는 것이 좋습니다.")
+                
+                if st.button("WACC를 할인율로 적용", key="apply_wacc"):
+                    st.session_state.dcf_discount_rate = discount_rate
+                    st.session_state.dcf_risk_premium = float(specific_premium)
+                    st.session_state.dcf_wacc = wacc
+                    st.rerun()
+            except Exception as e:
+                st.error(f"할인율 산정 중 오류가 발생했습니다: {e}")
+        
+        if st.session_state.get('dcf_wacc') is not None:
+            applied = st.session_state.dcf_wacc
+            clipped = (f", 입력 범위로 조정하여 {st.session_state.dcf_discount_rate:.2f}%"
+                       if st.session_state.dcf_discount_rate != round(applied['wacc'], 2) else "")
+            st.caption(f"적용된 할인율: WACC {applied['wacc']:.2f}% (재조정 베타 {applied['levered_beta']:.3f}, "
+                       f"유사기업 {applied['peer_count']:,}개{clipped}) + 기업 고유 위험 프리미엄 {st.session_state.dcf_risk_premium:.1f}%")
+
+# 과거 실적 기반 성장률 추정 (영업이익·매출액)
+@st.fragment
+def growth_estimate_section():
+    with st.expander("과거 실적 기반 성장률 추정", expanded=False):
+        estimates = growth_table(get_normalized_financials()).drop(columns='회사명')
+        st.dataframe(estimates, hide_index=True, use_container_width=True)
+        st.caption("보정된 값과 0 이하의 값은 제외됩니다. 결정계수·표준오차는 로그선형 회귀, 사분위 범위는 전년 대비 성장률의 적합 진단입니다.")
+        
+        suggestions = estimates.dropna(subset=['성장률(%)'])
+        if suggestions.empty:
+            st.info("성장률을 추정하려면 양수인 영업이익 또는 매출액이 2개 연도 이상 필요합니다.")
+        else:
+            suggestion_labels = [f"{row['항목']} - {row['추정 방법']} ({row['성장률(%)']:.2f}%)" for _, row in suggestions.iterrows()]
+            suggestion = st.selectbox("적용할 추정치", suggestion_labels, key="growth_suggestion")
+            
+            # 성장률 입력 범위를 벗어난 추정치(음수 성장 포함)는 범위 안으로 조정하여 적용
+            growth = float(suggestions['성장률(%)'].iloc[suggestion_labels.index(suggestion)])
+            low, high = engine.PARAMETER_RANGES['dcf']['growth_rate']
+            growth_rate = float(np.clip(round(growth, 2), low, high))
+            if growth_rate != round(growth, 2):
+                st.warning(f"추정 성장률 {growth:.2f}%는 성장률 입력 범위({low:.0f}~{high:.0f}%)를 벗어나 "
+                           f"{growth_rate:.2f}%로 적용됩니다.")
+            
+            if st.button("성장률에 적용", key="apply_growth"):
+                st.session_state.dcf_growth_rate = growth_rate
+                st.session_state.dcf_growth_estimate = growth
+                st.rerun()
+        
+        if st.session_state.get('dcf_growth_estimate') is not None:
+            estimate = st.session_state.dcf_growth_estimate
+            clipped = (f" (입력 범위로 조정하여 {st.session_state.dcf_growth_rate:.2f}%)"
+                       if st.session_state.dcf_growth_rate != round(estimate, 2) else "")
+            st.caption(f"적용된 성장률: 추정치 {estimate:.2f}%{clipped}")
+
+# 현금흐름할인법 페이지 (간소화된 버전)
+def dcf_page():
+    st.title("현금흐름할인법(DCF) 평가")
+    
+    # 기업 데이터 확인
+    if st.session_state.company_data.get('name') == '':
+        st.warning("기업 정보가 입력되지 않았습니다. 먼저 기업 정보를 입력해주세요.")
+        if st.button("기업 정보 입력으로 이동"):
+            go_to('company_info')
+        return
+    
+    st.subheader(f"{st.session_state.company_data.get('name')} - 현금흐름할인법 평가")
+    
+    discount_rate_section()
+    growth_estimate_section()
+    
+    # DCF 파라미터 설정
+    with st.form("dcf_params"):
+        st.subheader("평가 매개변수 설정")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            growth_rate = st.slider("영업이익 성장률 (%)", min_value=0.0, max_value=30.0,
+                                    value=st.session_state.get('dcf_growth_rate', 5.0), step=0.5)
+            forecast_years = st.number_input("예측 기간 (년)", min_value=1, max_value=10, value=5)
+        
+        with col2:
+            discount_rate = st.slider("할인율 (%)", min_value=5.0, max_value=30.0,
+                                      value=st.session_state.get('dcf_discount_rate', 15.0), step=0.5)
+            terminal_growth = st.slider("영구 성장률 (%)", min_value=0.0, max_value=5.0, value=1.0, step=0.1)
+        
+        # 고급 설정
+        with st.expander("고급 설정"):
+            risk_premium = st.slider("위험 프리미엄 (%)", min_value=0.0, max_value=10.0,
+                                     value=st.session_state.get('dcf_risk_premium', 3.0), step=0.5)
+            tax_rate = st.slider("법인세율 (%)", min_value=0.0, max_value=30.0, value=22.0, step=0.5)
+        
+        calculate_button = st.form_submit_button("평가 계산")
+        
+        if calculate_button:
+            try:
+                # 표준화된 재무 데이터 (최신 연도 영업이익, 순자산)로 미래 현금흐름 예측,
+                # 현재가치, 잔존가치 및 영업권 (= 기업가치 - 순자산) 계산 후 결과 저장
+                st.session_state.valuation_results['dcf'] = dcf_result(get_normalized_financials(), {
+                    'growth_rate': growth_rate,
+                    'forecast_years': forecast_years,
+                    'discount_rate': discount_rate,
+                    'terminal_growth': terminal_growth,
+                    'risk_premium': risk_premium,
+                    'tax_rate': tax_rate
+                })
+                
+                st.success("현금흐름할인법 평가가 완료되었습니다!")
+                
+            except Exception as e:
+                st.error(f"계산 중 오류가 발생했습니다: {e}")
+    
+    # 계산 결과 표시 (이미 계산된 경우)
+    if 'dcf' in st.session_state.valuation_results:
+        result = st.session_state.valuation_results['dcf']
+        
+        st.divider()
+        st.subheader("평가 결과")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("영업권 평가액", f"{result['value']:,.0f}원")
+            
+            st.subheader("주요 매개변수")
+            params_df = pd.DataFrame({
+                '매개변수': ['영업이익 성장률', '예측 기간', '할인율', '영구 성장률', '위험 프리미엄', '법인세율'],
+                '값': [
+                    f"{result['parameters']['growth_rate']}%",
+                    f"{result['parameters']['forecast_years']}년",
+                    f"{result['parameters']['discount_rate']}%",
+                    f"{result['parameters']['terminal_growth']}%",
+                    f"{result['parameters']['risk_premium']}%",
+                    f"{result['parameters']['tax_rate']}%"
+                ]
+            })
+            st.dataframe(params_df, hide_index=True)
+        
+        with col2:
+            trace = result['trace']['scalars']
+            
+            # 계산 과정 표시
+            with st.expander("상세 계산 과정", expanded=True):
+                st.markdown(f"""
+                #### 1. 기초 데이터
+                - 기준 영업이익: {trace['base_operating_profit']:,.0f}원
+                
+                #### 2. 미래 현금흐름 예측
+                - 영업이익 성장률: {result['parameters']['growth_rate']}%
+                - 예측 기간: {result['parameters']['forecast_years']}년
+                - 법인세율: {result['parameters']['tax_rate']}%
+                
+                #### 3. 현재가치 계산
+                - 할인율: {result['parameters']['discount_rate']}% + 위험 프리미엄 {result['parameters']['risk_premium']}% = {trace['rate']}%
+                
+                #### 4. 잔존가치 계산
+                - 영구 성장률: {result['parameters']['terminal_growth']}%
+                - 잔존가치: {trace['terminal_value']:,.0f}원
+                - 잔존가치의 현재가치: {trace['terminal_value_pv']:,.0f}원
+                
+                #### 5. 총 현재가치
+                - 미래 현금흐름의 현재가치 합산: {trace['present_value_sum']:,.0f}원
+                - 잔존가치의 현재가치: {trace['terminal_value_pv']:,.0f}원
+                - 총 현재가치: {trace['total_present_value']:,.0f}원
+                
+                #### 6. 순자산가치 차감
+                - 순자산가치: {'미입력 (총 현재가치의 60%를 영업권으로 가정)' if np.isnan(trace['net_asset_value']) else f"{trace['net_asset_value']:,.0f}원"}
+                
+                #### 최종 영업권 가치
+                - **{result['value']:,.0f}원**
+                """)
+            
+            # 현금흐름 및 현재가치 데이터프레임 (계산 내역의 할인 일정)
+            schedule = result['trace']['tables']['schedule']
+            df_chart = pd.DataFrame({
+                '연도': [f'{period}년차' for period in schedule['period']],
+                '미래 현금흐름': schedule['cash_flow'],
+                '현재가치': schedule['present_value']
+            })
+            
+            # 차트
+            fig = px.bar(
+                df_chart,
+                x='연도',
+                y=['미래 현금흐름', '현재가치'],
+                barmode='group',
+                title='연도별 현금흐름과 현재가치 비교'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            
+            show_imputations(result)
+        
+        # 결과 페이지로 이동 버튼
+        if st.button("종합 결과 페이지로 이동"):
+            go_to('results')
+    else:
+        with st.expander("현금흐름할인법 설명", expanded=False):
+            st.markdown("""
+            ## 현금흐름할인법(DCF) 개요
+            
+            현금흐름할인법은 기업이 미래에 창출할 것으로 예상되는 현금흐름을 추정하고, 이를 적절한 할인율로 할인하여 현재가치를 산출하는 방법입니다.
+            
+            ### 주요 단계:
+            1. 향후 5~10년간의 영업이익 예측
+            2. 세금 등 조정 후 순현금흐름 계산
+            3. 적절한 할인율 적용하여 현재가치 계산
+            4. 영구가치(Terminal Value) 계산 및 할인
+            5. 모든 현재가치의 합산
+            
+            ### 고려사항:
+            - 성장률 가정의 현실성
+            - 할인율 설정의 적정성
+            - 영구가치 산정 방식
+            """)
+
+# 시장가치비교법 페이지 (간소화된 버전)
+def market_comparison_page():
+    st.title("시장가치비교법 평가")
+    
+    # 기업 데이터 확인
+    if st.session_state.company_data.get('name') == '':
+        st.warning("기업 정보가 입력되지 않았습니다. 먼저 기업 정보를 입력해주세요.")
+        if st.button("기업 정보 입력으로 이동"):
+            go_to('company_info')
+        return
+    
+    st.subheader(f"{st.session_state.company_data.get('name')} - 시장가치비교법 평가")
+    
+    # 시장가치비교법 파라미터 설정
+    with st.form("market_comparison_params"):
+        st.subheader("평가 매개변수 설정")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            multiple_type = st.selectbox(
+                "적용 배수 유형", 
+                engine.MULTIPLE_TYPES,
+                index=0
+            )
+            
+            industry = st.session_state.company_data.get('industry')
+            industry_multiple = get_industry_multiple(industry, multiple_type)
+            
+            custom_multiple = st.number_input(
+                "배수 직접 입력", 
+                min_value=0.1, 
+                max_value=50.0, 
+                value=industry_multiple,
+                step=0.1
+            )
+        
+        with col2:
+            comparable_companies = st.multiselect(
+                "비교 기업 선택", 
+                ["업종 평균", "대기업 평균", "중소기업 평균", "산업 상위 25% 기업", "최근 M&A 사례"],
+                default=["업종 평균"]
+            )
+            
+            adjustment_factor = st.slider(
+                "조정 계수", 
+                min_value=0.5, 
+                max_value=1.5, 
+                value=1.0, 
+                step=0.1,
+                help="기업 특성을 고려한 조정 계수 (1.0 = 조정 없음)"
+            )
+        
+        # 고급 설정
+        with st.expander("고급 설정"):
+            premium_discount = st.slider(
+                "프리미엄/할인율 (%)", 
+                min_value=-30.0, 
+                max_value=30.0, 
+                value=0.0, 
+                step=5.0,
+                help="기업의 성장성, 리스크, 규모 등을 고려한 프리미엄 또는 할인율"
+            )
+            
+            liquidity_discount = st.slider(
+                "유동성 할인율 (%)", 
+                min_value=0.0, 
+                max_value=30.0, 
+                value=10.0, 
+                step=5.0,
+                help="비상장사의 경우 적용되는 유동성 할인율"
+            )
+        
+        calculate_button = st.form_submit_button("평가 계산")
+        
+        if calculate_button:
+            try:
+                # 표준화된 재무 데이터의 배수 적용 기준 값 및 순자산가치 (최신 연도)로
+                # 기업 가치 (배수, 조정 계수, 프리미엄/할인율, 유동성 할인율 적용) 및 영업권 계산 후 결과 저장
+                st.session_state.valuation_results['market_comparison'] = market_comparison_result(get_normalized_financials(), {
+                    'multiple_type': multiple_type,
+                    'custom_multiple': custom_multiple,
+                    'comparable_companies': comparable_companies,
+                    'adjustment_factor': adjustment_factor,
+                    'premium_discount': premium_discount,
+                    'liquidity_discount': liquidity_discount
+                })
+                
+                st.success("시장가치비교법 평가가 완료되었습니다!")
+                
+            except Exception as e:
+                st.error(f"계산 중 오류가 발생했습니다: {e}")
+    
+    # 계산 결과 표시 (이미 계산된 경우)
+    if 'market_comparison' in st.session_state.valuation_results:
+        result = st.session_state.valuation_results['market_comparison']
+        
+        st.divider()
+        st.subheader("평가 결과")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("영업권 평가액", f"{result['value']:,.0f}원")
+            
+            st.subheader("주요 매개변수")
+            params_df = pd.DataFrame({
+                '매개변수': ['적용 배수 유형', '적용 배수', '조정 계수', '프리미엄/할인율', '유동성 할인율'],
+                '값': [
+                    f"{result['parameters']['multiple_type']}",
+                    f"{result['parameters']['custom_multiple']:.1f}",
+                    f"{result['parameters']['adjustment_factor']:.1f}",
+                    f"{result['parameters']['premium_discount']}%",
+                    f"{result['parameters']['liquidity_discount']}%"
+                ]
+            })
+            st.dataframe(params_df, hide_index=True)
+            
+            # 비교 기업 목록
+            st.subheader("비교 기업")
+            st.write(", ".join(result['parameters']['comparable_companies']))
+        
+        with col2:
+            trace = result['trace']['scalars']
+            
+            # 계산 과정 표시
+            with st.expander("상세 계산 과정", expanded=True):
+                st.markdown(f"""
+                #### 1. 기초 데이터
+                - 적용 배수 유형: {result['parameters']['multiple_type']}
+                - 기준 값: {trace['base_value']:,.0f}원
+                - 적용 배수: {trace['multiple']:.1f}
+                
+                #### 2. 기업 가치 계산
+                - 기준 값 × 적용 배수 = {trace['base_value']:,.0f} × {trace['multiple']:.1f} = {trace['multiplied_value']:,.0f}원
+                
+                #### 3. 조정 계수 적용
+                - 조정 계수: {result['parameters']['adjustment_factor']:.1f}
+                - 조정 후 기업가치: {trace['multiplied_value']:,.0f} × {result['parameters']['adjustment_factor']:.1f} = {trace['adjusted_value']:,.0f}원
+                
+                #### 4. 프리미엄/할인율 적용
+                - 프리미엄/할인율: {result['parameters']['premium_discount']}% → {trace['premium_value']:,.0f}원
+                - 유동성 할인 적용 후 기업가치: {trace['enterprise_value']:,.0f}원
+                
+                #### 5. 순자산가치 차감
+                - 순자산가치: {trace['net_asset_value']:,.0f}원
+                - 영업권 = 기업가치 - 순자산가치 = {trace['enterprise_value']:,.0f} - {trace['net_asset_value']:,.0f} = {result['value']:,.0f}원
+                
+                #### 최종 영업권 가치
+                - **{result['value']:,.0f}원**
+                """)
+            
+            # 시각화 - 영업권 구성 파이 차트
+            labels = ['순자산가치', '영업권']
+            values = [trace['net_asset_value'], result['value']]
+            
+            fig = px.pie(
+                values=values,
+                names=labels,
+                title='기업 총가치 구성',
+                color_discrete_sequence=['#636EFA', '#EF553B']
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            
+            show_imputations(result)
+        
+        # 결과 페이지로 이동 버튼
+        if st.button("종합 결과 페이지로 이동"):
+            go_to('results')
+    else:
+        with st.expander("시장가치비교법 설명", expanded=False):
+            st.markdown("""
+            ## 시장가치비교법 개요
+            
+            시장가치비교법은 유사한 기업의 주가 배수(P/E, EV/EBITDA 등)를 사용하여 기업의 가치를 평가하는 방법입니다.
+            
+            ### 주요 단계:
+            1. 적절한 배수 지표 선택 (P/E, EV/EBITDA, P/S, P/B 등)
+            2. 비교 가능한 기업 또는 업종 평균 배수 확인
+            3. 대상 기업의 재무지표에 해당 배수를 적용
+            4. 기업 특성에 맞는 프리미엄/할인 적용
+            5. 순자산가치를 차감하여 영업권 계산
+            
+            ### 고려사항:
+            - 비교 기업의 적절성
+            - 배수 적용의 타당성
+            - 기업 간 규모/성장성 차이 반영
+            """)
+
+# 상증법 보충적 평가 페이지
+def statutory_page():
+    st.title("상증법 보충적 평가")
+    
+    # 기업 데이터 확인
+    if st.session_state.company_data.get('name') == '':
+        st.warning("기업 정보가 입력되지 않았습니다. 먼저 기업 정보를 입력해주세요.")
+        if st.button("기업 정보 입력으로 이동"):
+            go_to('company_info')
+        return
+    
+    st.subheader(f"{st.session_state.company_data.get('name')} - 상증법 보충적 평가")
+    
+    with st.expander("상증법 보충적 평가 설명", expanded=False):
+        st.markdown("""
+        ## 상증법 보충적 평가 개요
+        
+        상속세 및 증여세법 시행령 제59조 제2항에 따른 영업권 평가 방법으로, 법인전환 및 상속·증여 신고에 사용됩니다.
+        
+        ### 계산식:
+        영업권 = Σ [(최근 3년 가중평균 순손익액 × 50% - 자기자본 × 10%) / (1 + 10%)ⁿ], n = 1 ~ 5
+        
+        ### 주요 단계:
+        1. 최근 3개 사업연도 순손익액을 3:2:1로 가중평균
+        2. 가중평균 순손익액의 50%에서 자기자본이익(자기자본 × 10%)을 차감하여 초과이익 산출
+        3. 초과이익을 5년간 10%로 환원하여 현재가치 합계 산출
+        4. 초과이익이 0 이하이면 영업권은 0원
+        
+        ### 고려사항:
+        - 자기자본이익률과 이자율은 기획재정부령으로 정하는 율을 적용
+        - 순손익액은 세무조정 후 금액이 원칙이나, 여기서는 당기순이익을 사용
+        """)
+    
+    # 상증법 파라미터 설정
+    with st.form("statutory_params"):
+        st.subheader("평가 매개변수 설정")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            profit_ratio = st.number_input("순손익액 반영 비율 (%)", min_value=0.0, max_value=100.0, value=50.0, step=5.0)
+            equity_return_rate = st.number_input("자기자본이익률 (%)", min_value=0.0, max_value=30.0, value=10.0, step=0.5)
+        
+        with col2:
+            capitalization_years = st.number_input("환원 기간 (년)", min_value=1, max_value=10, value=5)
+            discount_rate = st.number_input("이자율 (%)", min_value=5.0, max_value=30.0, value=10.0, step=0.5)
+        
+        calculate_button = st.form_submit_button("평가 계산")
+        
+        if calculate_button:
+            try:
+                # 표준화된 재무 데이터 (최근 3년 가중평균 당기순이익, 최신 연도 자본)
+                result = statutory_result(get_normalized_financials(), {
+                    'profit_ratio': profit_ratio,
+                    'equity_return_rate': equity_return_rate,
+                    'capitalization_years': capitalization_years,
+                    'discount_rate': discount_rate
+                })
+                
+                if np.isnan(result['value']):
+                    st.error("당기순이익 또는 자본 데이터가 없어 평가할 수 없습니다.")
+                    return
+                
+                # 결과 저장
+                st.session_state.valuation_results['statutory'] = result
+                
+                if result['trace']['scalars']['excess_profit'] <= 0:
+                    st.warning("초과이익이 0 이하이므로 영업권은 0원으로 평가됩니다.")
+                else:
+                    st.success("상증법 보충적 평가가 완료되었습니다!")
+                
+            except Exception as e:
+                st.error(f"계산 중 오류가 발생했습니다: {e}")
+    
+    # 계산 결과 표시 (이미 계산된 경우)
+    if 'statutory' in st.session_state.valuation_results:
+        result = st.session_state.valuation_results['statutory']
+        trace = result['trace']['scalars']
+        history = result['trace']['tables']['history']
+        
+        st.divider()
+        st.subheader("평가 결과")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("영업권 평가액", f"{result['value']:,.0f}원")
+            
+            st.subheader("순손익액 가중평균")
+            st.dataframe(pd.DataFrame({
+                '연도': history['year'],
+                '당기순이익(원)': [f"{value:,.0f}" for value in history['earnings']],
+                '가중치': history['weight']
+            }), hide_index=True)
+        
+        with col2:
+            # 계산 과정 표시
+            with st.expander("상세 계산 과정", expanded=True):
+                st.markdown(f"""
+                #### 1. 최근 3년 가중평균 순손익액
+                - {trace['weighted_earnings']:,.0f}원
+                
+                #### 2. 초과이익 계산
+                - 순손익액 반영분 = {trace['weighted_earnings']:,.0f} × {result['parameters']['profit_ratio']}% = {trace['earnings_share']:,.0f}원
+                - 자기자본이익 = {trace['equity']:,.0f} × {result['parameters']['equity_return_rate']}% = {trace['equity_return']:,.0f}원
+                - 초과이익 = {trace['excess_profit']:,.0f}원
+                
+                #### 3. 환원
+                - {result['parameters']['capitalization_years']}년, 이자율 {result['parameters']['discount_rate']}%의 연금현가계수: {trace['annuity_factor']:.4f}
+                - 초과이익의 현재가치 합계: {trace['present_value_sum']:,.0f}원
+                
+                #### 최종 영업권 가치
+                - **{result['value']:,.0f}원**
+                """)
+        
+        # 결과 페이지로 이동 버튼
+        if st.button("종합 결과 페이지로 이동"):
+            go_to('results')
+
+# 계산 내역에 기록된 데이터 보정·가정 표시
+def show_imputations(result):
+    for imputation in result['trace']['imputations']:
+        st.caption(f"데이터 보정 ({imputation['연도']}년 {imputation['항목']}): {imputation['규칙']}")
+
+# 평가 결과에 저장된 계산 내역 표시 (주요 값, 연도·연차별 표, 데이터 보정)
+def show_trace(result):
+    scalars = trace_scalars_frame(result)
+    scalars['값'] = [f"{value:,.4f}" if abs(value) < 100 else f"{value:,.0f}" for value in scalars['값']]
+    st.dataframe(scalars, hide_index=True, use_container_width=True)
+    for title, table in trace_table_frames(result).items():
+        st.caption(title)
+        st.dataframe(table, hide_index=True, use_container_width=True)
+    show_imputations(result)
+
+# 평가 방법별 계산 내역 탭과 CSV 다운로드
+def trace_section(key):
+    results = st.session_state.valuation_results
+    tabs = st.tabs([result['method'] for result in results.values()])
+    for tab, result in zip(tabs, results.values()):
+        with tab:
+            show_trace(result)
+    
+    st.download_button(
+        label="계산 내역 CSV 다운로드",
+        data=trace_export(results).to_csv(index=False),
+        file_name=f"{st.session_state.company_data.get('name')}_계산내역.csv",
+        mime='text/csv',
+        key=key
+    )
+
+# 평가 방법별 가중치 (가중치 슬라이더 값을 합계 1로 정규화, 슬라이더가 없으면 균등 가중)
+def method_weights(methods):
+    weights = {method: st.session_state.get(f"weight_{method}", 1.0 / len(methods)) for method in methods}
+    total_weight = sum(weights.values())
+    if total_weight > 0:
+        weights = {method: weight / total_weight for method, weight in weights.items()}
+    return weights
+
+# 가중평균 영업권 가치 (가중치 슬라이더를 움직이면 이 영역만 다시 실행)
+@st.fragment
+def weighted_average_section(methods):
+    results = st.session_state.valuation_results
+    st.subheader("가중평균 영업권 가치")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        for method in methods:
+            st.slider(
+                f"{results[method]['method']} 가중치",
+                min_value=0.0,
+                max_value=1.0,
+                value=1.0/len(methods),
+                step=0.05,
+                key=f"weight_{method}"
+            )
+        
+        # 가중치 정규화 후 가중평균 계산
+        weights = method_weights(methods)
+        weighted_value = sum(results[method]['value'] * weights[method] for method in methods)
+        
+        st.metric("최종 영업권 가치", f"{weighted_value:,.0f}원")
+    
+    with col2:
+        # 가중치 파이 차트
+        fig = px.pie(
+            names=[results[method]['method'] for method in methods],
+            values=list(weights.values()),
+            title='평가 방법 가중치'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+# 단일 변수 민감도 분석 (토네이도 차트, 평가 방법·변동 범위를 바꾸면 이 영역만 다시 실행)
+@st.fragment
+def sensitivity_section(methods):
+    methods_names = [st.session_state.valuation_results[method]['method'] for method in methods]
+    
+    with st.expander("민감도 분석 (토네이도 차트)", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            sensitivity_method_name = st.selectbox("평가 방법", methods_names, key="sensitivity_method")
+            sensitivity_method = methods[methods_names.index(sensitivity_method_name)]
+        with col2:
+            sensitivity_range = st.radio(
+                "변동 범위",
+                ["입력 범위 전체", "기준값 ± 입력 범위의 10%"],
+                horizontal=True,
+                key="sensitivity_range"
+            )
+        
+        if sensitivity_method in engine.PARAMETER_RANGES:
+            base_params = st.session_state.valuation_results[sensitivity_method]['parameters']
+            inputs = engine.engine_inputs(
+                get_normalized_financials(),
+                base_params.get('multiple_type', engine.MULTIPLE_TYPES[0]),
+                earnings_scheme=base_params.get('earnings_scheme', 'mean')
+            )
+            ranking = one_at_a_time(
+                sensitivity_method,
+                inputs,
+                {name: value for name, value in base_params.items() if name in engine.PARAMETER_RANGES[sensitivity_method]},
+                relative=None if sensitivity_range == "입력 범위 전체" else 0.1
+            )
+            st.plotly_chart(tornado_figure(ranking), use_container_width=True)
+            st.dataframe(
+                ranking[['순위', '매개변수명', '하한', '상한', '하한 적용 영업권', '상한 적용 영업권', '변동폭']],
+                hide_index=True,
+                use_container_width=True
+            )
+
+# 가중평균 영업권 시뮬레이션 (평가 방법 간 상관된 매개변수, 실행 시점의 가중치 슬라이더 값 사용)
+@st.fragment
+def simulation_section(methods):
+    with st.expander("가중평균 영업권 시뮬레이션 (상관 준몬테카를로)", expanded=False):
+        simulation_weights = {method: w for method, w in method_weights(methods).items() if method in engine.PARAMETER_RANGES}
+        variables = [v for v in SIMULATION_VARIABLES if v[0] in simulation_weights]
+        variable_labels = [f"{engine.METHOD_NAMES[method]} - {engine.PARAMETER_LABELS[name]}" for method, name, _ in variables]
+        base_value = sum(st.session_state.valuation_results[method]['value'] * w for method, w in simulation_weights.items())
+        sampler_names = {'sobol': 'Sobol 수열', 'lhs': '라틴 하이퍼큐브'}
+        
+        with st.form("simulation_form"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                n_paths = st.selectbox("경로 수", [4096, 16384, 65536, 262144, 1048576], index=2)
+            with col2:
+                sampler_name = st.selectbox("표본 추출 방식", [sampler_names[sampler] for sampler in SAMPLERS])
+            with col3:
+                threshold = st.number_input("기준 영업권 (원)", value=float(base_value), step=1_000_000.0)
+            
+            st.caption("변수별 표준편차 (매개변수 단위, 예: 할인율 2.0 = ±2%p)")
+            std_df = st.data_editor(
+                pd.DataFrame({'변수': variable_labels, '표준편차': [std for _, _, std in variables]}),
+                disabled=['변수'],
+                hide_index=True,
+                use_container_width=True
+            )
+            
+            st.caption("변수 간 상관행렬")
+            default_correlation = pd.DataFrame(np.eye(len(variables)), index=variable_labels, columns=variable_labels)
+            correlation_df = st.data_editor(default_correlation, use_container_width=True)
+            
+            simulate_button = st.form_submit_button("시뮬레이션 실행")
+        
+        # 시뮬레이션은 백그라운드 프로세스에서 실행 (진행률 표시, 취소 가능)
+        if simulate_button:
+            try:
+                start_job(
+                    'simulation',
+                    'cpu',
+                    simulate_weighted_goodwill,
+                    engine.engine_inputs(
+                        get_normalized_financials(),
+                        st.session_state.valuation_results.get('market_comparison', {}).get('parameters', {}).get(
+                            'multiple_type', engine.MULTIPLE_TYPES[0]),
+                        earnings_scheme=st.session_state.valuation_results.get('excess_earnings', {}).get(
+                            'parameters', {}).get('earnings_scheme', 'mean')
+                    ),
+                    {method: st.session_state.valuation_results[method]['parameters'] for method in simulation_weights},
+                    simulation_weights,
+                    variables=[(method, name, float(std)) for (method, name, _), std in zip(variables, std_df['표준편차'])],
+                    correlation=correlation_df.to_numpy(dtype=float),
+                    n_paths=n_paths,
+                    sampler=[key for key, name in sampler_names.items() if name == sampler_name][0],
+                    thresholds=(threshold,)
+                )
+            except Exception as e:
+                st.error(f"시뮬레이션 중 오류가 발생했습니다: {e}")
+        
+        simulation = collect_job('simulation', "시뮬레이션")
+        if simulation is not None:
+            st.session_state.simulation_result = simulation
+        
+        simulation = st.session_state.get('simulation_result')
+        if simulation is not None:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("평균 영업권", f"{simulation['mean']:,.0f}원")
+            with col2:
+                st.metric("표준편차", f"{simulation['std']:,.0f}원")
+            with col3:
+                for value, probability in simulation['exceedance'].items():
+                    st.metric(f"{value:,.0f}원 초과 확률", f"{probability * 100:.1f}%")
+            
+            edges, counts = simulation['histogram']
+            fig = px.bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=counts / simulation['n_paths'],
+                labels={'x': '가중평균 영업권', 'y': '비율'},
+                title=f"가중평균 영업권 분포 ({simulation['n_paths']:,}개 경로, {sampler_names[simulation['sampler']]})"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            below, above = simulation['out_of_range']
+            if below or above:
+                st.caption(f"히스토그램 구간 밖 경로: 하한 미만 {below:,}개, 상한 초과 {above:,}개 (분포 차트에서 제외)")
+            
+            st.dataframe(
+                pd.DataFrame({
+                    '백분위': [f"{level}%" for level in simulation['percentiles']],
+                    '가중평균 영업권(원)': [f"{value:,.0f}" for value in simulation['percentiles'].values()]
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+
+# 기준연도별 재평가 및 백테스트 (산출 기간을 바꾸면 이 영역만 다시 실행)
+@st.fragment
+def backtest_section(financial_data):
+    with st.expander("기준연도별 재평가 및 백테스트", expanded=False):
+        st.caption("각 과거 연도를 평가 기준일로 보고 영업권을 다시 계산하며, 당시의 이익 추정치를 이후 실제 실적과 비교합니다.")
+        
+        window = st.number_input(
+            "평균이익 산출 기간 (년)",
+            min_value=1,
+            max_value=len(financial_data),
+            value=min(5, len(financial_data)),
+            key="backtest_window"
+        )
+        
+        # 계산된 평가 방법은 동일한 매개변수로 재평가
+        parameters = {method: result['parameters'] for method, result in st.session_state.valuation_results.items()}
+        scheme = parameters.get('excess_earnings', {}).get('earnings_scheme', 'mean')
+        st.caption(
+            f"초과이익법 평균이익은 기준연도까지 최근 {window}개 회계연도의 {EARNINGS_SCHEMES[scheme]}으로, "
+            f"상증법 순손익액은 최근 {len(STATUTORY_WEIGHTS)}개 회계연도의 {':'.join(map(str, STATUTORY_WEIGHTS))} 가중 평균으로 산출합니다."
+        )
+        history_values, forecast_errors = rolling_revaluation(
+            get_normalized_financials(),
+            window=window,
+            parameters=parameters
+        )
+        
+        history_chart = history_values.melt(id_vars='연도', var_name='평가 방법', value_name='영업권 가치')
+        history_chart['평가 방법'] = history_chart['평가 방법'].map(BACKTEST_METHOD_NAMES)
+        fig = px.line(
+            history_chart,
+            x='연도',
+            y='영업권 가치',
+            color='평가 방법',
+            markers=True,
+            title='기준연도별 영업권 가치 추이'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.subheader("예측 오차 요약")
+        if forecast_errors.empty:
+            st.info("예측값과 비교할 이후 연도의 실적 데이터가 없습니다.")
+        else:
+            st.dataframe(summarize_forecast_errors(forecast_errors), hide_index=True, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="기준연도별 평가액 CSV 다운로드",
+                data=history_values.rename(columns=BACKTEST_METHOD_NAMES).to_csv(index=False),
+                file_name=f"{st.session_state.company_data.get('name')}_기준연도별_영업권.csv",
+                mime='text/csv'
+            )
+        with col2:
+            st.download_button(
+                label="예측 오차 CSV 다운로드",
+                data=forecast_errors.to_csv(index=False),
+                file_name=f"{st.session_state.company_data.get('name')}_예측오차.csv",
+                mime='text/csv'
+            )
+
+# 종합 결과 페이지
+def results_page():
+    st.title("종합 평가 결과")
+    
+    # 결과가 없는 경우
+    if not st.session_state.valuation_results:
+        st.warning("아직 평가된 결과가 없습니다. 먼저 평가 방법을 선택하여 계산해주세요.")
+        return
+    
+    # 회사 정보 표시
+    st.subheader(f"{st.session_state.company_data.get('name')} 영업권 평가 결과")
+    st.caption(f"산업: {st.session_state.company_data.get('industry')} | 평가일: {datetime.now().strftime('%Y-%m-%d')}")
+    
+    # 결과 요약
+    methods = list(st.session_state.valuation_results.keys())
+    values = [st.session_state.valuation_results[method]['value'] for method in methods]
+    methods_names = [st.session_state.valuation_results[method]['method'] for method in methods]
+    
+    # 차트로 결과 표시
+    fig = px.bar(
+        x=methods_names,
+        y=values,
+        labels={'x': '평가 방법', 'y': '영업권 가치'},
+        title='평가 방법별 영업권 가치 비교'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # 결과 테이블
+    results_df = pd.DataFrame({
+        '평가 방법': methods_names,
+        '영업권 가치(원)': [f"{value:,.0f}" for value in values]
+    })
+    st.dataframe(results_df, hide_index=True, use_container_width=True)
+    
+    # 평가 시 저장된 계산 내역 (다시 계산하지 않음)
+    with st.expander("평가 방법별 계산 내역", expanded=False):
+        trace_section("results_trace_download")
+    
+    # 가중평균 계산 (방법이 2개 이상인 경우)
+    if len(methods) > 1:
+        weighted_average_section(methods)
+    
+    sensitivity_section(methods)
+    simulation_section(methods)
+    
+    # 기준연도별 재평가 및 백테스트 (과거 재무 데이터가 2개 연도 이상인 경우)
+    financial_data = st.session_state.company_data.get('financial_data')
+    if isinstance(financial_data, pd.DataFrame) and '연도' in financial_data.columns and len(financial_data) > 1:
+        backtest_section(financial_data)
+    
+    # 보고서 페이지로 이동
+    if st.button("보고서 생성하기"):
+        go_to('report')
+
+# 보고서 페이지 (간소화된 버전)
+def report_page():
+    st.title("평가 보고서")
+    
+    if not st.session_state.valuation_results:
+        st.warning("아직 평가된 결과가 없습니다. 먼저 평가 방법을 선택하여 계산해주세요.")
+        return
+    
+    st.info("PDF 보고서 생성 기능은 Phase 3에서 구현될 예정입니다.")
+    
+    # 간단한 미리보기
+    st.subheader("보고서 미리보기")
+    
+    # 회사 정보
+    st.markdown(f"""
+    ## 영업권 가치 평가 보고서
+    
+    **회사명**: {st.session_state.company_data.get('name')}  
+    **산업**: {st.session_state.company_data.get('industry')}  
+    **사업자등록번호**: {st.session_state.company_data.get('business_number')}  
+    **평가일**: {datetime.now().strftime('%Y-%m-%d')}
+    
+    ### 평가 결과 요약
+    """)
+    
+    # 결과 테이블
+    methods = list(st.session_state.valuation_results.keys())
+    values = [st.session_state.valuation_results[method]['value'] for method in methods]
+    methods_names = [st.session_state.valuation_results[method]['method'] for method in methods]
+    
+    results_df = pd.DataFrame({
+        '평가 방법': methods_names,
+        '영업권 가치(원)': [f"{value:,.0f}" for value in values]
+    })
+    st.dataframe(results_df, hide_index=True, use_container_width=True)
+    
+    # 차트
+    fig = px.bar(
+        x=methods_names,
+        y=values,
+        labels={'x': '평가 방법', 'y': '영업권 가치'},
+        title='평가 방법별 영업권 가치 비교'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # 평가 방법별 계산 내역
+    st.markdown("### 평가 방법별 계산 내역")
+    trace_section("report_trace_download")
+    
+    # 다운로드 버튼 (실제로는 아직 기능 없음)
+    st.download_button(
+        label="PDF 보고서 다운로드",
+        data="샘플 PDF 데이터",  # 실제로는 PDF 파일 생성 필요
+        file_name=f"{st.session_state.company_data.get('name')}_영업권평가보고서.pdf",
+        mime="application/pdf",
+        disabled=True  # Phase 3에서 활성화 예정
+    )
+
+# 취소·실패한 보고서 생성 작업이 작성하던 ZIP 파일 삭제 (아직 쓰는 중이라 지울 수 없으면 다음 실행에서 다시 시도)
+def discard_pending_report():
+    pending_archive = st.session_state.get('batch_report_pending')
+    if pending_archive and 'batch_report' not in st.session_state.jobs:
+        try:
+            if os.path.exists(pending_archive):
+                os.remove(pending_archive)
+            st.session_state.batch_report_pending = None
+        except OSError:
+            pass
+
+# 기업별 평가 보고서 일괄 생성 (형식 선택·생성은 이 영역만 다시 실행)
+# 기업 구간별로 공유 작업 실행기의 CPU 작업에서 나누어 생성한 뒤 하나의 ZIP 파일로 합치므로 동시 작업 수 제한을 따르며
+# (별도 프로세스 풀을 만들지 않음), 생성 중에도 화면을 사용할 수 있고 취소하면 작성 중인 파일은 삭제
+@st.fragment
+def batch_report_section(portfolio, batch_parameters, growth_estimator):
+    with st.expander("기업별 보고서 일괄 생성", expanded=False):
+        report_formats = st.multiselect("보고서 형식", list(REPORT_FORMATS.values()), default=["HTML"], key="batch_report_formats")
+        if st.button("보고서 ZIP 생성", key="batch_report_generate", disabled=not report_formats):
+            cancel_job('batch_report')
+            discard_pending_report()
+            with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as archive:
+                st.session_state.batch_report_pending = archive.name
+            start_job(
+                'batch_report',
+                'io',
+                write_report_archive_sharded,
+                portfolio,
+                archive.name,
+                parameters=batch_parameters,
+                growth_estimator=growth_estimator,
+                formats=[fmt for fmt, label in REPORT_FORMATS.items() if label in report_formats]
+            )
+        
+        count = collect_job('batch_report', "보고서 생성")
+        if count is not None:
+            if st.session_state.get('batch_report_archive') and os.path.exists(st.session_state.batch_report_archive):
+                os.remove(st.session_state.batch_report_archive)
+            st.session_state.batch_report_archive = st.session_state.batch_report_pending
+            st.session_state.batch_report_pending = None
+            st.success(f"{count:,}개 기업의 보고서를 생성했습니다.")
+        discard_pending_report()
+        
+        if st.session_state.get('batch_report_archive') and os.path.exists(st.session_state.batch_report_archive):
+            with open(st.session_state.batch_report_archive, 'rb') as archive:
+                st.download_button(
+                    label="보고서 ZIP 다운로드",
+                    data=archive,
+                    file_name="포트폴리오_영업권평가보고서.zip",
+                    mime='application/zip'
+                )
+
+# 일괄 민감도 분석 (평가 방법·변동 범위를 바꾸면 이 영역만 다시 실행)
+@st.fragment
+def batch_sensitivity_section(portfolio, batch_inputs, batch_parameters, growth_estimator):
+    st.subheader("일괄 민감도 분석")
+    col1, col2 = st.columns(2)
+    with col1:
+        sensitivity_method_name = st.selectbox("평가 방법", list(engine.METHOD_NAMES.values()), key="batch_sensitivity_method")
+        sensitivity_method = list(engine.METHOD_NAMES)[list(engine.METHOD_NAMES.values()).index(sensitivity_method_name)]
+    with col2:
+        sensitivity_range = st.radio(
+            "변동 범위",
+            ["입력 범위 전체", "기준값 ± 입력 범위의 10%"],
+            horizontal=True,
+            key="batch_sensitivity_range"
+        )
+    
+    # 민감도 격자는 백그라운드 프로세스에서 계산 (평가 방법·변동 범위를 바꾸면 다시 제출)
+    relative = None if sensitivity_range == "입력 범위 전체" else 0.1
+    ranking = job_result(
+        'batch_sensitivity',
+        "일괄 민감도 분석",
+        batch_inputs + (sensitivity_method, relative),
+        'cpu',
+        portfolio_sensitivity,
+        portfolio,
+        sensitivity_method,
+        batch_parameters,
+        growth_estimator,
+        relative=relative
+    )
+    if ranking is None:
+        return
+    
+    # 기업별 가장 영향이 큰 매개변수
+    top_parameters = ranking[ranking['순위'] == 1][['회사명', '매개변수명', '기준 영업권', '변동폭']]
+    st.dataframe(top_parameters, hide_index=True, use_container_width=True)
+    
+    batch_tornado_section(ranking, portfolio['company'], sensitivity_method)
+
+# 기업별 토네이도 차트 (기업을 바꾸면 민감도를 다시 계산하지 않고 차트만 다시 그림)
+@st.fragment
+def batch_tornado_section(ranking, companies, sensitivity_method):
+    selected_company = st.selectbox("토네이도 차트 기업 선택", companies, key="batch_tornado_company")
+    st.plotly_chart(
+        tornado_figure(ranking[ranking['회사명'] == selected_company], title=f"{selected_company} 매개변수별 영업권 민감도"),
+        use_container_width=True
+    )
+    
+    st.download_button(
+        label="민감도 순위 CSV 다운로드",
+        data=ranking.to_csv(index=False),
+        file_name=f"포트폴리오_민감도_{sensitivity_method}.csv",
+        mime='text/csv'
+    )
+
+# 일괄 평가 페이지 (포트폴리오)
+def batch_page():
+    st.title("포트폴리오 일괄 평가")
+    
+    with st.expander("포트폴리오 데이터 형식", expanded=False):
+        st.markdown("""
+        기업-연도별로 한 행씩 작성한 CSV 파일을 업로드합니다.
+        
+        - 필수 컬럼: 회사명, 연도, 당기순이익
+        - 선택 컬럼: 산업군, 매출액, 영업이익, 총자산, 총부채, 자본
+        
+        각 기업은 기본 매개변수로 평가되며, 재무 데이터가 없는 항목은 개별 평가 페이지와 같은 가정을 사용합니다.
+        """)
+    
+    # 업로드된 파일은 새 파일일 때만 백그라운드 스레드에서 읽음 (대용량 파일을 읽는 동안 화면이 멈추지 않도록)
+    uploaded_file = st.file_uploader("포트폴리오 CSV 파일 업로드", type=["csv"], key="portfolio_upload")
+    if uploaded_file is not None and uploaded_file.file_id != st.session_state.get('portfolio_file_id'):
+        st.session_state.portfolio_file_id = uploaded_file.file_id
+        try:
+            start_job('portfolio_upload', 'io', load_portfolio, io.BytesIO(uploaded_file.getvalue()))
+        except Exception as e:
+            st.error(f"파일 로딩 중 오류 발생: {e}")
+    
+    if 'portfolio_upload' in st.session_state.jobs:
+        loaded = collect_job('portfolio_upload', "포트폴리오 파일 읽기")
+        if loaded is not None:
+            st.session_state.portfolio = loaded
+        elif 'portfolio_upload' in st.session_state.jobs:
+            return
+    
+    portfolio = st.session_state.portfolio
+    if portfolio is None:
+        st.info("포트폴리오 데이터를 업로드해주세요.")
+        return
+    
+    st.caption(f"기업 수: {len(portfolio['company']):,}개 | 데이터 행 수: {len(portfolio['years']):,}행")
+    for imputation in portfolio['imputations']:
+        st.caption(f"누락 데이터 보정: {imputation['규칙']} ({imputation['행 수']}개 행)")
+    
+    # DCF 성장률 (입력 기본값 또는 기업별 과거 영업이익 추정 성장률)
+    growth_labels = ["입력 기본값 (5%)"] + list(GROWTH_ESTIMATORS.values())
+    growth_label = st.selectbox("DCF 영업이익 성장률", growth_labels, key="batch_growth_estimator")
+    growth_estimator = None if growth_label == growth_labels[0] else list(GROWTH_ESTIMATORS)[growth_labels.index(growth_label) - 1]
+    
+    # 초과이익법 평균 이익 산출 방식
+    earnings_label = st.selectbox("초과이익법 평균 이익 산출 방식", list(EARNINGS_SCHEMES.values()), key="batch_earnings_scheme")
+    batch_parameters = {'excess_earnings': {'earnings_scheme': list(EARNINGS_SCHEMES)[list(EARNINGS_SCHEMES.values()).index(earnings_label)]}}
+    
+    with st.expander("기업별 평균 이익 산출 방식 비교", expanded=False):
+        portfolio_earnings = earnings_table(portfolio)
+        st.dataframe(portfolio_earnings, hide_index=True, use_container_width=True)
+        st.download_button(
+            label="평균 이익 비교 CSV 다운로드",
+            data=portfolio_earnings.to_csv(index=False),
+            file_name="포트폴리오_평균이익비교.csv",
+            mime='text/csv'
+        )
+    
+    with st.expander("기업별 성장률 추정", expanded=False):
+        portfolio_growth = growth_table(portfolio)
+        st.dataframe(portfolio_growth, hide_index=True, use_container_width=True)
+        st.download_button(
+            label="성장률 추정 CSV 다운로드",
+            data=portfolio_growth.to_csv(index=False),
+            file_name="포트폴리오_성장률추정.csv",
+            mime='text/csv'
+        )
+    
+    # 일괄 평가 결과 (업로드 파일과 평가 설정이 같으면 이전 결과 재사용)
+    batch_inputs = (st.session_state.get('portfolio_file_id'), batch_parameters['excess_earnings']['earnings_scheme'], growth_estimator)
+    st.subheader("일괄 평가 결과")
+    batch_results = job_result('batch_valuation', "일괄 평가", batch_inputs, 'cpu', value_portfolio, portfolio,
+                               batch_parameters, growth_estimator)
+    if batch_results is not None:
+        st.dataframe(batch_results.rename(columns=engine.METHOD_NAMES), hide_index=True, use_container_width=True)
+        st.download_button(
+            label="일괄 평가 결과 CSV 다운로드",
+            data=batch_results.rename(columns=engine.METHOD_NAMES).to_csv(index=False),
+            file_name="포트폴리오_영업권평가.csv",
+            mime='text/csv'
+        )
+    
+    batch_report_section(portfolio, batch_parameters, growth_estimator)
+    
+    # 평가 방법별 영업권 분포 (스트리밍 분위수 요약)
+    st.subheader("영업권 분포 요약")
+    summaries = job_result('batch_summary', "영업권 분포 요약", batch_inputs, 'cpu', summarize_portfolio, portfolio,
+                           batch_parameters, growth_estimator=growth_estimator)
+    if summaries is not None:
+        distribution = pd.DataFrame([
+            dict({'평가 방법': engine.METHOD_NAMES[method], '기업 수': described['count'], '평균': described['mean'],
+                  '표준편차': described['std'], '최솟값': described['min'], '최댓값': described['max']},
+                 **{f"{level}%": value for level, value in described['percentiles'].items()})
+            for method, described in ((method, summary.describe((5, 25, 50, 75, 95))) for method, summary in summaries.items())
+        ])
+        st.dataframe(distribution, hide_index=True, use_container_width=True)
+    
+    batch_sensitivity_section(portfolio, batch_inputs, batch_parameters, growth_estimator)
+
+# 그룹 기업 재무 데이터 수정 (저장하면 해당 기업과 최상위 기업까지의 경로만 다시 계산)
+def group_entity_section(group):
+    with st.expander("기업별 재무 데이터 수정", expanded=False):
+        entities = group['structure']['entity']
+        entity = st.selectbox("기업 선택", entities, key="group_entity")
+        index = int(np.flatnonzero(entities == entity)[0])
+        
+        edited = st.data_editor(entity_frame(group, index), num_rows="dynamic", hide_index=True,
+                                use_container_width=True, key=f"group_editor_{index}")
+        if st.button("재무 데이터 저장", key="group_entity_save"):
+            try:
+                industry = group['financials']['industry'][group['portfolio_index'][index]]
+                path = update_entity(group, index, normalize_financial_data(edited, company=entity, industry=industry))
+                st.session_state.group_update = [entities[node] for node in path]
+                st.rerun()
+            except Exception as e:
+                st.error(f"재무 데이터 저장 중 오류가 발생했습니다: {e}")
+
+# 그룹 평가 페이지 (지배·종속기업)
+def group_page():
+    st.title("그룹 영업권 평가")
+    
+    with st.expander("그룹 데이터 형식", expanded=False):
+        st.markdown("""
+        지배구조 CSV와 기업-연도별 재무 데이터 CSV를 업로드합니다.
+        
+        - 지배구조 CSV: 회사명, 상위회사, 지분율(%) (최상위 기업은 상위회사를 비워 둡니다)
+        - 재무 데이터 CSV: 포트폴리오 일괄 평가와 같은 형식 (회사명, 연도, 당기순이익 필수)
+        
+        모든 기업을 평가 방법별로 한 번에 평가한 뒤 지배구조를 따라 영업권을 합산합니다.
+        
+        - 연결 영업권: 자체 영업권 + 종속기업의 연결 영업권 전액
+        - 지배기업 귀속 영업권: 자체 영업권 + 지분율 × 종속기업의 지배기업 귀속 영업권
+        - 비지배지분: 연결 영업권 - 지배기업 귀속 영업권
+        """)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        structure_file = st.file_uploader("지배구조 CSV 파일 업로드", type=["csv"], key="group_structure_upload")
+    with col2:
+        financial_file = st.file_uploader("재무 데이터 CSV 파일 업로드", type=["csv"], key="group_financial_upload")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        growth_labels = ["입력 기본값 (5%)"] + list(GROWTH_ESTIMATORS.values())
+        growth_label = st.selectbox("DCF 영업이익 성장률", growth_labels, key="group_growth_estimator")
+        growth_estimator = None if growth_label == growth_labels[0] else list(GROWTH_ESTIMATORS)[growth_labels.index(growth_label) - 1]
+    with col2:
+        earnings_label = st.selectbox("초과이익법 평균 이익 산출 방식", list(EARNINGS_SCHEMES.values()), key="group_earnings_scheme")
+        group_parameters = {'excess_earnings': {'earnings_scheme': list(EARNINGS_SCHEMES)[list(EARNINGS_SCHEMES.values()).index(earnings_label)]}}
+    
+    # 파일이나 평가 설정이 바뀐 경우에만 백그라운드 스레드에서 읽고 전체 그룹을 다시 평가
+    if structure_file is not None and financial_file is not None:
+        source = (structure_file.file_id, financial_file.file_id, growth_estimator, group_parameters['excess_earnings']['earnings_scheme'])
+        if source != st.session_state.get('group_source'):
+            st.session_state.group_source = source
+            st.session_state.group_update = None
+            try:
+                start_job('group', 'io', load_group, io.BytesIO(structure_file.getvalue()), io.BytesIO(financial_file.getvalue()),
+                          group_parameters, growth_estimator)
+            except Exception as e:
+                st.error(f"그룹 평가 중 오류가 발생했습니다: {e}")
+    
+    if 'group' in st.session_state.jobs:
+        loaded = collect_job('group', "그룹 평가")
+        if loaded is not None:
+            # 같은 파일을 평가 설정만 바꿔 다시 평가한 경우 기존에 수정한 기업 재무 데이터를 다시 반영
+            previous = st.session_state.group
+            if previous is not None and st.session_state.get('group_files') == st.session_state.group_source[:2]:
+                for index, data in previous['overrides'].items():
+                    update_entity(loaded, index, data)
+            st.session_state.group = loaded
+            st.session_state.group_files = st.session_state.group_source[:2]
+        elif 'group' in st.session_state.jobs:
+            return
+    
+    group = st.session_state.group
+    if group is None:
+        st.info("지배구조와 재무 데이터를 업로드해주세요.")
+        return
+    
+    structure = group['structure']
+    st.caption(f"기업 수: {len(structure['entity']):,}개 | 최상위 기업: {int((structure['parent'] < 0).sum()):,}개 | "
+               f"최대 계층: {int(structure['depth'].max()):,}")
+    if st.session_state.get('group_update'):
+        st.info(f"다시 계산한 기업 (수정한 기업 → 최상위 기업): {' → '.join(st.session_state.group_update)}")
+    
+    method_name = st.radio("평가 방법", list(engine.METHOD_NAMES.values()), horizontal=True, key="group_method")
+    method = list(engine.METHOD_NAMES)[list(engine.METHOD_NAMES.values()).index(method_name)]
+    table = group_table(group, method)
+    
+    # 최상위 기업별 그룹 영업권
+    for _, row in table[table['계층'] == 0].iterrows():
+        st.subheader(row['회사명'])
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("연결 영업권", f"{row['연결 영업권']:,.0f}원")
+        with col2:
+            st.metric("비지배지분", f"{row['비지배지분']:,.0f}원")
+        with col3:
+            st.metric("지배기업 귀속 영업권", f"{row['지배기업 귀속 영업권']:,.0f}원")
+    
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    st.download_button(
+        label="그룹 평가 결과 CSV 다운로드",
+        data=table.to_csv(index=False),
+        file_name=f"그룹_영업권평가_{method}.csv",
+        mime='text/csv'
+    )
+    
+    group_entity_section(group)